@@ -13,7 +13,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
-from app.models import user, farm, device, sensor_reading, prediction, model_version, notification
+from app.models import user, farm, device, sensor_reading, prediction, model_version, notification, farm_feature, historical_yield, training_job, batch_prediction_run
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -2,17 +2,20 @@
 Admin endpoints for system management
 """
 
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.user import User
+from app.core.deps import get_current_user
+from app.schemas.user import CurrentUser, User
 from app.schemas.farm import Farm
 from app.schemas.device import Device
 from app.schemas.prediction import Prediction
+from app.schemas.training_job import TrainingJob, TrainingJobCreate
 from app.services.admin_service import AdminService
+from app.services.training_job_service import TrainingJobService
+from app.ml.manager import model_manager
 
 router = APIRouter()
 
@@ -20,7 +23,7 @@ router = APIRouter()
 @router.get("/stats")
 async def get_system_stats(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get system statistics (admin only)"""
     if current_user.role != "admin":
@@ -40,7 +43,7 @@ async def get_all_users(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get all users (admin only)"""
     if current_user.role != "admin":
@@ -60,7 +63,7 @@ async def get_all_farms(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get all farms (admin only)"""
     if current_user.role != "admin":
@@ -80,7 +83,7 @@ async def get_all_devices(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get all devices (admin only)"""
     if current_user.role != "admin":
@@ -100,7 +103,7 @@ async def get_all_predictions(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get all predictions (admin only)"""
     if current_user.role != "admin":
@@ -115,12 +118,13 @@ async def get_all_predictions(
     return predictions
 
 
-@router.post("/retrain-model")
+@router.post("/retrain-model", response_model=TrainingJob, status_code=status.HTTP_202_ACCEPTED)
 async def retrain_model(
+    job_in: Optional[TrainingJobCreate] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
-    """Trigger model retraining (admin only)"""
+    """Queue model retraining and return the job (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -128,15 +132,88 @@ async def retrain_model(
         )
     
     admin_service = AdminService(db)
-    result = await admin_service.retrain_model()
+    job = await admin_service.retrain_model(
+        params=(job_in or TrainingJobCreate()).dict(exclude_none=True),
+        requested_by=current_user.id
+    )
     
-    return result
+    return job
+
+
+@router.get("/training-jobs", response_model=List[TrainingJob])
+async def get_training_jobs(
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Get training jobs, newest first (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    training_job_service = TrainingJobService(db)
+    jobs = await training_job_service.list_jobs(skip=skip, limit=limit)
+    
+    return jobs
+
+
+@router.get("/training-jobs/{job_id}", response_model=TrainingJob)
+async def get_training_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Get training job status and progress (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    training_job_service = TrainingJobService(db)
+    job = await training_job_service.get_job(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training job not found"
+        )
+    
+    return job
+
+
+@router.post("/training-jobs/{job_id}/cancel", response_model=TrainingJob)
+async def cancel_training_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Cancel a queued or running training job (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    training_job_service = TrainingJobService(db)
+    job = await training_job_service.cancel_job(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training job not found"
+        )
+    
+    return job
 
 
 @router.get("/model-versions")
 async def get_model_versions(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get model version history (admin only)"""
     if current_user.role != "admin":
@@ -149,3 +226,20 @@ async def get_model_versions(
     versions = await admin_service.get_model_versions()
     
     return versions
+
+
+@router.get("/models/shadow")
+async def get_shadow_model_stats(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Get shadow model comparison statistics (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    if model_manager.shadow is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **model_manager.shadow.stats()}
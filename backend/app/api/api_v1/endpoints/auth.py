@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import create_access_token
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
 from app.services.user_service import UserService
@@ -47,8 +47,8 @@ async def login(
     """OAuth2 compatible token login"""
     user_service = UserService(db)
     
-    # Get user by email
-    user = await user_service.get_by_email(form_data.username)
+    # Verify password off the event loop
+    user = await user_service.authenticate(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,14 +56,6 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password
-    if not verify_password(form_data.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -92,8 +84,8 @@ async def login_email(
     """Login with email and password"""
     user_service = UserService(db)
     
-    # Get user by email
-    user = await user_service.get_by_email(email)
+    # Verify password off the event loop
+    user = await user_service.authenticate(email, password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,14 +93,6 @@ async def login_email(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password
-    if not verify_password(password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
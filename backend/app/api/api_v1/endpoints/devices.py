@@ -7,12 +7,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.user import User
+from app.core.deps import get_current_user, ensure_farm_access
+from app.schemas.user import CurrentUser
 from app.schemas.device import Device, DeviceCreate, DeviceUpdate, DeviceWithStats
-from app.schemas.farm import Farm
 from app.services.device_service import DeviceService
-from app.services.farm_service import FarmService
 
 router = APIRouter()
 
@@ -21,25 +19,13 @@ router = APIRouter()
 async def create_device(
     device_in: DeviceCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Create a new device"""
     device_service = DeviceService(db)
     
     # Check if user owns the farm
-    farm_service = FarmService(db)
-    farm = await farm_service.get_farm(device_in.farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, device_in.farm_id, current_user)
     
     device = await device_service.create_device(device_in)
     
@@ -50,25 +36,13 @@ async def create_device(
 async def get_farm_devices(
     farm_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get devices for a specific farm"""
     device_service = DeviceService(db)
-    farm_service = FarmService(db)
     
     # Check if user owns the farm
-    farm = await farm_service.get_farm(farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, farm_id, current_user)
     
     devices = await device_service.get_farm_devices(farm_id)
     
@@ -79,7 +53,7 @@ async def get_farm_devices(
 async def get_device(
     device_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get device by ID"""
     device_service = DeviceService(db)
@@ -92,19 +66,7 @@ async def get_device(
         )
     
     # Check if user owns the farm
-    farm_service = FarmService(db)
-    farm = await farm_service.get_farm(device.farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, str(device.farm_id), current_user)
     
     return device
 
@@ -114,32 +76,20 @@ async def update_device(
     device_id: str,
     device_update: DeviceUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Update device information"""
     device_service = DeviceService(db)
     
     # Check if device exists and user has permission
-    device = await device_service.get_device(device_id)
-    if not device:
+    farm_id = await device_service.get_device_farm_id(device_id)
+    if not farm_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Device not found"
         )
     
-    farm_service = FarmService(db)
-    farm = await farm_service.get_farm(device.farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, farm_id, current_user)
     
     updated_device = await device_service.update_device(
         device_id=device_id,
@@ -153,32 +103,20 @@ async def update_device(
 async def delete_device(
     device_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Delete a device"""
     device_service = DeviceService(db)
     
     # Check if device exists and user has permission
-    device = await device_service.get_device(device_id)
-    if not device:
+    farm_id = await device_service.get_device_farm_id(device_id)
+    if not farm_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Device not found"
         )
     
-    farm_service = FarmService(db)
-    farm = await farm_service.get_farm(device.farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, farm_id, current_user)
     
     await device_service.delete_device(device_id)
     
@@ -7,10 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.user import User
+from app.core.deps import get_current_user, ensure_farm_access
+from app.schemas.user import CurrentUser
 from app.schemas.farm import Farm, FarmCreate, FarmUpdate, FarmWithStats
+from app.schemas.historical_yield import HistoricalYield, HistoricalYieldCreate
 from app.services.farm_service import FarmService
+from app.services.historical_yield_service import HistoricalYieldService
 
 router = APIRouter()
 
@@ -19,7 +21,7 @@ router = APIRouter()
 async def create_farm(
     farm_in: FarmCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Create a new farm"""
     farm_service = FarmService(db)
@@ -35,7 +37,7 @@ async def create_farm(
 @router.get("/", response_model=List[FarmWithStats])
 async def get_user_farms(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get farms for current user"""
     farm_service = FarmService(db)
@@ -49,11 +51,14 @@ async def get_user_farms(
 async def get_farm(
     farm_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get farm by ID"""
     farm_service = FarmService(db)
     
+    # Check if user owns the farm or is admin before loading it
+    await ensure_farm_access(db, farm_id, current_user)
+    
     farm = await farm_service.get_farm(farm_id)
     if not farm:
         raise HTTPException(
@@ -61,13 +66,6 @@ async def get_farm(
             detail="Farm not found"
         )
     
-    # Check if user owns the farm or is admin
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
     return farm
 
 
@@ -76,24 +74,13 @@ async def update_farm(
     farm_id: str,
     farm_update: FarmUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Update farm information"""
     farm_service = FarmService(db)
     
     # Check if farm exists and user has permission
-    farm = await farm_service.get_farm(farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, farm_id, current_user)
     
     updated_farm = await farm_service.update_farm(
         farm_id=farm_id,
@@ -107,25 +94,43 @@ async def update_farm(
 async def delete_farm(
     farm_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Delete a farm"""
     farm_service = FarmService(db)
     
     # Check if farm exists and user has permission
-    farm = await farm_service.get_farm(farm_id)
-    if not farm:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Farm not found"
-        )
-    
-    if farm.user_id != str(current_user.id) and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+    await ensure_farm_access(db, farm_id, current_user)
     
     await farm_service.delete_farm(farm_id)
     
     return {"message": "Farm deleted successfully"}
+
+
+@router.get("/{farm_id}/yields", response_model=List[HistoricalYield])
+async def get_farm_yields(
+    farm_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Get recorded historical yields for a farm"""
+    await ensure_farm_access(db, farm_id, current_user)
+    
+    yield_service = HistoricalYieldService(db)
+    
+    return await yield_service.get_farm_yields(farm_id)
+
+
+@router.post("/{farm_id}/yields", response_model=HistoricalYield)
+async def record_farm_yield(
+    farm_id: str,
+    yield_in: HistoricalYieldCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Any:
+    """Record a harvest yield for a farm, crop, season and year"""
+    await ensure_farm_access(db, farm_id, current_user)
+    
+    yield_service = HistoricalYieldService(db)
+    
+    return await yield_service.record_yield(farm_id, yield_in)
@@ -7,8 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.user import User
+from app.core.deps import get_current_user
+from app.schemas.user import CurrentUser
 from app.schemas.notification import Notification, NotificationUpdate, NotificationStats
 from app.services.notification_service import NotificationService
 
@@ -21,7 +21,7 @@ async def get_user_notifications(
     limit: int = 50,
     unread_only: bool = False,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get notifications for current user"""
     notification_service = NotificationService(db)
@@ -39,7 +39,7 @@ async def get_user_notifications(
 @router.get("/stats", response_model=NotificationStats)
 async def get_notification_stats(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get notification statistics for current user"""
     notification_service = NotificationService(db)
@@ -56,7 +56,7 @@ async def update_notification(
     notification_id: str,
     notification_update: NotificationUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Update notification (mark as read/unread)"""
     notification_service = NotificationService(db)
@@ -86,7 +86,7 @@ async def update_notification(
 @router.put("/mark-all-read")
 async def mark_all_notifications_read(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Mark all notifications as read for current user"""
     notification_service = NotificationService(db)
@@ -102,7 +102,7 @@ async def mark_all_notifications_read(
 async def delete_notification(
     notification_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Delete a notification"""
     notification_service = NotificationService(db)
@@ -7,8 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.user import User, UserUpdate
+from app.core.deps import get_current_user
+from app.schemas.user import CurrentUser, User, UserUpdate
 from app.services.user_service import UserService
 
 router = APIRouter()
@@ -16,16 +16,25 @@ router = APIRouter()
 
 @router.get("/me", response_model=User)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Get current user information"""
-    return current_user
+    # The dependency only carries authorization fields; load the full profile
+    user = await UserService(db).get_user(current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
 
 
 @router.put("/me", response_model=User)
 async def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Update current user information"""
@@ -44,7 +53,7 @@ async def get_users(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get list of users (admin only)"""
     if current_user.role != "admin":
@@ -63,7 +72,7 @@ async def get_users(
 async def get_user(
     user_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """Get user by ID (admin only)"""
     if current_user.role != "admin":
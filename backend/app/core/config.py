@@ -15,6 +15,18 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     
+    # Authenticated user cache; role changes and deactivations apply within the TTL
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+    FARM_OWNER_CACHE_TTL_SECONDS: int = 300
+    FARM_OWNER_CACHE_MAX_ENTRIES: int = 50000
+    
+    # Password hashing runs on its own thread pool; excess requests get a 503
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_REHASH_ON_LOGIN: bool = True  # upgrade hashes after PASSWORD_BCRYPT_ROUNDS changes
+    
     # Server Configuration
     SERVER_NAME: str = "localhost"
     SERVER_HOST: AnyHttpUrl = "http://localhost:8000"
@@ -55,10 +67,90 @@ class Settings(BaseSettings):
     
     # Monitoring
     SENTRY_DSN: str = ""
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.0
     
     # ML Configuration
     ML_MODEL_PATH: str = "/app/ml_artifacts"
     ML_MODEL_VERSION: str = "v0.1.0"
+    ML_ESTIMATOR_BACKEND: str = "random_forest"  # or "hist_gradient_boosting"
+    
+    # Content-addressed artifact registry (empty path: ML_MODEL_PATH/registry);
+    # artifacts of the active and newest KEEP versions survive garbage collection
+    ML_REGISTRY_PATH: str = ""
+    ML_REGISTRY_KEEP_VERSIONS: int = 5  # 0 disables cleanup after training
+    ML_REGISTRY_GC_MIN_AGE_SECONDS: int = 3600
+    
+    # Training data loading (0 disables the row cap / time window)
+    TRAINING_CHUNK_SIZE: int = 50000
+    TRAINING_MAX_ROWS: int = 5000000
+    TRAINING_WINDOW_DAYS: int = 0
+    
+    # Training set sampling: "", "reservoir" or "stratified" (crop, region, season)
+    TRAINING_SAMPLE_STRATEGY: str = ""
+    TRAINING_SAMPLE_SIZE: int = 1000000
+    TRAINING_SAMPLE_PER_STRATUM: int = 50000
+    TRAINING_SAMPLE_PERCENT: float = 100.0  # TABLESAMPLE SYSTEM percentage
+    TRAINING_THIN_MINUTES: int = 0  # average each device's readings per interval
+    TRAINING_SAMPLE_SEED: int = 42
+    
+    # Local training set snapshots extended by watermark (empty path: ML_MODEL_PATH/training_snapshots)
+    TRAINING_SNAPSHOTS_ENABLED: bool = True
+    TRAINING_SNAPSHOT_PATH: str = ""
+    
+    # Generalisation estimate: "oob" (from the single fit) or "cv" (k-fold refits in parallel)
+    TRAINING_EVALUATION: str = "oob"
+    TRAINING_CV_FOLDS: int = 5
+    
+    # Incremental updates: trees added per update, forest size cap, minimum new readings
+    TRAINING_INCREMENTAL_TREES: int = 20
+    TRAINING_MAX_TREES: int = 300
+    TRAINING_INCREMENTAL_MIN_ROWS: int = 1000
+    
+    # Hyperparameter search (python -m app.ml.tune); empty path: ML_MODEL_PATH/tuning
+    TUNING_PATH: str = ""
+    TUNING_TRIALS: int = 50
+    TUNING_WORKERS: int = 2
+    TUNING_CPU_BUDGET: int = 0  # 0 uses every core
+    TUNING_CV_FOLDS: int = 5
+    TUNING_MAX_ROWS: int = 200000
+    
+    # Background training jobs (each run in a spawned, resource-limited process)
+    TRAINING_JOBS_ENABLED: bool = True
+    TRAINING_JOB_MAX_CONCURRENT: int = 1
+    TRAINING_JOB_POLL_SECONDS: float = 2.0
+    TRAINING_JOB_TIMEOUT_SECONDS: int = 3600
+    TRAINING_JOB_N_JOBS: int = 2
+    TRAINING_JOB_NICE: int = 10
+    TRAINING_JOB_MEMORY_LIMIT_MB: int = 0  # 0 leaves address space unlimited
+    
+    # Shadow model scored alongside the primary (empty disables)
+    ML_SHADOW_MODEL_PATH: str = ""
+    ML_SHADOW_LOG_PATH: str = ""
+    ML_SHADOW_STATS_WINDOW: int = 1000
+    ML_SHADOW_MAX_CPU_SHARE: float = 0.1  # Fraction of wall time the scorer thread may spend busy
+    
+    # Prediction cache
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_TTL_SECONDS: int = 900
+    PREDICTION_CACHE_MAX_ENTRIES: int = 10000
+    PREDICTION_CACHE_SKIP_DUPLICATE_SAVE: bool = True
+    
+    # Write-behind prediction persistence
+    PREDICTION_WRITE_BEHIND_ENABLED: bool = True
+    PREDICTION_WRITE_INTERVAL_MS: int = 250
+    PREDICTION_WRITE_BATCH_SIZE: int = 500
+    PREDICTION_WRITE_QUEUE_SIZE: int = 10000
+    
+    # Historical yield baselines
+    HISTORICAL_BASELINE_REFRESH_SECONDS: int = 600
+    
+    # Recommendation rules file (empty uses the bundled rules); edits are hot-reloaded
+    RECOMMENDATION_RULES_PATH: str = ""
+    
+    # Nightly batch predictions
+    BATCH_PREDICTION_HOUR_UTC: int = 2
+    BATCH_PREDICTION_CHUNK_SIZE: int = 1000
+    BATCH_PREDICTION_WORKERS: int = 4
     
     # Email Configuration (for notifications)
     SMTP_TLS: bool = True
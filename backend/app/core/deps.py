@@ -8,9 +8,11 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.metrics import AUTH_USER_CACHE_REQUESTS
 from app.core.security import verify_token
-from app.services.user_service import UserService
-from app.schemas.user import User
+from app.services.farm_service import FarmService
+from app.services.user_service import UserService, auth_user_cache
+from app.schemas.user import CurrentUser
 
 security = HTTPBearer()
 
@@ -18,8 +20,8 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+) -> CurrentUser:
+    """Get current authenticated user, from the cache when recently seen"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -32,8 +34,13 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user_service = UserService(db)
-    user = await user_service.get_user(user_id)
+    # Cache hits issue no query, so the session never checks out a connection
+    user = auth_user_cache.get(user_id)
+    if user is not None:
+        AUTH_USER_CACHE_REQUESTS.labels(result="hit").inc()
+    else:
+        AUTH_USER_CACHE_REQUESTS.labels(result="miss").inc()
+        user = await UserService(db).get_current_user(user_id)
     
     if user is None:
         raise credentials_exception
@@ -48,8 +55,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -60,8 +67,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current admin user"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -69,3 +76,19 @@ async def get_current_admin_user(
             detail="Not enough permissions"
         )
     return current_user
+
+
+async def ensure_farm_access(db: AsyncSession, farm_id: str, current_user: CurrentUser) -> None:
+    """Raise unless the farm exists and the user owns it or is an admin"""
+    owner_id = await FarmService(db).get_farm_owner(farm_id)
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Farm not found"
+        )
+    
+    if owner_id != str(current_user.id) and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
@@ -0,0 +1,107 @@
+"""
+Application-level Prometheus metrics
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from types import ModuleType
+from typing import Any, ContextManager, Iterator, Optional
+from prometheus_client import Counter, Gauge, Histogram
+
+sentry_sdk: Optional[ModuleType]
+try:
+    import sentry_sdk
+except ImportError:  # tracing is optional
+    sentry_sdk = None
+
+# Prediction cache
+PREDICTION_CACHE_REQUESTS = Counter(
+    'prediction_cache_requests_total',
+    'Prediction cache lookups',
+    ['result']
+)
+
+# Write-behind prediction persistence
+PREDICTION_WRITES = Counter(
+    'prediction_writes_total',
+    'Prediction rows handled by the background writer',
+    ['result']
+)
+
+# Serving model memory, split into private heap and shared page cache
+MODEL_MEMORY_BYTES = Gauge(
+    'model_memory_bytes',
+    'Resident memory added by loading the serving model',
+    ['kind']
+)
+
+# Shadow model evaluation
+SHADOW_PREDICTIONS = Counter(
+    'shadow_predictions_total',
+    'Live predictions handled by the shadow model',
+    ['result']
+)
+
+# Background training jobs
+TRAINING_JOBS = Counter(
+    'training_jobs_total',
+    'Training jobs finished by this process, by outcome',
+    ['result']
+)
+
+# Prediction pipeline stages
+PREDICTION_STAGE_SECONDS = Histogram(
+    'prediction_stage_duration_seconds',
+    'Time spent in each stage of a single prediction',
+    ['stage', 'model_version'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+PREDICTION_READINGS = Histogram(
+    'prediction_feature_rows_read',
+    'Rows read to build the features of a single prediction',
+    ['source'],
+    buckets=(1, 10, 100, 1000, 10000, 100000, 1000000)
+)
+AUTH_USER_CACHE_REQUESTS = Counter(
+    'auth_user_cache_requests_total',
+    'Authenticated user lookups served from the cache or the database',
+    ['result']
+)
+PASSWORD_HASH_PENDING = Gauge(
+    'password_hash_pending',
+    'Password hash operations queued or running on the hashing pool'
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    'password_hash_wait_seconds',
+    'Time a password hash operation waited for a hashing thread',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    'password_hash_duration_seconds',
+    'CPU time of password hashing and verification',
+    ['operation'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+PASSWORD_HASH_REJECTED = Counter(
+    'password_hash_rejected_total',
+    'Password hash operations refused because the hashing queue was full'
+)
+MODEL_LOADS = Counter(
+    'model_loads_total',
+    'Model artifact loads',
+    ['role', 'result']
+)
+
+
+@contextmanager
+def prediction_stage(stage: str, model_version: str) -> Iterator[None]:
+    """Time a prediction stage, also as a trace span when Sentry tracing is active"""
+    span: ContextManager[Any] = sentry_sdk.start_span(op=f"prediction.{stage}") if sentry_sdk else nullcontext()
+    start = time.perf_counter()
+    try:
+        with span:
+            yield
+    finally:
+        PREDICTION_STAGE_SECONDS.labels(stage=stage, model_version=model_version).observe(
+            time.perf_counter() - start
+        )
@@ -2,14 +2,27 @@
 Security utilities for authentication and authorization
 """
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Callable, Tuple, Union, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import (
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_WAIT_SECONDS,
+    PASSWORD_HASH_SECONDS,
+    PASSWORD_HASH_REJECTED
+)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; hashes with a different work factor count as outdated
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
 
 # JWT settings
 ALGORITHM = "HS256"
@@ -52,8 +65,57 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-# Import get_current_user from deps to avoid circular imports
-def get_current_user():
-    """Get current user dependency - imported from deps"""
-    from app.core.deps import get_current_user as _get_current_user
-    return _get_current_user
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool instead of the event loop"""
+    
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self.max_pending = max_pending
+        # bcrypt releases the GIL, so these threads hash in parallel
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+    
+    async def _run(self, operation: str, fn: Callable[..., Any], *args: Any) -> Any:
+        # Shed load rather than let a login burst queue unbounded CPU work
+        if self._pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHashingBusy()
+        
+        submitted = time.perf_counter()
+        
+        def timed() -> Any:
+            started = time.perf_counter()
+            PASSWORD_HASH_WAIT_SECONDS.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_HASH_SECONDS.labels(operation=operation).observe(time.perf_counter() - started)
+        
+        self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.dec()
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured work factor"""
+        return await self._run("hash", pwd_context.hash, password)
+    
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a replacement hash when the stored one is outdated"""
+        if settings.PASSWORD_REHASH_ON_LOGIN:
+            return await self._run("verify", pwd_context.verify_and_update, password, hashed_password)
+        
+        return await self._run("verify", verify_password, password, hashed_password), None
+
+
+# Shared by every request handled by this process
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -8,6 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import sentry_sdk
 import structlog
 import time
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
@@ -17,6 +19,11 @@ from app.core.config import settings
 from app.core.database import engine, Base
 from app.api.api_v1.api import api_router
 from app.core.logging import setup_logging
+from app.core.security import PasswordHashingBusy
+from app.services.prediction_writer import prediction_writer
+from app.services.historical_yield_service import refresh_baselines_periodically
+from app.services.training_job_service import training_job_runner
+from app.ml.rules import rules_engine
 
 # Prometheus metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
@@ -24,6 +31,14 @@ REQUEST_DURATION = Histogram('http_request_duration_seconds', 'HTTP request dura
 
 # Setup structured logging
 setup_logging()
+
+# Error reporting and, when sampled, per-stage prediction traces
+if settings.SENTRY_DSN:
+    sentry_sdk.init(
+        dsn=settings.SENTRY_DSN,
+        environment=settings.ENVIRONMENT,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE
+    )
 logger = structlog.get_logger(__name__)
 
 
@@ -39,10 +54,28 @@ async def lifespan(app: FastAPI):
     
     logger.info("Database tables created successfully")
     
+    if settings.PREDICTION_WRITE_BEHIND_ENABLED:
+        prediction_writer.start()
+    
+    rules_engine.configure(settings.RECOMMENDATION_RULES_PATH)
+    
+    # Load yield baselines now and keep them fresh in the background
+    baseline_refresh = asyncio.create_task(refresh_baselines_periodically())
+    
+    # Run queued training jobs in child processes, never on this event loop
+    if settings.TRAINING_JOBS_ENABLED:
+        training_job_runner.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down GreenPulseX backend application")
+    
+    baseline_refresh.cancel()
+    await training_job_runner.stop()
+    
+    # Flush queued predictions before the process exits
+    await prediction_writer.stop()
 
 
 # Create FastAPI application
@@ -126,6 +159,18 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     )
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Ask clients to retry when the password hashing queue is full"""
+    logger.warning("Password hashing queue full", path=request.url.path)
+    
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many login attempts in progress, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """General exception handler"""
@@ -0,0 +1,134 @@
+"""
+Historical yield baselines for comparing predictions
+"""
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from statistics import mean, median
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from app.ml.features import SEASON_BY_MONTH, SEASON_NAMES
+
+
+def season_for_date(value: Union[date, datetime]) -> str:
+    """Season name for a calendar date"""
+    return SEASON_NAMES[SEASON_BY_MONTH[value.month]]
+
+
+def _crop_key(crop_type: str) -> str:
+    return (crop_type or '').strip().lower()
+
+
+class BaselineCache:
+    """Per-farm and per-region yield baselines held in process memory"""
+    
+    def __init__(self) -> None:
+        self._farm_seasonal: Dict[Tuple[str, str, str], float] = {}
+        self._farm_mean: Dict[Tuple[str, str], float] = {}
+        self._region_seasonal: Dict[Tuple[str, str, str], float] = {}
+        self._region_mean: Dict[Tuple[str, str], float] = {}
+        self._farm_regions: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[datetime] = None
+    
+    def load(self, records: Iterable[Mapping[str, Any]], farm_regions: Dict[str, Optional[str]]) -> None:
+        """Rebuild every baseline from historical yield records and swap them in"""
+        farm_seasonal = defaultdict(list)
+        farm_all = defaultdict(list)
+        region_seasonal = defaultdict(list)
+        region_all = defaultdict(list)
+        
+        for record in records:
+            farm_id = str(record['farm_id'])
+            crop = _crop_key(record['crop_type'])
+            season = record['season']
+            value = float(record['yield_kg_per_ha'])
+            region = record.get('region') or farm_regions.get(farm_id)
+            
+            farm_seasonal[(farm_id, crop, season)].append(value)
+            farm_all[(farm_id, crop)].append(value)
+            if region:
+                region_seasonal[(region, crop, season)].append(value)
+                region_all[(region, crop)].append(value)
+        
+        # Seasonal medians resist one-off bad years; multi-year means cover
+        # seasons a farm has not reported yet
+        snapshot = {
+            '_farm_seasonal': {key: median(values) for key, values in farm_seasonal.items()},
+            '_farm_mean': {key: mean(values) for key, values in farm_all.items()},
+            '_region_seasonal': {key: median(values) for key, values in region_seasonal.items()},
+            '_region_mean': {key: mean(values) for key, values in region_all.items()},
+            '_farm_regions': dict(farm_regions)
+        }
+        
+        with self._lock:
+            for name, baselines in snapshot.items():
+                setattr(self, name, baselines)
+            self.loaded_at = datetime.utcnow()
+    
+    def update(
+        self,
+        farm_id: str,
+        crop_type: str,
+        season: str,
+        farm_records: Iterable[Mapping[str, Any]],
+        region: Optional[str],
+        region_records: Iterable[Mapping[str, Any]],
+        farm_region: Optional[str]
+    ) -> None:
+        """Recompute only the baselines one farm's write touched, leaving every other key as loaded"""
+        farm_id = str(farm_id)
+        crop = _crop_key(crop_type)
+        farm_rows = [record for record in farm_records if _crop_key(record['crop_type']) == crop]
+        region_rows = [record for record in region_records if _crop_key(record['crop_type']) == crop]
+        
+        updates = [
+            ('_farm_seasonal', (farm_id, crop, season), median,
+             [record for record in farm_rows if record['season'] == season]),
+            ('_farm_mean', (farm_id, crop), mean, farm_rows)
+        ]
+        if region:
+            updates += [
+                ('_region_seasonal', (region, crop, season), median,
+                 [record for record in region_rows if record['season'] == season]),
+                ('_region_mean', (region, crop), mean, region_rows)
+            ]
+        
+        with self._lock:
+            # Looked up under the lock, so a concurrent load() never loses the patch
+            for name, key, aggregate, rows in updates:
+                baselines = getattr(self, name)
+                if rows:
+                    baselines[key] = aggregate(float(record['yield_kg_per_ha']) for record in rows)
+                else:
+                    baselines.pop(key, None)
+            self._farm_regions[farm_id] = farm_region
+    
+    def baseline(self, farm_id: str, crop_type: str, season: str) -> Optional[float]:
+        """Most specific baseline available: farm season, farm, region season, region"""
+        farm_id = str(farm_id)
+        crop = _crop_key(crop_type)
+        
+        value = self._farm_seasonal.get((farm_id, crop, season))
+        if value is None:
+            value = self._farm_mean.get((farm_id, crop))
+        
+        region = self._farm_regions.get(farm_id)
+        if value is None and region:
+            value = self._region_seasonal.get((region, crop, season))
+            if value is None:
+                value = self._region_mean.get((region, crop))
+        
+        return value
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'farm_baselines': len(self._farm_mean),
+            'region_baselines': len(self._region_mean),
+            'loaded_at': self.loaded_at
+        }
+
+
+# Process-wide baselines, rebuilt at startup and periodically, patched on write
+baseline_cache = BaselineCache()
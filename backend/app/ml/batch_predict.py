@@ -0,0 +1,276 @@
+"""
+Fleet-wide batch prediction job
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import logging
+from sqlalchemy import select, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.models.batch_prediction_run import BatchPredictionRun
+from app.models.farm import Farm
+from app.models.prediction import Prediction, PredictionStatus
+from app.ml.features import latest_feature_values
+from app.ml.rules import rules_engine
+from app.ml.model import (
+    CropYieldPredictor,
+    DEFAULT_YIELD_KG_PER_HA,
+    DEFAULT_CONFIDENCE
+)
+from app.ml.registry import model_registry, resolve_model_path
+from app.services.feature_service import FeatureService
+from app.services.feature_store_service import FeatureStoreService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Model loaded once per pool worker
+_worker_model: Optional[CropYieldPredictor] = None
+
+
+def _init_worker(model_path: Optional[str]) -> None:
+    """Load the model in a pool worker"""
+    global _worker_model
+    _worker_model = CropYieldPredictor()
+    if model_path:
+        _worker_model.load_model(model_path, inference_only=True)
+
+
+def _predict_block(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Score a block of encoded feature rows in a pool worker"""
+    model = _worker_model
+    if model is None or not model.is_trained:
+        return (
+            np.full(len(X), DEFAULT_YIELD_KG_PER_HA),
+            np.full(len(X), DEFAULT_CONFIDENCE)
+        )
+    
+    result = model.predict(X)
+    return np.asarray(result['predictions']), np.asarray(result['confidence'])
+
+
+async def load_checkpoint(db: AsyncSession, run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Checkpoint of a run, created if new; without a run_id an unfinished run is resumed"""
+    if run_id is None:
+        # A run interrupted before midnight resumes under its own id instead of restarting
+        pending = await db.execute(
+            select(BatchPredictionRun.run_id)
+            .where(BatchPredictionRun.completed.is_(False))
+            .order_by(BatchPredictionRun.started_at)
+            .limit(1)
+        )
+        run_id = pending.scalar_one_or_none() or datetime.utcnow().strftime('%Y-%m-%d')
+    
+    await db.execute(
+        pg_insert(BatchPredictionRun)
+        .values(run_id=run_id)
+        .on_conflict_do_nothing(index_elements=[BatchPredictionRun.run_id])
+    )
+    await db.commit()
+    
+    run = (await db.execute(select(BatchPredictionRun).where(BatchPredictionRun.run_id == run_id))).scalar_one()
+    return {
+        'run_id': run.run_id,
+        'last_farm_id': run.last_farm_id,
+        'processed': run.processed,
+        'completed': run.completed
+    }
+
+
+async def _has_pending_run(db: AsyncSession, today: str) -> bool:
+    """Whether an interrupted run is unfinished or today's run has not completed"""
+    result = await db.execute(
+        select(BatchPredictionRun.run_id).where(
+            BatchPredictionRun.completed.is_(True),
+            BatchPredictionRun.run_id == today
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        return True
+    
+    pending = await db.execute(
+        select(BatchPredictionRun.run_id).where(BatchPredictionRun.completed.is_(False)).limit(1)
+    )
+    return pending.scalar_one_or_none() is not None
+
+
+async def _load_farm_features(db, farm_ids: List[str], as_of: datetime) -> Dict[str, Dict[str, Any]]:
+    """Feature store rows for a chunk, with one grouped aggregate for the misses"""
+    features = await FeatureStoreService(db).get_features_for_farms(farm_ids)
+    
+    missing = [farm_id for farm_id in farm_ids if farm_id not in features]
+    if missing:
+        features.update(await FeatureService(db).get_features_for_farms(missing, as_of=as_of))
+    
+    return features
+
+
+async def run_batch_predictions(
+    run_id: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Predict yields for every farm, resuming from the last checkpoint"""
+    chunk_size = chunk_size or settings.BATCH_PREDICTION_CHUNK_SIZE
+    workers = workers or settings.BATCH_PREDICTION_WORKERS
+    
+    async with AsyncSessionLocal() as db:
+        checkpoint = await load_checkpoint(db, run_id)
+    
+    run_id = checkpoint['run_id']
+    if checkpoint['completed']:
+        logger.info(f"Batch prediction run {run_id} already completed")
+        return checkpoint
+    
+    if checkpoint['last_farm_id']:
+        logger.info(f"Resuming batch prediction run {run_id} after farm {checkpoint['last_farm_id']}")
+    
+    rules_engine.configure(settings.RECOMMENDATION_RULES_PATH)
+    
+    model_path = resolve_model_path(model_registry, settings.ML_MODEL_PATH)
+    model = CropYieldPredictor()
+    if model_path:
+        model.load_model(str(model_path), inference_only=True)
+    
+    as_of = datetime.utcnow()
+    block_size = max(1, chunk_size // workers)
+    
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(model_path) if model_path else None,)
+    )
+    loop = asyncio.get_running_loop()
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            while True:
+                # Keyset pagination over farms
+                query = select(Farm.id, Farm.planting_date).order_by(Farm.id).limit(chunk_size)
+                if checkpoint['last_farm_id']:
+                    query = query.where(Farm.id > checkpoint['last_farm_id'])
+                
+                farms = (await db.execute(query)).all()
+                if not farms:
+                    break
+                
+                farm_ids = [str(farm.id) for farm in farms]
+                features = await _load_farm_features(db, farm_ids, as_of)
+                scored = [farm for farm in farms if str(farm.id) in features]
+                
+                rows = []
+                if scored:
+                    # Encode straight into one preallocated matrix
+                    X = np.empty((len(scored), len(model.feature_columns)), dtype=np.float32)
+                    latest = []
+                    for index, farm in enumerate(scored):
+                        record: Dict[str, Any] = dict(latest_feature_values(features[str(farm.id)]))
+                        latest.append(dict(record))
+                        record['timestamp'] = as_of
+                        record['planting_date'] = farm.planting_date or (as_of - timedelta(days=90))
+                        model.encode_features(record, out=X[index])
+                    
+                    blocks = await asyncio.gather(*[
+                        loop.run_in_executor(executor, _predict_block, X[start:start + block_size])
+                        for start in range(0, len(X), block_size)
+                    ])
+                    predictions = np.concatenate([block[0] for block in blocks])
+                    confidence = np.concatenate([block[1] for block in blocks])
+                    
+                    # Evaluate the recommendation rules for the whole chunk at once
+                    for index, predicted_yield in enumerate(predictions):
+                        latest[index]['predicted_yield'] = float(predicted_yield)
+                    recommendations = rules_engine.evaluate(latest)
+                    
+                    for index, farm in enumerate(scored):
+                        rows.append({
+                            'farm_id': str(farm.id),
+                            'model_version': model.model_version,
+                            'features_json': dict(zip(model.feature_columns, X[index].tolist())),
+                            'predicted_yield_kg_per_ha': float(predictions[index]),
+                            'confidence': float(confidence[index]),
+                            'recommendations_json': recommendations[index],
+                            'status': PredictionStatus.COMPLETED
+                        })
+                    
+                    await db.execute(insert(Prediction), rows)
+                
+                # The checkpoint commits with the page, so a crash never replays inserted rows
+                checkpoint['last_farm_id'] = farm_ids[-1]
+                checkpoint['processed'] += len(rows)
+                await db.execute(
+                    update(BatchPredictionRun)
+                    .where(BatchPredictionRun.run_id == run_id)
+                    .values(last_farm_id=checkpoint['last_farm_id'], processed=checkpoint['processed'])
+                )
+                await db.commit()
+                
+                logger.info(
+                    f"Batch prediction {run_id}: {len(rows)}/{len(farms)} farms scored "
+                    f"({checkpoint['processed']} total)"
+                )
+            
+            checkpoint['completed'] = True
+            await db.execute(
+                update(BatchPredictionRun)
+                .where(BatchPredictionRun.run_id == run_id)
+                .values(completed=True)
+            )
+            await db.commit()
+    finally:
+        executor.shutdown()
+    
+    logger.info(f"Batch prediction run {run_id} completed: {checkpoint['processed']} predictions")
+    
+    return checkpoint
+
+
+async def run_scheduler() -> None:
+    """Run the batch job every day at BATCH_PREDICTION_HOUR_UTC"""
+    while True:
+        now = datetime.utcnow()
+        next_run = now.replace(hour=settings.BATCH_PREDICTION_HOUR_UTC, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            # Catch up on today's run or an interrupted one (resumes from its checkpoint)
+            async with AsyncSessionLocal() as db:
+                pending = await _has_pending_run(db, now.strftime('%Y-%m-%d'))
+            if pending:
+                next_run = now
+            else:
+                next_run += timedelta(days=1)
+        
+        await asyncio.sleep((next_run - datetime.utcnow()).total_seconds())
+        
+        try:
+            await run_batch_predictions()
+        except Exception as e:
+            logger.error(f"Batch prediction run failed: {str(e)}")
+            await asyncio.sleep(300)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predict yields for all farms")
+    parser.add_argument("--run-id", help="Run identifier (defaults to the unfinished run, else today's date)")
+    parser.add_argument("--chunk-size", type=int, help="Farms per keyset page")
+    parser.add_argument("--workers", type=int, help="Inference worker processes")
+    parser.add_argument("--schedule", action="store_true", help="Run daily instead of once")
+    args = parser.parse_args()
+    
+    if args.schedule:
+        asyncio.run(run_scheduler())
+    else:
+        asyncio.run(run_batch_predictions(
+            run_id=args.run_id,
+            chunk_size=args.chunk_size,
+            workers=args.workers
+        ))
@@ -0,0 +1,86 @@
+"""
+Feature definitions shared by prediction and training
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bump when feature definitions change; stored rows with another version are rebuilt
+FEATURE_DEFINITION_VERSION = 1
+
+# Raw sensor columns used as model inputs
+SENSOR_FEATURES: List[str] = [
+    'soil_moisture', 'soil_ph', 'nitrogen', 'phosphorus', 'potassium',
+    'air_temperature', 'air_humidity', 'soil_temperature'
+]
+
+# Fallback values when a sensor has not reported
+SENSOR_DEFAULTS: Dict[str, float] = {
+    'soil_moisture': 45.0,
+    'soil_ph': 6.5,
+    'nitrogen': 50.0,
+    'phosphorus': 25.0,
+    'potassium': 150.0,
+    'air_temperature': 28.0,
+    'air_humidity': 70.0,
+    'soil_temperature': 25.0
+}
+
+# Season code by calendar month (index 0 unused): winter, spring, summer, fall
+SEASON_BY_MONTH: Tuple[int, ...] = (-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0)
+SEASON_NAMES = ('winter', 'spring', 'summer', 'fall')
+
+# Trailing windows (in days) for aggregate features
+FEATURE_WINDOWS_DAYS = (1, 7, 30)
+
+# Aggregates computed per sensor and window
+WINDOW_AGGREGATES = ('mean', 'min', 'max', 'trend')
+
+# Smallest time step used when folding a reading into running means,
+# so readings sharing a timestamp still contribute (nominal sampling interval)
+EWM_MIN_STEP_SECONDS = 300.0
+
+
+def window_feature_name(sensor: str, aggregate: str, days: int) -> str:
+    """Name of a windowed aggregate feature, e.g. soil_moisture_mean_7d"""
+    return f"{sensor}_{aggregate}_{days}d"
+
+
+def latest_feature_values(features: Dict[str, Any]) -> Dict[str, float]:
+    """Latest sensor values with defaults applied for missing sensors"""
+    values = {}
+    for name in SENSOR_FEATURES:
+        value = features.get(name)
+        values[name] = float(value if value is not None else SENSOR_DEFAULTS[name])
+    return values
+
+
+def apply_reading(
+    values: Dict[str, Optional[float]],
+    reading: Dict[str, Any],
+    elapsed_seconds: Optional[float] = None,
+    is_newest: bool = True
+) -> Dict[str, Optional[float]]:
+    """Fold one reading into running features (latest values and time-decayed window means)"""
+    updated = dict(values)
+    step = max(elapsed_seconds or 0.0, EWM_MIN_STEP_SECONDS)
+    
+    for name in SENSOR_FEATURES:
+        value = reading.get(name)
+        if value is None:
+            continue
+        value = float(value)
+        
+        if is_newest:
+            updated[name] = value
+        
+        for days in FEATURE_WINDOWS_DAYS:
+            key = window_feature_name(name, 'ewm', days)
+            previous = updated.get(key)
+            if previous is None:
+                updated[key] = value
+            else:
+                alpha = 1.0 - math.exp(-step / (days * 86400.0))
+                updated[key] = previous + alpha * (value - previous)
+    
+    return updated
@@ -0,0 +1,196 @@
+"""
+Flat-array random forest evaluator
+"""
+
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+FLAT_FOREST_FORMAT_VERSION = 2
+
+_NODE_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+
+class FlatForest:
+    """All trees of a fitted forest packed into contiguous node arrays"""
+    
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+    
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+    
+    @classmethod
+    def from_estimator(cls, estimator: Any) -> "FlatForest":
+        """Flatten a fitted sklearn forest regressor"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        
+        for tree_estimator in estimator.estimators_:
+            tree = tree_estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            
+            # Leaves point to themselves so every sample can take max_depth steps
+            left = np.where(is_leaf, node_ids, tree.children_left).astype(np.int32) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right).astype(np.int32) + offset
+            
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(left)
+            rights.append(right)
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+            
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+        
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth
+        )
+    
+    def predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Per-tree predictions with shape (n_trees, n_samples)"""
+        # sklearn evaluates trees on float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        
+        return self.value[nodes]
+    
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Forest mean and standard deviation across trees"""
+        per_tree = self.predict_trees(X)
+        
+        # Accumulate tree by tree, in the same order as sklearn
+        total = np.zeros(per_tree.shape[1], dtype=np.float64)
+        for tree_predictions in per_tree:
+            total += tree_predictions
+        
+        return total / self.n_trees, np.std(per_tree, axis=0)
+    
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in _NODE_ARRAYS}
+
+
+def save_flat_artifact(
+    filepath: str,
+    forest: FlatForest,
+    scaler_mean: np.ndarray,
+    scaler_scale: np.ndarray,
+    metadata: Dict[str, Any]
+) -> None:
+    """Write a self-contained inference artifact and point filepath at it"""
+    path = Path(filepath)
+    version_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}")
+    version_path.mkdir(parents=True)
+    
+    arrays = {
+        **forest.arrays(),
+        'scaler_mean': np.asarray(scaler_mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler_scale, dtype=np.float64)
+    }
+    for name, array in arrays.items():
+        np.save(version_path / f"{name}.npy", np.ascontiguousarray(array))
+    
+    (version_path / 'meta.json').write_text(json.dumps({
+        'format_version': FLAT_FOREST_FORMAT_VERSION,
+        'max_depth': forest.max_depth,
+        'metadata': metadata
+    }, default=float))
+    
+    # The pointer is swapped in one rename, so readers always find a complete version
+    previous = _pointed_version(path)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(version_path.name)
+    os.replace(tmp_path, path)
+    
+    # The version just replaced may still be mid-load elsewhere; older ones go
+    for stale in flat_artifact_versions(filepath):
+        if stale not in (version_path, previous):
+            shutil.rmtree(stale, ignore_errors=True)
+    
+    logger.info(f"Flat forest artifact saved to {version_path}")
+
+
+def flat_artifact_versions(filepath: str) -> List[Path]:
+    """Version directories written for an artifact pointer, current or not"""
+    path = Path(filepath)
+    return sorted(version for version in path.parent.glob(f"{path.name}.*") if version.is_dir())
+
+
+def _pointed_version(path: Path) -> Optional[Path]:
+    try:
+        name = path.read_text().strip()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    return path.with_name(name) if name else None
+
+
+def load_flat_artifact(filepath: str, mmap: bool = True) -> Optional[Dict[str, Any]]:
+    """Read an inference artifact, memory-mapping its arrays by default"""
+    version_path = _pointed_version(Path(filepath))
+    if version_path is None or not version_path.is_dir():
+        return None
+    return _load_array_directory(version_path, mmap)
+
+
+def _load_array_directory(path: Path, mmap: bool) -> Optional[Dict[str, Any]]:
+    meta = json.loads((path / 'meta.json').read_text())
+    if meta['format_version'] != FLAT_FOREST_FORMAT_VERSION:
+        logger.warning(f"Unsupported flat forest format {meta['format_version']} in {path}")
+        return None
+    
+    # Read-only maps are backed by the shared page cache, so every worker
+    # process serving the same artifact shares one physical copy
+    mmap_mode: Optional[Literal['r']] = 'r' if mmap else None
+    arrays = {
+        name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+        for name in (*_NODE_ARRAYS, 'scaler_mean', 'scaler_scale')
+    }
+    
+    forest = FlatForest(
+        max_depth=meta['max_depth'],
+        **{name: arrays[name] for name in _NODE_ARRAYS}
+    )
+    return {
+        'forest': forest,
+        'scaler_mean': np.array(arrays['scaler_mean']),
+        'scaler_scale': np.array(arrays['scaler_scale']),
+        'metadata': meta['metadata']
+    }
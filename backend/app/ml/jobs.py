@@ -0,0 +1,106 @@
+"""
+Training job process entry point
+"""
+
+import asyncio
+import os
+import resource
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+import logging
+from sqlalchemy import update
+
+from app.core.database import AsyncSessionLocal
+from app.models.training_job import TrainingJob, TrainingJobStatus, ACTIVE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Native thread pools sized by these variables are created when numpy and
+# scikit-learn are first imported, so they must be set before that happens
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def apply_resource_limits(n_jobs: int, nice: int = 0, memory_limit_mb: int = 0) -> None:
+    """Restrict the current process before any training code is imported"""
+    if nice:
+        os.nice(nice)
+    
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    
+    threads = str(n_jobs if n_jobs > 0 else os.cpu_count() or 1)
+    for name in _THREAD_ENV_VARS:
+        os.environ[name] = threads
+
+
+async def _update_job(job_id: str, **values: Any) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(TrainingJob)
+            .where(
+                TrainingJob.id == job_id,
+                TrainingJob.status.in_(ACTIVE_STATUSES)
+            )
+            .values(**values)
+        )
+        await db.commit()
+
+
+async def _run_job(job_id: str, params: Dict[str, Any], n_jobs: int) -> bool:
+    from app.ml.train import train_model
+    
+    async def report(stage: str, progress: float) -> None:
+        await _update_job(job_id, stage=stage, progress=progress)
+    
+    days: Optional[int] = params.get('days')
+    try:
+        result = await train_model(
+            source=params.get('source', 'readings'),
+            limit=params.get('limit'),
+            start=datetime.utcnow() - timedelta(days=days) if days else None,
+            sample=params.get('sample'),
+            rebuild_snapshot=params.get('rebuild_snapshot', False),
+            incremental=params.get('incremental', False),
+            evaluation=params.get('evaluation'),
+            backend=params.get('backend'),
+            n_jobs=n_jobs,
+            progress=report
+        )
+    except Exception as e:
+        await _update_job(
+            job_id,
+            status=TrainingJobStatus.FAILED.value,
+            error=str(e),
+            finished_at=datetime.now(timezone.utc)
+        )
+        return False
+    
+    await _update_job(
+        job_id,
+        status=TrainingJobStatus.SUCCEEDED.value,
+        stage="done",
+        progress=1.0,
+        result_json=result,
+        finished_at=datetime.now(timezone.utc)
+    )
+    return True
+
+
+def run_job_process(
+    job_id: str,
+    params: Dict[str, Any],
+    n_jobs: int,
+    nice: int = 0,
+    memory_limit_mb: int = 0
+) -> None:
+    """Run one training job in a freshly spawned process"""
+    logging.basicConfig(level=logging.INFO)
+    apply_resource_limits(n_jobs, nice=nice, memory_limit_mb=memory_limit_mb)
+    
+    logger.info(f"Training job {job_id} started in process {os.getpid()}")
+    succeeded = asyncio.run(_run_job(job_id, params, n_jobs))
+    logger.info(f"Training job {job_id} {'succeeded' if succeeded else 'failed'}")
+    
+    if not succeeded:
+        raise SystemExit(1)
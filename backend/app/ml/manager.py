@@ -0,0 +1,299 @@
+"""
+Process-wide model manager
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import MODEL_MEMORY_BYTES, MODEL_LOADS, SHADOW_PREDICTIONS
+from app.ml.model import CropYieldPredictor
+from app.ml.registry import model_registry, resolve_model_path
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def memory_usage() -> Dict[str, int]:
+    """Resident memory of this process split into private and file-backed bytes"""
+    usage = {'rss': 0, 'anon': 0, 'file': 0}
+    fields = {'VmRSS:': 'rss', 'RssAnon:': 'anon', 'RssFile:': 'file'}
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                parts = line.split()
+                if parts and parts[0] in fields:
+                    usage[fields[parts[0]]] = int(parts[1]) * 1024
+    except OSError:
+        pass
+    return usage
+
+
+class ShadowEvaluator:
+    """Scores live feature vectors with a candidate model off the request path"""
+    
+    def __init__(
+        self,
+        model_path: str,
+        log_path: str,
+        window: int = 1000,
+        max_queue_size: int = 1000,
+        max_batch_size: int = 256,
+        max_cpu_share: float = 0.1
+    ):
+        self.model_path = model_path
+        self.log_path = Path(log_path)
+        self.max_batch_size = max_batch_size
+        self.max_cpu_share = max_cpu_share
+        self.model: Optional[CropYieldPredictor] = None
+        self.scored = 0
+        self.errors = 0
+        self.dropped = 0
+        # Rolling (shadow - primary) differences and the primary values they relate to
+        self._diffs: deque = deque(maxlen=window)
+        self._primary: deque = deque(maxlen=window)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+            self._thread.start()
+    
+    def submit(
+        self,
+        farm_id: str,
+        feature_vector: np.ndarray,
+        primary_yield: float,
+        primary_confidence: float,
+        primary_version: str
+    ) -> None:
+        """Queue a scored request for shadow evaluation; never blocks or raises"""
+        try:
+            self.start()
+            self._queue.put_nowait((
+                str(farm_id),
+                np.array(feature_vector, dtype=np.float32).reshape(-1),
+                float(primary_yield),
+                float(primary_confidence),
+                primary_version
+            ))
+        except queue.Full:
+            self.dropped += 1
+            SHADOW_PREDICTIONS.labels(result="dropped").inc()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Shadow submit failed: {str(e)}")
+    
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.max_batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            started = time.perf_counter()
+            try:
+                self._score(items)
+            except Exception as e:
+                self.errors += len(items)
+                SHADOW_PREDICTIONS.labels(result="error").inc(len(items))
+                logger.error(f"Shadow scoring failed: {str(e)}")
+            
+            # Scoring holds the GIL; idle afterwards so request handlers keep most of it
+            time.sleep(self._pause_after(time.perf_counter() - started))
+    
+    def _pause_after(self, busy_seconds: float) -> float:
+        """Idle time that keeps scoring within max_cpu_share of wall time"""
+        if self.max_cpu_share >= 1:
+            return 0.0
+        return busy_seconds * (1 / max(self.max_cpu_share, 0.01) - 1)
+    
+    def _score(self, items: List[Tuple]) -> None:
+        if self.model is None:
+            model = CropYieldPredictor()
+            try:
+                model.load_model(self.model_path, inference_only=True)
+            except Exception:
+                MODEL_LOADS.labels(role="shadow", result="failed").inc()
+                raise
+            MODEL_LOADS.labels(role="shadow", result="loaded").inc()
+            self.model = model
+            logger.info(f"Shadow model {self.model.model_version} loaded from {self.model_path}")
+        
+        # Requests scored by the primary under a different feature layout cannot be compared
+        width = len(self.model.feature_columns)
+        items = [item for item in items if item[1].shape[0] == width]
+        if not items:
+            return
+        
+        X = np.stack([item[1] for item in items])
+        result = self.model.predict(X)
+        
+        timestamp = datetime.utcnow().isoformat(timespec='seconds')
+        lines = []
+        with self._stats_lock:
+            for (farm_id, _, primary_yield, primary_confidence, primary_version), shadow_yield, shadow_confidence in zip(
+                items, result['predictions'], result['confidence']
+            ):
+                self._diffs.append(float(shadow_yield) - primary_yield)
+                self._primary.append(primary_yield)
+                lines.append(json.dumps({
+                    'ts': timestamp,
+                    'farm_id': farm_id,
+                    'primary_version': primary_version,
+                    'shadow_version': self.model.model_version,
+                    'primary': round(primary_yield, 2),
+                    'shadow': round(float(shadow_yield), 2),
+                    'primary_confidence': round(primary_confidence, 4),
+                    'shadow_confidence': round(float(shadow_confidence), 4)
+                }, separators=(',', ':')))
+            self.scored += len(items)
+        
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'a') as log:
+            log.write('\n'.join(lines) + '\n')
+        
+        SHADOW_PREDICTIONS.labels(result="scored").inc(len(items))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Rolling agreement between the shadow and primary models"""
+        with self._stats_lock:
+            diffs = np.array(self._diffs, dtype=np.float64)
+            primary = np.array(self._primary, dtype=np.float64)
+        
+        summary: Dict[str, Any] = {
+            'model_path': self.model_path,
+            'shadow_version': self.model.model_version if self.model else None,
+            'scored': self.scored,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': self._queue.qsize(),
+            'window': len(diffs)
+        }
+        if len(diffs):
+            abs_diffs = np.abs(diffs)
+            summary.update({
+                'mean_diff': float(diffs.mean()),
+                'mean_abs_diff': float(abs_diffs.mean()),
+                'rmse_diff': float(np.sqrt((diffs ** 2).mean())),
+                'p95_abs_diff': float(np.percentile(abs_diffs, 95)),
+                'mean_abs_pct_diff': float((abs_diffs / np.maximum(np.abs(primary), 1e-9)).mean() * 100)
+            })
+        return summary
+
+
+class ModelManager:
+    """Loads the serving model once per process and reloads it when the active artifact changes"""
+    
+    def __init__(self, model_dir: str, reload_interval: float = 30.0):
+        self.model_dir = model_dir
+        self.reload_interval = reload_interval
+        self._model: Optional[CropYieldPredictor] = None
+        self._source: Optional[Tuple[str, float]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.shadow: Optional[ShadowEvaluator] = None
+    
+    def enable_shadow(
+        self,
+        model_path: str,
+        log_path: Optional[str] = None,
+        window: int = 1000,
+        max_cpu_share: float = 0.1
+    ) -> None:
+        """Score every live prediction with a candidate model as well"""
+        self.shadow = ShadowEvaluator(
+            model_path,
+            log_path or str(Path(self.model_dir) / "shadow_comparisons.jsonl"),
+            window=window,
+            max_cpu_share=max_cpu_share
+        )
+    
+    def submit_shadow(self, farm_id: str, feature_vector: np.ndarray, primary_yield: float, primary_confidence: float) -> None:
+        """Hand a primary prediction to the shadow model, if one is configured"""
+        if self.shadow is not None and self._model is not None:
+            self.shadow.submit(
+                farm_id, feature_vector, primary_yield, primary_confidence, self._model.model_version
+            )
+    
+    def get_model(self) -> CropYieldPredictor:
+        """Return the current model, checking the active artifact at most every reload_interval"""
+        now = time.monotonic()
+        if self._model is not None and now - self._checked_at < self.reload_interval:
+            return self._model
+        
+        with self._lock:
+            if self._model is not None and now - self._checked_at < self.reload_interval:
+                return self._model
+            
+            latest_model = resolve_model_path(model_registry, self.model_dir)
+            try:
+                source = (str(latest_model), latest_model.stat().st_mtime) if latest_model else None
+            except OSError as e:
+                # The artifact was swapped out between resolving and stat; keep serving
+                logger.warning(f"Could not stat model {latest_model}: {str(e)}")
+                if self._model is not None:
+                    self._checked_at = now
+                    return self._model
+                source = None
+                latest_model = None
+            if self._model is None or source != self._source:
+                self._model = self._load(latest_model)
+                self._source = source
+            self._checked_at = now
+        
+        return self._model
+    
+    def _load(self, path: Optional[Path]) -> CropYieldPredictor:
+        model = CropYieldPredictor()
+        if path is None:
+            logger.warning("No trained model found. Using default model.")
+            MODEL_LOADS.labels(role="primary", result="default").inc()
+            return model
+        
+        before = memory_usage()
+        try:
+            model.load_model(str(path), inference_only=True)
+            # Lazily mapped arrays only count towards RSS once a prediction touches them
+            if model.is_trained:
+                model.predict(np.zeros((1, len(model.feature_columns)), dtype=np.float64))
+        except Exception as e:
+            logger.error(f"Failed to load model: {str(e)}")
+            MODEL_LOADS.labels(role="primary", result="failed").inc()
+            return self._model or CropYieldPredictor()
+        after = memory_usage()
+        MODEL_LOADS.labels(role="primary", result="loaded").inc()
+        
+        # Memory-mapped arrays count as file-backed pages shared with the other
+        # workers; only the private (anonymous) growth is paid per process
+        private_delta = after['anon'] - before['anon']
+        MODEL_MEMORY_BYTES.labels(kind="private").set(private_delta)
+        MODEL_MEMORY_BYTES.labels(kind="shared").set(after['file'] - before['file'])
+        logger.info(
+            f"Model loaded from {path}: RSS {before['rss'] / 2**20:.1f} MiB -> "
+            f"{after['rss'] / 2**20:.1f} MiB (private +{private_delta / 2**20:.1f} MiB)"
+        )
+        
+        return model
+
+
+# Shared by every request handled in this process
+model_manager = ModelManager(settings.ML_MODEL_PATH)
+if settings.ML_SHADOW_MODEL_PATH:
+    model_manager.enable_shadow(
+        settings.ML_SHADOW_MODEL_PATH,
+        settings.ML_SHADOW_LOG_PATH,
+        window=settings.ML_SHADOW_STATS_WINDOW,
+        max_cpu_share=settings.ML_SHADOW_MAX_CPU_SHARE
+    )
@@ -5,26 +5,116 @@ ML model for crop yield prediction
 import joblib
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional
-from sklearn.ensemble import RandomForestRegressor
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler
+from sklearn.base import clone
+from app.ml.features import SENSOR_DEFAULTS, SEASON_BY_MONTH
+from app.ml.rules import rules_engine
+from app.ml.forest import FlatForest, save_flat_artifact, load_flat_artifact
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fallback output when no trained model is available
+DEFAULT_YIELD_KG_PER_HA = 3500.0
+DEFAULT_CONFIDENCE = 0.5
+
+# Forest hyperparameters used unless tuned values are supplied
+DEFAULT_FOREST_PARAMS: Dict[str, Any] = {
+    'n_estimators': 100,
+    'max_depth': 10
+}
+
+# Histogram gradient boosting: max_iter is an upper bound, early stopping picks the count
+DEFAULT_HGB_PARAMS: Dict[str, Any] = {
+    'max_iter': 500,
+    'learning_rate': 0.1,
+    'max_leaf_nodes': 31,
+    'min_samples_leaf': 20,
+    'l2_regularization': 0.0
+}
+
+RANDOM_FOREST = "random_forest"
+HIST_GRADIENT_BOOSTING = "hist_gradient_boosting"
+ESTIMATOR_BACKENDS = (RANDOM_FOREST, HIST_GRADIENT_BOOSTING)
+
+# Quantiles whose spread replaces tree variance as the boosting uncertainty;
+# for a normal error the 10-90% interval is 2 * 1.2816 standard deviations
+UNCERTAINTY_QUANTILES = (0.1, 0.9)
+_QUANTILE_INTERVAL_STDS = 2.5631
+
+# Generalisation estimates: out-of-bag predictions from the single fit, or k-fold refits
+EVALUATION_MODES = ("oob", "cv")
+
+
+def _to_naive_utc(value: Union[date, datetime]) -> datetime:
+    """Normalise dates and aware datetimes to naive UTC datetimes"""
+    if not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def build_estimator(
+    backend: str,
+    params: Optional[Dict[str, Any]] = None,
+    n_jobs: int = -1,
+    random_state: int = 42
+) -> Any:
+    """Unfitted regressor for a backend, with defaults filled in"""
+    if backend == RANDOM_FOREST:
+        return RandomForestRegressor(
+            **{**DEFAULT_FOREST_PARAMS, **(params or {})},
+            random_state=random_state,
+            n_jobs=n_jobs
+        )
+    if backend == HIST_GRADIENT_BOOSTING:
+        # Threads come from OpenMP, so n_jobs does not apply
+        return HistGradientBoostingRegressor(
+            **{**DEFAULT_HGB_PARAMS, **(params or {})},
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=10,
+            scoring='neg_mean_absolute_error',
+            random_state=random_state
+        )
+    raise ValueError(f"Unknown estimator backend: {backend}")
+
+
+def latest_model_path(model_dir: str) -> Optional[Path]:
+    """Most recently written joblib model in a directory"""
+    model_files = list(Path(model_dir).glob("*.joblib"))
+    if not model_files:
+        return None
+    return max(model_files, key=lambda x: x.stat().st_mtime)
+
+
+def flat_artifact_path(filepath: str) -> str:
+    """Pointer to the compiled forest artifact stored next to a joblib model"""
+    return str(Path(filepath).with_suffix('.flat'))
+
 
 class CropYieldPredictor:
     """Crop yield prediction model"""
     
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            n_jobs=-1
-        )
+    def __init__(
+        self,
+        n_jobs: int = -1,
+        params: Optional[Dict[str, Any]] = None,
+        backend: str = RANDOM_FOREST
+    ):
+        self.backend = backend
+        self.model = build_estimator(backend, params, n_jobs=n_jobs)
+        defaults = DEFAULT_FOREST_PARAMS if backend == RANDOM_FOREST else DEFAULT_HGB_PARAMS
+        self.params = {**defaults, **(params or {})}
+        # Lower and upper quantile models (boosting backend only)
+        self.quantile_models: Optional[List[Any]] = None
         self.scaler = StandardScaler()
         self.feature_columns = [
             'soil_moisture', 'soil_ph', 'nitrogen', 'phosphorus', 'potassium',
@@ -33,7 +123,17 @@ class CropYieldPredictor:
         ]
         self.is_trained = False
         self.model_version = "v0.1.0"
-        self.metrics = {}
+        self.metrics: Dict[str, Any] = {}
+        # Missing-value defaults for single-row encoding (training medians once trained)
+        self.feature_defaults = {
+            **SENSOR_DEFAULTS,
+            'days_since_planting': 90.0,
+            'season_encoded': 1.0
+        }
+        # Compiled tree arrays used for inference when available
+        self.forest: Optional[FlatForest] = None
+        # Newest reading timestamp covered by training; incremental updates start after it
+        self.data_watermark: Optional[datetime] = None
     
     def prepare_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Prepare features for training/prediction"""
@@ -49,11 +149,13 @@ class CropYieldPredictor:
             if col in df.columns:
                 df[col] = df[col].fillna(df[col].median())
         
-        # Add derived features
+        # Add derived features (loaders may supply them precomputed)
         if 'planting_date' in df.columns and 'timestamp' in df.columns:
             df['planting_date'] = pd.to_datetime(df['planting_date'])
             df['timestamp'] = pd.to_datetime(df['timestamp'])
             df['days_since_planting'] = (df['timestamp'] - df['planting_date']).dt.days
+        elif 'days_since_planting' in df.columns:
+            df['days_since_planting'] = df['days_since_planting'].fillna(self.feature_defaults['days_since_planting'])
         else:
             df['days_since_planting'] = 90  # Default value
         
@@ -67,7 +169,7 @@ class CropYieldPredictor:
                 6: 2, 7: 2, 8: 2,   # Summer
                 9: 3, 10: 3, 11: 3  # Fall
             })
-        else:
+        elif 'season_encoded' not in df.columns:
             df['season_encoded'] = 1  # Default to spring
         
         # Ensure all required features are present
@@ -77,24 +179,72 @@ class CropYieldPredictor:
         
         return df[self.feature_columns]
     
-    def train(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
-        """Train the model"""
+    def encode_features(
+        self,
+        record: Dict[str, Any],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Encode one feature record into a float32 row without pandas"""
+        if out is None:
+            out = np.empty((1, len(self.feature_columns)), dtype=np.float32)
+        row = out.reshape(-1)
+        
+        timestamp = record.get('timestamp')
+        planting_date = record.get('planting_date')
+        
+        for index, column in enumerate(self.feature_columns):
+            value = record.get(column)
+            
+            if value is None and column == 'days_since_planting':
+                if timestamp is not None and planting_date is not None:
+                    value = (_to_naive_utc(timestamp) - _to_naive_utc(planting_date)).days
+            elif value is None and column == 'season_encoded':
+                if timestamp is not None:
+                    value = SEASON_BY_MONTH[timestamp.month]
+            
+            if value is None or value != value:
+                value = self.feature_defaults.get(column, 0.0)
+            
+            row[index] = value
+        
+        return out
+    
+    def train(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        evaluation: str = "oob",
+        cv_folds: int = 5
+    ) -> Dict[str, Any]:
+        """Train the model, estimating generalisation error from OOB samples or k-fold CV"""
+        if evaluation not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode: {evaluation}")
+        
         logger.info(f"Training model with {len(X)} samples and {len(X.columns)} features")
         
         # Prepare features
         X_processed = self.prepare_features(X)
+        self.feature_defaults = {
+            column: float(value)
+            for column, value in X_processed.median().items()
+            if pd.notna(value)
+        }
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X_processed, y, test_size=0.2, random_state=42
         )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Scale features; trees split on float32 values either way
+        X_train_scaled = self.scaler.fit_transform(X_train).astype(np.float32)
+        X_test_scaled = self.scaler.transform(X_test).astype(np.float32)
         
-        # Train model
-        self.model.fit(X_train_scaled, y_train)
+        if self.backend == RANDOM_FOREST:
+            # Train model (OOB predictions come from the same fit at little extra cost)
+            self.model.set_params(oob_score=evaluation == "oob")
+            self.model.fit(X_train_scaled, y_train)
+        else:
+            self._fit_boosting(X_train_scaled, y_train)
         
         # Make predictions
         y_pred = self.model.predict(X_test_scaled)
@@ -104,50 +254,182 @@ class CropYieldPredictor:
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         r2 = r2_score(y_test, y_pred)
         
-        # Cross-validation
-        cv_scores = cross_val_score(
-            self.model, X_train_scaled, y_train, cv=5, scoring='neg_mean_absolute_error'
-        )
-        cv_mae = -cv_scores.mean()
-        
         self.metrics = {
             'mae': mae,
             'rmse': rmse,
             'r2': r2,
-            'cv_mae': cv_mae,
+            'evaluation': evaluation,
+            **self._evaluate(X_train_scaled, y_train, evaluation, cv_folds),
             'n_samples': len(X),
-            'n_features': len(X_processed.columns)
+            'n_features': len(X_processed.columns),
+            'backend': self.backend,
+            'params': dict(self.params)
         }
         
         self.is_trained = True
+        if self.backend == RANDOM_FOREST:
+            self.forest = FlatForest.from_estimator(self.model)
         
         logger.info(f"Model training completed. MAE: {mae:.3f}, RMSE: {rmse:.3f}, R²: {r2:.3f}")
         
         return self.metrics
     
-    def predict(self, X: pd.DataFrame) -> Dict[str, Any]:
-        """Make predictions"""
+    def _evaluate(
+        self,
+        X_train: np.ndarray,
+        y_train: pd.Series,
+        evaluation: str,
+        cv_folds: int
+    ) -> Dict[str, float]:
+        """Error estimate on the training split without touching the test split"""
+        if evaluation == "oob" and self.backend == HIST_GRADIENT_BOOSTING:
+            # No bootstrap here; the early-stopping split plays the same role
+            return {
+                'validation_mae': -self.model.validation_score_[-1],
+                'n_iter': self.model.n_iter_
+            }
+        
+        if evaluation == "oob":
+            metrics = {
+                'oob_mae': mean_absolute_error(y_train, self.model.oob_prediction_),
+                'oob_r2': self.model.oob_score_
+            }
+            # One float per training row; not worth keeping in the saved model
+            del self.model.oob_prediction_
+            return metrics
+        
+        if self.backend == HIST_GRADIENT_BOOSTING:
+            # Boosting already uses every core per fit, so folds run one at a time
+            cv_scores = cross_val_score(
+                clone(self.model), X_train, y_train, cv=cv_folds, scoring='neg_mean_absolute_error'
+            )
+            return {'cv_mae': -cv_scores.mean()}
+        
+        # Folds run in parallel worker processes, each fitting a single-threaded
+        # forest; joblib memory-maps the training matrix instead of copying it
+        cv_scores = cross_val_score(
+            clone(self.model).set_params(n_jobs=1),
+            X_train,
+            y_train,
+            cv=cv_folds,
+            scoring='neg_mean_absolute_error',
+            n_jobs=min(cv_folds, joblib.effective_n_jobs(self.model.n_jobs))
+        )
+        return {'cv_mae': -cv_scores.mean()}
+    
+    def _fit_boosting(self, X_train: np.ndarray, y_train: pd.Series) -> None:
+        """Fit the boosting model and the quantile models bounding its error"""
+        self.model.fit(X_train, y_train)
+        
+        self.quantile_models = []
+        for quantile in UNCERTAINTY_QUANTILES:
+            quantile_model = clone(self.model).set_params(
+                loss='quantile', quantile=quantile, scoring='loss'
+            )
+            quantile_model.fit(X_train, y_train)
+            self.quantile_models.append(quantile_model)
+    
+    def train_incremental(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        n_new_trees: int = 20,
+        max_trees: int = 300
+    ) -> Dict[str, Any]:
+        """Add trees fitted on new data only, dropping the oldest beyond max_trees"""
+        if self.backend != RANDOM_FOREST:
+            raise ValueError("Incremental training is only supported for the random forest backend")
+        if not self.is_trained or not hasattr(self.model, 'estimators_'):
+            raise ValueError("Incremental training needs a trained model with its estimator")
+        
+        logger.info(
+            f"Adding {n_new_trees} trees for {len(X)} new samples "
+            f"to {len(self.model.estimators_)} existing trees"
+        )
+        
+        # Keep the existing scaling so old and new trees see the same inputs
+        X_processed = self.prepare_features(X)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_processed, y, test_size=0.2, random_state=42
+        )
+        X_train_scaled = self.scaler.transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+        
+        # Fresh seeds per update; otherwise trees would reuse the seeds of pruned ones
+        generation = int(self.metrics.get('generation', 0)) + 1
+        self.model.set_params(
+            oob_score=False,
+            warm_start=True,
+            n_estimators=len(self.model.estimators_) + n_new_trees,
+            random_state=42 + generation
+        )
+        self.model.fit(X_train_scaled, y_train)
+        
+        pruned = max(0, len(self.model.estimators_) - max_trees)
+        if pruned:
+            self.model.estimators_ = self.model.estimators_[pruned:]
+            self.model.n_estimators = len(self.model.estimators_)
+        
+        y_pred = self.model.predict(X_test_scaled)
+        
+        self.metrics = {
+            'mae': mean_absolute_error(y_test, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
+            'r2': r2_score(y_test, y_pred),
+            'n_samples': len(X),
+            'n_features': len(X_processed.columns),
+            'n_trees': len(self.model.estimators_),
+            'trees_added': n_new_trees,
+            'trees_pruned': pruned,
+            'generation': generation,
+            'incremental': True,
+            'params': dict(self.params)
+        }
+        
+        self.forest = FlatForest.from_estimator(self.model)
+        
+        logger.info(
+            f"Incremental update completed ({pruned} trees pruned). "
+            f"MAE on new data: {self.metrics['mae']:.3f}"
+        )
+        
+        return self.metrics
+    
+    def predict(self, X: Union[pd.DataFrame, np.ndarray, Dict[str, Any]]) -> Dict[str, Any]:
+        """Make predictions from a frame, an encoded matrix or a single record"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
-        # Prepare features
-        X_processed = self.prepare_features(X)
+        if isinstance(X, dict):
+            X = self.encode_features(X)
         
-        # Scale features
-        X_scaled = self.scaler.transform(X_processed)
+        if not isinstance(X, np.ndarray):
+            # Prepare features
+            X = self.prepare_features(X).to_numpy(dtype=np.float64)
         
-        # Make predictions
-        predictions = self.model.predict(X_scaled)
+        # Scale features (same arithmetic as StandardScaler.transform, without validation)
+        X_scaled = ((X - self.scaler.mean_) / self.scaler.scale_).astype(np.float32)
         
-        # Calculate confidence (based on prediction variance)
-        if hasattr(self.model, 'estimators_'):
+        if self.forest is not None:
+            # Walk all trees for the whole batch at once
+            predictions, prediction_std = self.forest.predict(X_scaled)
+            confidence = 1.0 / (1.0 + prediction_std)  # Higher std = lower confidence
+        elif self.quantile_models:
+            # Interquantile spread stands in for the spread across trees
+            predictions = self.model.predict(X_scaled)
+            lower, upper = (model.predict(X_scaled) for model in self.quantile_models)
+            prediction_std = np.maximum(upper - lower, 0.0) / _QUANTILE_INTERVAL_STDS
+            confidence = 1.0 / (1.0 + prediction_std)
+        elif hasattr(self.model, 'estimators_'):
             # For ensemble models, calculate prediction variance
+            predictions = self.model.predict(X_scaled)
             individual_predictions = np.array([
                 estimator.predict(X_scaled) for estimator in self.model.estimators_
             ])
             prediction_std = np.std(individual_predictions, axis=0)
             confidence = 1.0 / (1.0 + prediction_std)  # Higher std = lower confidence
         else:
+            predictions = self.model.predict(X_scaled)
             confidence = np.ones(len(predictions)) * 0.8  # Default confidence
         
         return {
@@ -161,7 +443,12 @@ class CropYieldPredictor:
         if not self.is_trained:
             return {}
         
-        importance = dict(zip(self.feature_columns, self.model.feature_importances_))
+        if hasattr(self.model, 'feature_importances_'):
+            importances = self.model.feature_importances_
+        else:
+            importances = self.metrics.get('feature_importances', [])
+        
+        importance = dict(zip(self.feature_columns, importances))
         return dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
     
     def save_model(self, filepath: str) -> None:
@@ -172,13 +459,54 @@ class CropYieldPredictor:
             'feature_columns': self.feature_columns,
             'is_trained': self.is_trained,
             'model_version': self.model_version,
-            'metrics': self.metrics
+            'metrics': self.metrics,
+            'feature_defaults': self.feature_defaults,
+            'data_watermark': self.data_watermark,
+            'backend': self.backend,
+            'quantile_models': self.quantile_models
         }
         joblib.dump(model_data, filepath)
         logger.info(f"Model saved to {filepath}")
+        
+        if self.forest is not None:
+            self.export_flat_forest(flat_artifact_path(filepath))
+    
+    def export_flat_forest(self, filepath: str) -> None:
+        """Export the compiled forest and everything inference needs"""
+        if self.forest is None:
+            raise ValueError("Only a trained random forest can be exported")
+        
+        if hasattr(self.model, 'feature_importances_'):
+            importances = self.model.feature_importances_.tolist()
+        else:
+            importances = self.metrics.get('feature_importances', [])
+        
+        save_flat_artifact(
+            filepath,
+            self.forest,
+            scaler_mean=self.scaler.mean_,
+            scaler_scale=self.scaler.scale_,
+            metadata={
+                'feature_columns': self.feature_columns,
+                'feature_defaults': self.feature_defaults,
+                'model_version': self.model_version,
+                'backend': self.backend,
+                'data_watermark': self.data_watermark.isoformat() if self.data_watermark else None,
+                'metrics': {
+                    **self.metrics,
+                    'feature_importances': importances
+                }
+            }
+        )
     
-    def load_model(self, filepath: str) -> None:
+    def load_model(self, filepath: str, inference_only: bool = False) -> None:
         """Load model from file"""
+        if inference_only:
+            artifact_path = flat_artifact_path(filepath)
+            if self._load_flat_forest(artifact_path):
+                logger.info(f"Model loaded from {artifact_path}")
+                return
+        
         model_data = joblib.load(filepath)
         self.model = model_data['model']
         self.scaler = model_data['scaler']
@@ -186,98 +514,39 @@ class CropYieldPredictor:
         self.is_trained = model_data['is_trained']
         self.model_version = model_data['model_version']
         self.metrics = model_data['metrics']
+        self.params = self.metrics.get('params', self.params)
+        self.feature_defaults = model_data.get('feature_defaults', self.feature_defaults)
+        self.data_watermark = model_data.get('data_watermark')
+        self.backend = model_data.get('backend', RANDOM_FOREST)
+        self.quantile_models = model_data.get('quantile_models')
+        if self.is_trained and hasattr(self.model, 'estimators_'):
+            self.forest = FlatForest.from_estimator(self.model)
         logger.info(f"Model loaded from {filepath}")
     
+    def _load_flat_forest(self, filepath: str) -> bool:
+        """Load the inference-only artifact, skipping the pickled estimator"""
+        artifact = load_flat_artifact(filepath)
+        if artifact is None:
+            return False
+        
+        metadata = artifact['metadata']
+        self.forest = artifact['forest']
+        self.scaler.mean_ = artifact['scaler_mean']
+        self.scaler.scale_ = artifact['scaler_scale']
+        self.feature_columns = metadata['feature_columns']
+        self.feature_defaults = metadata['feature_defaults']
+        self.model_version = metadata['model_version']
+        self.metrics = metadata['metrics']
+        self.backend = metadata.get('backend', RANDOM_FOREST)
+        if metadata.get('data_watermark'):
+            self.data_watermark = datetime.fromisoformat(metadata['data_watermark'])
+        self.is_trained = True
+        return True
+    
     def generate_recommendations(
         self, 
         features: Dict[str, float], 
         predicted_yield: float
     ) -> List[Dict[str, Any]]:
         """Generate actionable recommendations based on features and prediction"""
-        recommendations = []
-        
-        # Soil moisture recommendations
-        soil_moisture = features.get('soil_moisture', 0)
-        if soil_moisture < 20:
-            recommendations.append({
-                'type': 'irrigation',
-                'text': 'Soil moisture is low. Irrigate with 20-30mm of water.',
-                'priority': 1,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 5-10%'
-            })
-        elif soil_moisture > 80:
-            recommendations.append({
-                'type': 'irrigation',
-                'text': 'Soil moisture is high. Reduce irrigation to prevent waterlogging.',
-                'priority': 2,
-                'scheduled_date': None,
-                'estimated_impact': 'Prevent yield loss of 3-5%'
-            })
-        
-        # Soil pH recommendations
-        soil_ph = features.get('soil_ph', 0)
-        if soil_ph < 6.0:
-            recommendations.append({
-                'type': 'fertilizer',
-                'text': 'Soil pH is acidic. Apply lime to raise pH to 6.5-7.0.',
-                'priority': 2,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 8-12%'
-            })
-        elif soil_ph > 8.0:
-            recommendations.append({
-                'type': 'fertilizer',
-                'text': 'Soil pH is alkaline. Apply sulfur to lower pH.',
-                'priority': 2,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 5-8%'
-            })
-        
-        # NPK recommendations
-        nitrogen = features.get('nitrogen', 0)
-        phosphorus = features.get('phosphorus', 0)
-        potassium = features.get('potassium', 0)
-        
-        if nitrogen < 30:
-            recommendations.append({
-                'type': 'fertilizer',
-                'text': 'Nitrogen levels are low. Apply 15-20kg N per hectare.',
-                'priority': 1,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 10-15%'
-            })
-        
-        if phosphorus < 15:
-            recommendations.append({
-                'type': 'fertilizer',
-                'text': 'Phosphorus levels are low. Apply 10-15kg P per hectare.',
-                'priority': 2,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 5-8%'
-            })
-        
-        if potassium < 100:
-            recommendations.append({
-                'type': 'fertilizer',
-                'text': 'Potassium levels are low. Apply 20-25kg K per hectare.',
-                'priority': 2,
-                'scheduled_date': None,
-                'estimated_impact': 'Increase yield by 3-5%'
-            })
-        
-        # Temperature recommendations
-        air_temp = features.get('air_temperature', 0)
-        if air_temp > 35:
-            recommendations.append({
-                'type': 'irrigation',
-                'text': 'High temperature detected. Increase irrigation frequency.',
-                'priority': 1,
-                'scheduled_date': None,
-                'estimated_impact': 'Prevent heat stress and yield loss'
-            })
-        
-        # Sort by priority
-        recommendations.sort(key=lambda x: x['priority'])
-        
-        return recommendations
+        return rules_engine.evaluate([{**features, 'predicted_yield': predicted_yield}])[0]
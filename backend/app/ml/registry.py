@@ -0,0 +1,150 @@
+"""
+Content-addressed model artifact registry
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional
+import logging
+
+from app.core.config import settings
+from app.ml.model import CropYieldPredictor, latest_model_path
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_NAME = "model.joblib"
+ACTIVE_POINTER = "ACTIVE"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as artifact:
+        for block in iter(lambda: artifact.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Immutable model artifacts stored under the SHA-256 of their joblib file"""
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.artifacts_dir = self.root / "artifacts"
+        self.tmp_dir = self.root / "tmp"
+        self.pointer_path = self.root / ACTIVE_POINTER
+    
+    def publish(self, model: CropYieldPredictor) -> Path:
+        """Write a model and its inference artifact, then move them into place atomically"""
+        staging = self.tmp_dir / uuid.uuid4().hex
+        staging.mkdir(parents=True)
+        model.save_model(str(staging / ARTIFACT_NAME))
+        
+        digest = _file_digest(staging / ARTIFACT_NAME)
+        target = self.artifacts_dir / digest[:2] / digest
+        if target.exists():
+            # Identical content is already published
+            shutil.rmtree(staging)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staging, target)
+        
+        logger.info(f"Published model artifact {digest[:12]}")
+        
+        return target / ARTIFACT_NAME
+    
+    def activate(self, artifact_path: Path) -> None:
+        """Point serving processes at a published artifact"""
+        relative = Path(artifact_path).resolve().relative_to(self.root.resolve())
+        tmp_path = self.pointer_path.with_name(f"{ACTIVE_POINTER}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(str(relative))
+        os.replace(tmp_path, self.pointer_path)
+    
+    def active_path(self) -> Optional[Path]:
+        """Artifact named by the active pointer (one small read, no directory scan)"""
+        try:
+            relative = self.pointer_path.read_text().strip()
+        except FileNotFoundError:
+            return None
+        
+        path = self.root / relative
+        return path if path.exists() else None
+    
+    def artifact_dirs(self) -> List[Path]:
+        if not self.artifacts_dir.exists():
+            return []
+        return [path for path in self.artifacts_dir.glob("*/*") if path.is_dir()]
+    
+    def prune(
+        self,
+        retain: Iterable[str],
+        min_age_seconds: float = 3600,
+        dry_run: bool = False
+    ) -> List[Path]:
+        """Delete artifacts not in retain, sparing recent ones that may not be recorded yet"""
+        keep = {Path(path).resolve().parent for path in retain if path}
+        active = self.active_path()
+        if active is not None:
+            keep.add(active.resolve().parent)
+        
+        cutoff = time.time() - min_age_seconds
+        candidates = self.artifact_dirs()
+        if self.tmp_dir.exists():
+            candidates.extend(path for path in self.tmp_dir.iterdir() if path.is_dir())
+        
+        removed = []
+        for path in candidates:
+            if path.resolve() in keep or path.stat().st_mtime > cutoff:
+                continue
+            if not dry_run:
+                shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+        
+        if not dry_run:
+            for shard in self.artifacts_dir.glob("*"):
+                if shard.is_dir() and not any(shard.iterdir()):
+                    shard.rmdir()
+        
+        return removed
+
+
+def resolve_model_path(registry: ModelRegistry, model_dir: str) -> Optional[Path]:
+    """Active registry artifact, or the newest legacy file for unmigrated deployments"""
+    return registry.active_path() or latest_model_path(model_dir)
+
+
+# Shared by training, batch jobs and serving processes
+model_registry = ModelRegistry(
+    settings.ML_REGISTRY_PATH or str(Path(settings.ML_MODEL_PATH) / "registry")
+)
+
+
+if __name__ == "__main__":
+    # Imported here so serving code can use the registry without the database layer
+    from app.core.database import AsyncSessionLocal
+    from app.services.model_registry_service import ModelRegistryService
+    
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Manage published model artifacts")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subcommands.add_parser("gc", help="Delete artifacts outside the retention policy")
+    gc_parser.add_argument("--keep", type=int, default=settings.ML_REGISTRY_KEEP_VERSIONS, help="Most recent versions to keep")
+    gc_parser.add_argument("--legacy", action="store_true", help="Also delete unreferenced model_*.joblib files")
+    gc_parser.add_argument("--dry-run", action="store_true", help="List what would be deleted")
+    args = parser.parse_args()
+    
+    async def run_gc():
+        async with AsyncSessionLocal() as db:
+            return await ModelRegistryService(db, model_registry).collect_garbage(
+                keep=args.keep,
+                include_legacy=args.legacy,
+                dry_run=args.dry_run
+            )
+    
+    summary = asyncio.run(run_gc())
+    logger.info(f"Registry garbage collection: {summary}")
@@ -0,0 +1,151 @@
+"""
+Table-driven recommendation rules evaluated over feature matrices
+"""
+
+import json
+import operator
+import threading
+import time
+from types import MappingProxyType
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = Path(__file__).with_name('recommendation_rules.json')
+
+# Comparison operators a rule may use
+RULE_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+# Value used when a record lacks a rule's feature
+MISSING_FEATURE_VALUE = 0.0
+
+
+class RuleSet:
+    """A versioned set of rules compiled into per-feature threshold arrays"""
+    
+    def __init__(self, version: int, rules: Sequence[Dict[str, Any]]):
+        for rule in rules:
+            if rule['op'] not in RULE_OPERATORS:
+                raise ValueError(f"Rule {rule.get('id')} has unsupported operator {rule['op']!r}")
+        
+        self.version = version
+        # Stable sort keeps file order within a priority, so output needs no per-row sort
+        self.rules = sorted(rules, key=lambda rule: rule['priority'])
+        self.features = sorted({rule['feature'] for rule in self.rules})
+        
+        column = {name: index for index, name in enumerate(self.features)}
+        self._columns = np.array([column[rule['feature']] for rule in self.rules], dtype=np.intp)
+        self._thresholds = np.array([rule['threshold'] for rule in self.rules], dtype=np.float64)
+        self._ops = [
+            (RULE_OPERATORS[op], np.array([rule['op'] == op for rule in self.rules]))
+            for op in RULE_OPERATORS
+        ]
+        # Read-only templates; callers get fresh dicts built from them
+        self._recommendations: List[Mapping[str, Any]] = [
+            MappingProxyType({
+                'type': rule['type'],
+                'text': rule['text'],
+                'priority': rule['priority'],
+                'scheduled_date': None,
+                'estimated_impact': rule.get('estimated_impact')
+            })
+            for rule in self.rules
+        ]
+    
+    @classmethod
+    def from_file(cls, path: Path) -> "RuleSet":
+        config = json.loads(Path(path).read_text())
+        return cls(version=config['version'], rules=config['rules'])
+    
+    def feature_matrix(self, records: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Gather the features the rules reference into an (n_records, n_features) matrix"""
+        X = np.empty((len(records), len(self.features)), dtype=np.float64)
+        for index, name in enumerate(self.features):
+            # None converts to NaN, which is then treated as missing
+            X[:, index] = np.array([record.get(name) for record in records], dtype=np.float64)
+        X[np.isnan(X)] = MISSING_FEATURE_VALUE
+        return X
+    
+    def evaluate_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Boolean (n_rows, n_rules) matrix of which rules fire for each row"""
+        values = X[:, self._columns]
+        fired = np.zeros(values.shape, dtype=bool)
+        for compare, selected in self._ops:
+            if selected.any():
+                fired[:, selected] = compare(values[:, selected], self._thresholds[selected])
+        return fired
+    
+    def evaluate(self, records: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Recommendations for each record, ordered by priority"""
+        if not records:
+            return []
+        
+        fired = self.evaluate_matrix(self.feature_matrix(records))
+        
+        # Rows firing the same rules share one template list; each row gets its own copies
+        templates: Dict[bytes, List[Mapping[str, Any]]] = {}
+        results = []
+        for row, key in zip(fired, np.packbits(fired, axis=1)):
+            key = key.tobytes()
+            template = templates.get(key)
+            if template is None:
+                template = [self._recommendations[index] for index in np.flatnonzero(row)]
+                templates[key] = template
+            results.append([dict(recommendation) for recommendation in template])
+        
+        return results
+
+
+class RulesEngine:
+    """Serves the current rule set, reloading the rules file when it changes"""
+    
+    def __init__(self, path: Path = DEFAULT_RULES_PATH, reload_interval: float = 5.0):
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self._ruleset: Optional[RuleSet] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def configure(self, path: Optional[str]) -> None:
+        """Point the engine at a rules file, keeping the bundled rules when empty"""
+        with self._lock:
+            self.path = Path(path) if path else DEFAULT_RULES_PATH
+            self._ruleset = None
+            self._mtime = None
+    
+    def get_ruleset(self) -> RuleSet:
+        now = time.monotonic()
+        if self._ruleset is not None and now - self._checked_at < self.reload_interval:
+            return self._ruleset
+        
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+                if self._ruleset is None or mtime != self._mtime:
+                    ruleset = RuleSet.from_file(self.path)
+                    logger.info(f"Loaded recommendation rules v{ruleset.version} from {self.path}")
+                    self._ruleset, self._mtime = ruleset, mtime
+            except Exception as e:
+                # Keep serving the last good rules when an edit is broken
+                logger.error(f"Failed to load recommendation rules from {self.path}: {str(e)}")
+                if self._ruleset is None:
+                    self._ruleset = RuleSet.from_file(DEFAULT_RULES_PATH)
+            self._checked_at = now
+        
+        return self._ruleset
+    
+    def evaluate(self, records: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        return self.get_ruleset().evaluate(records)
+
+
+# Shared by online predictions and the batch job
+rules_engine = RulesEngine()
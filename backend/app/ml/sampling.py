@@ -0,0 +1,116 @@
+"""
+Bounded-size sampling of streamed training rows
+"""
+
+import zlib
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+# Priorities hashed from a stable row key and seed make the sample independent
+# of arrival order; random priorities make it a plain reservoir sample
+class BottomKSampler:
+    """Uniform fixed-size sample: the k rows with the smallest priorities seen so far"""
+    
+    def __init__(self, k: int, n_columns: int, seed: int = 42):
+        self.k = k
+        self.n_columns = n_columns
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._values = np.empty((0, n_columns), dtype=np.float32)
+        self._priorities = np.empty(0, dtype=np.float64)
+        self._pending_values: List[np.ndarray] = []
+        self._pending_priorities: List[np.ndarray] = []
+        self._pending = 0
+        # Largest priority still inside the sample once it is full
+        self._threshold = np.inf
+    
+    def add(self, values: np.ndarray, priorities: Optional[np.ndarray] = None) -> None:
+        """Offer a chunk of rows; rows that cannot enter the sample are dropped immediately"""
+        if len(values) == 0 or self.k <= 0:
+            return
+        self.seen += len(values)
+        if priorities is None:
+            priorities = self._rng.random(len(values))
+        
+        keep = priorities < self._threshold
+        if not keep.all():
+            values, priorities = values[keep], priorities[keep]
+        if len(values) == 0:
+            return
+        
+        self._pending_values.append(np.asarray(values, dtype=np.float32))
+        self._pending_priorities.append(np.asarray(priorities, dtype=np.float64))
+        self._pending += len(values)
+        
+        # Compact once the candidates could fill a whole sample (amortised O(rows))
+        if self._pending >= self.k:
+            self._compact()
+    
+    def _compact(self) -> None:
+        values = np.concatenate([self._values, *self._pending_values])
+        priorities = np.concatenate([self._priorities, *self._pending_priorities])
+        self._pending_values, self._pending_priorities, self._pending = [], [], 0
+        
+        if len(priorities) > self.k:
+            selected = np.argpartition(priorities, self.k - 1)[:self.k]
+            values, priorities = values[selected], priorities[selected]
+            self._threshold = priorities.max()
+        
+        self._values, self._priorities = values, priorities
+    
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The sampled rows and their priorities, ordered by priority"""
+        self._compact()
+        order = np.argsort(self._priorities, kind='stable')
+        return self._values[order], self._priorities[order]
+    
+    def __len__(self) -> int:
+        return min(self.k, len(self._values) + self._pending)
+
+
+class StratifiedSampler:
+    """Independent bottom-k samples of up to per_stratum rows for every stratum"""
+    
+    def __init__(self, per_stratum: int, n_columns: int, seed: int = 42):
+        self.per_stratum = per_stratum
+        self.n_columns = n_columns
+        self.seed = seed
+        self.strata: Dict[Hashable, BottomKSampler] = {}
+    
+    def add(
+        self,
+        values: np.ndarray,
+        strata: Sequence[Hashable],
+        priorities: Optional[np.ndarray] = None
+    ) -> None:
+        """Offer a chunk of rows with the stratum of each row"""
+        if len(values) == 0:
+            return
+        
+        keys, inverse = np.unique(np.asarray(strata, dtype=object), return_inverse=True)
+        for index, key in enumerate(keys):
+            rows = inverse == index
+            sampler = self.strata.get(key)
+            if sampler is None:
+                # Seed from the key so strata do not depend on arrival order
+                sampler = BottomKSampler(
+                    self.per_stratum, self.n_columns, seed=self.seed + zlib.crc32(str(key).encode('utf-8'))
+                )
+                self.strata[key] = sampler
+            sampler.add(values[rows], None if priorities is None else priorities[rows])
+    
+    def result(self) -> Tuple[np.ndarray, List[Hashable]]:
+        """All sampled rows (grouped by stratum) and the stratum of each row"""
+        values, labels = [], []
+        for key in sorted(self.strata, key=str):
+            stratum_values, _ = self.strata[key].result()
+            values.append(stratum_values)
+            labels.extend([key] * len(stratum_values))
+        
+        if not values:
+            return np.empty((0, self.n_columns), dtype=np.float32), []
+        return np.concatenate(values), labels
+    
+    def counts(self) -> Dict[Hashable, int]:
+        return {key: len(sampler) for key, sampler in self.strata.items()}
@@ -0,0 +1,164 @@
+"""
+On-disk training dataset snapshots extended incrementally by data watermark
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Segments are merged once a snapshot has more than this many
+MAX_SEGMENTS = 8
+
+
+def snapshot_key(feature_version: int, config: Dict[str, Any]) -> str:
+    """Directory name for a feature definition version and loader configuration"""
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f"v{feature_version}-{digest[:12]}"
+
+
+class TrainingSnapshot:
+    """Append-only columnar copy of a training set: float32 feature segments plus row timestamps"""
+    
+    def __init__(self, root: str, key: str, columns: Sequence[str]):
+        self.path = Path(root) / key
+        self.columns = list(columns)
+        self.meta = self._read_meta()
+        # Segments written but not yet published by commit(): (name, rows)
+        self._pending: List[Tuple[str, int]] = []
+    
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        meta_path = self.path / 'meta.json'
+        if not meta_path.exists():
+            return None
+        
+        meta = json.loads(meta_path.read_text())
+        if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION or meta.get('columns') != self.columns:
+            logger.warning(f"Ignoring incompatible training snapshot at {self.path}")
+            return None
+        return meta
+    
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Timestamp of the newest row already in the snapshot"""
+        if not self.meta or not self.meta.get('watermark'):
+            return None
+        return datetime.fromisoformat(self.meta['watermark'])
+    
+    @property
+    def rows(self) -> int:
+        return self.meta['rows'] if self.meta else 0
+    
+    def append(self, values: np.ndarray, epochs: np.ndarray, watermark: datetime) -> None:
+        """Add rows newer than the current watermark and advance it"""
+        if len(values):
+            self.write_segment(values, epochs)
+        self.commit(watermark)
+    
+    def write_segment(self, values: np.ndarray, epochs: np.ndarray) -> None:
+        """Write one segment of rows; readers only see it once commit() publishes it"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        next_segment = self.meta['next_segment'] if self.meta else 0
+        name = f"segment_{next_segment + len(self._pending):05d}"
+        
+        np.save(self.path / f"{name}.values.npy", np.ascontiguousarray(values, dtype=np.float32))
+        np.save(self.path / f"{name}.epoch.npy", np.ascontiguousarray(epochs, dtype=np.float64))
+        self._pending.append((name, len(values)))
+    
+    def commit(self, watermark: datetime) -> None:
+        """Publish every segment written since the last commit and advance the watermark"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        segments = list(self.meta['segments']) if self.meta else []
+        next_segment = self.meta['next_segment'] if self.meta else 0
+        
+        meta = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'columns': self.columns,
+            'segments': segments + [name for name, _ in self._pending],
+            'next_segment': next_segment + len(self._pending),
+            'rows': self.rows + sum(rows for _, rows in self._pending),
+            'watermark': watermark.isoformat(),
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        self._write_meta(meta)
+        self._pending = []
+        
+        if len(meta['segments']) > MAX_SEGMENTS:
+            self.compact()
+    
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        # Segment files are written first; publishing the metadata commits them
+        tmp_path = self.path / 'meta.json.tmp'
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, self.path / 'meta.json')
+        self.meta = meta
+    
+    def load(self, mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """All snapshot rows and their epoch timestamps; a single segment stays memory-mapped"""
+        if not self.meta or not self.meta['segments']:
+            return np.empty((0, len(self.columns)), dtype=np.float32), np.empty(0, dtype=np.float64)
+        
+        mmap_mode: Optional[Literal['r']] = 'r' if mmap else None
+        values: List[np.ndarray] = []
+        epochs: List[np.ndarray] = []
+        for name in self.meta['segments']:
+            values.append(np.load(self.path / f"{name}.values.npy", mmap_mode=mmap_mode))
+            epochs.append(np.load(self.path / f"{name}.epoch.npy", mmap_mode=mmap_mode))
+        
+        if len(values) == 1:
+            return values[0], epochs[0]
+        return np.concatenate(values), np.concatenate(epochs)
+    
+    def reset(self) -> None:
+        """Discard the snapshot so the next load rebuilds it"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.meta = None
+        self._pending = []
+    
+    def compact(self) -> None:
+        """Merge every segment into one"""
+        meta = self.meta
+        if not meta:
+            return
+        
+        old_segments = list(meta['segments'])
+        name = f"segment_{meta['next_segment']:05d}"
+        
+        # Copy segment by segment into file-backed arrays, never holding the whole snapshot
+        merged_values = np.lib.format.open_memmap(
+            self.path / f"{name}.values.npy", mode='w+', dtype=np.float32, shape=(meta['rows'], len(self.columns))
+        )
+        merged_epochs = np.lib.format.open_memmap(
+            self.path / f"{name}.epoch.npy", mode='w+', dtype=np.float64, shape=(meta['rows'],)
+        )
+        offset = 0
+        for old in old_segments:
+            values = np.load(self.path / f"{old}.values.npy", mmap_mode='r')
+            merged_values[offset:offset + len(values)] = values
+            merged_epochs[offset:offset + len(values)] = np.load(self.path / f"{old}.epoch.npy", mmap_mode='r')
+            offset += len(values)
+        merged_values.flush()
+        merged_epochs.flush()
+        del merged_values, merged_epochs
+        
+        self._write_meta({
+            **meta,
+            'segments': [name],
+            'next_segment': meta['next_segment'] + 1
+        })
+        
+        for old in old_segments:
+            for suffix in ('values', 'epoch'):
+                (self.path / f"{old}.{suffix}.npy").unlink(missing_ok=True)
+        
+        logger.info(f"Compacted training snapshot {self.path} into {name}")
@@ -0,0 +1,69 @@
+"""
+Synthetic sensor data for demos, tests and benchmarks
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (mean, std) of each generated sensor column
+SYNTHETIC_SENSORS = {
+    'soil_moisture': (45, 15),
+    'soil_ph': (6.5, 0.8),
+    'nitrogen': (50, 20),
+    'phosphorus': (25, 10),
+    'potassium': (150, 50),
+    'air_temperature': (28, 5),
+    'air_humidity': (70, 15),
+    'soil_temperature': (25, 3)
+}
+
+# Readings are spread evenly over this window whatever the row count
+SYNTHETIC_START = np.datetime64('2023-01-01', 'ns')
+SYNTHETIC_SPAN_DAYS = 3 * 365
+PLANTING_LEAD_DAYS = 90
+
+
+def _band_effect(values: np.ndarray, low: float, high: float, optimum: float, penalty: float) -> np.ndarray:
+    """1.0 inside the optimal band, falling off linearly with distance outside it"""
+    return np.where(
+        (values >= low) & (values <= high),
+        1.0,
+        1.0 - penalty * np.abs(values - optimum)
+    )
+
+
+def generate_synthetic_data(n_samples: int = 1000, seed: int = 42) -> tuple[pd.DataFrame, pd.Series]:
+    """Generate a reproducible synthetic training set of any size"""
+    logger.info(f"Generating {n_samples} rows of synthetic training data...")
+    
+    rng = np.random.default_rng(seed)
+    columns = list(SYNTHETIC_SENSORS)
+    means = np.array([SYNTHETIC_SENSORS[column][0] for column in columns], dtype=np.float64)
+    stds = np.array([SYNTHETIC_SENSORS[column][1] for column in columns], dtype=np.float64)
+    
+    # One column-major draw, so the frame wraps it without copying
+    values = np.asfortranarray(rng.standard_normal((n_samples, len(columns))))
+    values *= stds
+    values += means
+    sensors = dict(zip(columns, values.T))
+    
+    step_ns = SYNTHETIC_SPAN_DAYS * 86_400 * 10**9 // max(n_samples, 1)
+    timestamps = SYNTHETIC_START + np.arange(n_samples, dtype=np.int64) * np.timedelta64(step_ns, 'ns')
+    
+    # Moisture 40-60%, pH 6.5-7.0 and 25-30°C are optimal; more NPK helps
+    yields = 3000.0 * _band_effect(sensors['soil_moisture'], 40, 60, 50, 0.01)
+    yields *= _band_effect(sensors['soil_ph'], 6.5, 7.0, 6.75, 0.05)
+    yields *= _band_effect(sensors['air_temperature'], 25, 30, 27.5, 0.02)
+    yields *= 1.0 + 0.001 * sensors['nitrogen'] + 0.002 * sensors['phosphorus'] + 0.0005 * sensors['potassium']
+    yields += rng.normal(0, 200, n_samples)
+    np.maximum(yields, 1000, out=yields)
+    
+    X = pd.DataFrame(values, columns=columns, copy=False)
+    X['timestamp'] = timestamps
+    X['planting_date'] = timestamps - np.timedelta64(PLANTING_LEAD_DAYS, 'D')
+    y = pd.Series(yields, name='yield_kg_per_ha')
+    
+    return X, y
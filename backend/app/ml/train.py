@@ -5,152 +5,398 @@ ML model training script
 import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import argparse
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, literal, tablesample, ColumnElement, Float, String
 
 from app.core.database import AsyncSessionLocal
 from app.models.sensor_reading import SensorReading
 from app.models.farm import Farm
+from app.models.user import User
 from app.models.prediction import Prediction
 from app.models.model_version import ModelVersion
-from app.ml.model import CropYieldPredictor
+from app.models.farm_feature import FarmFeature, FARM_SCOPE
+from app.ml.model import CropYieldPredictor, RANDOM_FOREST, ESTIMATOR_BACKENDS
+from app.ml.registry import model_registry, resolve_model_path
+from app.ml.features import SENSOR_FEATURES, FEATURE_DEFINITION_VERSION, SEASON_BY_MONTH
+from app.ml.sampling import BottomKSampler, StratifiedSampler
+from app.ml.snapshots import TrainingSnapshot, snapshot_key
+from app.ml.synthetic import generate_synthetic_data
+from app.services.model_registry_service import ModelRegistryService
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns produced by the streaming loader, in query order
+TRAINING_COLUMNS = SENSOR_FEATURES + ['days_since_planting', 'month']
 
-async def load_training_data(db: AsyncSession) -> tuple[pd.DataFrame, pd.Series]:
-    """Load training data from database"""
-    logger.info("Loading training data from database...")
+# Month (1-12) to season code, matching CropYieldPredictor.prepare_features
+_SEASON_LOOKUP = np.array(SEASON_BY_MONTH[1:], dtype=np.float32)
+
+
+def _readings_source(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    sample_percent: Optional[float] = None,
+    thin_minutes: Optional[int] = None,
+    seed: int = 0,
+    after: Optional[datetime] = None
+):
+    """Filtered readings, optionally block-sampled and thinned to one row per device per interval"""
+    readings = SensorReading.__table__
+    if sample_percent and sample_percent < 100:
+        # Postgres skips whole pages before any row is read
+        readings = tablesample(readings, func.system(sample_percent), seed=literal(seed))
+    
+    columns = readings.c
+    filters = [
+        columns.soil_moisture.isnot(None),
+        columns.soil_ph.isnot(None),
+        columns.nitrogen.isnot(None),
+        columns.phosphorus.isnot(None),
+        columns.potassium.isnot(None)
+    ]
+    if start is not None:
+        filters.append(columns.timestamp >= start)
+    if end is not None:
+        filters.append(columns.timestamp < end)
+    if after is not None:
+        filters.append(columns.timestamp > after)
+    
+    if thin_minutes:
+        # Consecutive readings are near-duplicates; average each device's readings per bucket
+        bucket = func.time_bucket(timedelta(minutes=thin_minutes), columns.timestamp)
+        return (
+            select(
+                func.concat(cast(columns.device_id, String), '@', cast(bucket, String)).label('sample_key'),
+                columns.farm_id,
+                func.max(columns.timestamp).label('timestamp'),
+                *[func.avg(columns[name]).label(name) for name in SENSOR_FEATURES]
+            )
+            .where(*filters)
+            .group_by(columns.device_id, columns.farm_id, bucket)
+            .subquery('readings')
+        )
     
-    # Get sensor readings with farm information
-    result = await db.execute(
+    return (
         select(
-            SensorReading.soil_moisture,
-            SensorReading.soil_ph,
-            SensorReading.nitrogen,
-            SensorReading.phosphorus,
-            SensorReading.potassium,
-            SensorReading.air_temperature,
-            SensorReading.air_humidity,
-            SensorReading.soil_temperature,
-            SensorReading.timestamp,
-            Farm.planting_date,
-            Farm.crop_type,
-            Farm.area_ha
-        )
-        .join(Farm, SensorReading.farm_id == Farm.id)
-        .where(
-            SensorReading.soil_moisture.isnot(None),
-            SensorReading.soil_ph.isnot(None),
-            SensorReading.nitrogen.isnot(None),
-            SensorReading.phosphorus.isnot(None),
-            SensorReading.potassium.isnot(None)
+            cast(columns.id, String).label('sample_key'),
+            columns.farm_id,
+            columns.timestamp,
+            *[columns[name] for name in SENSOR_FEATURES]
         )
+        .where(*filters)
+        .subquery('readings')
+    )
+
+
+def _training_readings_query(
+    readings,
+    seed: Optional[int] = None,
+    stratify: bool = False,
+    with_epoch: bool = False
+):
+    """Training columns cast to floats in SQL, plus sampling priority, stratum or epoch when asked"""
+    days_since_planting = func.floor(
+        (func.extract('epoch', readings.c.timestamp) - func.extract('epoch', Farm.planting_date)) / 86400
+    )
+    columns: List[ColumnElement] = [
+        *[cast(readings.c[name], Float) for name in SENSOR_FEATURES],
+        cast(days_since_planting, Float),
+        cast(func.extract('month', readings.c.timestamp), Float)
+    ]
+    if seed is not None:
+        # Hashing a stable key makes the sample independent of scan order
+        columns.append(cast(func.hashtext(func.concat(readings.c.sample_key, ':', str(seed))), Float))
+    if stratify:
+        columns.append(func.concat(Farm.crop_type, '|', func.coalesce(User.region, '')))
+    if with_epoch:
+        columns.append(cast(func.extract('epoch', readings.c.timestamp), Float))
+    
+    query = select(*columns).select_from(readings).join(Farm, readings.c.farm_id == Farm.id)
+    if stratify:
+        query = query.outerjoin(User, Farm.user_id == User.id)
+    return query
+
+
+def _season_codes(month: np.ndarray) -> np.ndarray:
+    return _SEASON_LOOKUP[np.nan_to_num(month, nan=1).astype(np.intp) - 1]
+
+
+def _training_frame(buffer: np.ndarray) -> tuple[pd.DataFrame, pd.Series]:
+    """Build the model input frame from loader columns"""
+    columns = {name: buffer[:, index] for index, name in enumerate(TRAINING_COLUMNS)}
+    
+    # Derive the model's calendar features from the SQL-computed columns
+    columns['season_encoded'] = _season_codes(columns.pop('month'))
+    
+    X = pd.DataFrame(columns, copy=False)
+    
+    # Generate synthetic yield data based on features
+    # In a real scenario, this would come from historical yield records
+    y = generate_synthetic_yield(X)
+    
+    return X, y
+
+
+async def load_training_data(
+    db: AsyncSession,
+    source: str = "readings",
+    limit: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+    sample: Optional[str] = None,
+    rebuild_snapshot: bool = False
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Load training data from database"""
+    if source == "feature_store":
+        return await load_feature_store_training_data(db)
+    
+    limit = limit or settings.TRAINING_MAX_ROWS or None
+    chunk_size = chunk_size or settings.TRAINING_CHUNK_SIZE
+    sample = sample if sample is not None else settings.TRAINING_SAMPLE_STRATEGY
+    if start is None and settings.TRAINING_WINDOW_DAYS:
+        start = datetime.utcnow() - timedelta(days=settings.TRAINING_WINDOW_DAYS)
+    
+    readings = _readings_source(
+        start,
+        end,
+        sample_percent=settings.TRAINING_SAMPLE_PERCENT,
+        thin_minutes=settings.TRAINING_THIN_MINUTES,
+        seed=settings.TRAINING_SAMPLE_SEED
     )
     
-    data = result.fetchall()
+    if sample:
+        return await _load_sampled_training_data(db, readings, sample, chunk_size)
     
-    if not data:
+    if settings.TRAINING_SNAPSHOTS_ENABLED:
+        return await _load_snapshot_training_data(db, limit, start, end, chunk_size, rebuild_snapshot)
+    
+    logger.info("Loading training data from database...")
+    
+    query = _training_readings_query(readings)
+    
+    # Size the buffers before reading so peak memory is known up front
+    available = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar() or 0
+    n_rows = min(available, limit) if limit else available
+    
+    if n_rows == 0:
         logger.warning("No training data found. Using synthetic data...")
         return generate_synthetic_data()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    buffer = np.empty((n_rows, len(TRAINING_COLUMNS)), dtype=np.float32)
+    logger.info(
+        f"Streaming {n_rows} of {available} readings in chunks of {chunk_size} "
+        f"({buffer.nbytes / 2**20:.1f} MiB)"
+    )
     
-    # Generate synthetic yield data based on features
-    # In a real scenario, this would come from historical yield records
-    df['yield_kg_per_ha'] = generate_synthetic_yield(df)
+    if limit:
+        # Prefer the most recent readings when capped
+        query = query.order_by(readings.c.timestamp.desc()).limit(n_rows)
     
-    # Separate features and target
-    feature_columns = [
-        'soil_moisture', 'soil_ph', 'nitrogen', 'phosphorus', 'potassium',
-        'air_temperature', 'air_humidity', 'soil_temperature', 'timestamp', 'planting_date'
-    ]
+    # Server-side cursor: only one chunk of rows is held as Python objects at a time
+    offset = 0
+    stream = await db.stream(query.execution_options(yield_per=chunk_size))
+    async for chunk in stream.partitions():
+        # Rows inserted after the count are ignored
+        chunk = chunk[:n_rows - offset]
+        buffer[offset:offset + len(chunk)] = np.array(chunk, dtype=np.float32)
+        offset += len(chunk)
+        if offset >= n_rows:
+            break
+    await stream.close()
     
-    X = df[feature_columns]
-    y = df['yield_kg_per_ha']
+    X, y = _training_frame(buffer[:offset])
     
     logger.info(f"Loaded {len(X)} training samples")
     
     return X, y
 
 
-def generate_synthetic_data() -> tuple[pd.DataFrame, pd.Series]:
-    """Generate synthetic training data for demonstration"""
-    logger.info("Generating synthetic training data...")
-    
-    np.random.seed(42)
-    n_samples = 1000
-    
-    # Generate synthetic features
-    data = {
-        'soil_moisture': np.random.normal(45, 15, n_samples),
-        'soil_ph': np.random.normal(6.5, 0.8, n_samples),
-        'nitrogen': np.random.normal(50, 20, n_samples),
-        'phosphorus': np.random.normal(25, 10, n_samples),
-        'potassium': np.random.normal(150, 50, n_samples),
-        'air_temperature': np.random.normal(28, 5, n_samples),
-        'air_humidity': np.random.normal(70, 15, n_samples),
-        'soil_temperature': np.random.normal(25, 3, n_samples),
-        'timestamp': pd.date_range('2023-01-01', periods=n_samples, freq='D'),
-        'planting_date': pd.date_range('2023-01-01', periods=n_samples, freq='D') - timedelta(days=90)
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC so they compare with stored values"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _as_epoch(value: datetime) -> float:
+    return _as_utc(value).timestamp()
+
+
+async def _load_snapshot_training_data(
+    db: AsyncSession,
+    limit: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    chunk_size: int,
+    rebuild: bool = False
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Training rows from the local snapshot, extended with readings newer than its watermark"""
+    loader_config = {
+        'sample_percent': settings.TRAINING_SAMPLE_PERCENT,
+        'thin_minutes': settings.TRAINING_THIN_MINUTES,
+        'seed': settings.TRAINING_SAMPLE_SEED
     }
+    snapshot = TrainingSnapshot(
+        settings.TRAINING_SNAPSHOT_PATH or str(Path(settings.ML_MODEL_PATH) / "training_snapshots"),
+        snapshot_key(FEATURE_DEFINITION_VERSION, loader_config),
+        TRAINING_COLUMNS
+    )
+    if rebuild:
+        snapshot.reset()
+    
+    def delta_readings(end: Optional[datetime] = None):
+        return _readings_source(
+            None,
+            end,
+            sample_percent=settings.TRAINING_SAMPLE_PERCENT,
+            thin_minutes=settings.TRAINING_THIN_MINUTES,
+            seed=settings.TRAINING_SAMPLE_SEED,
+            after=snapshot.watermark
+        )
     
-    df = pd.DataFrame(data)
+    watermark = (await db.execute(select(func.max(delta_readings().c.timestamp)))).scalar()
+    
+    if watermark is not None:
+        # Pin the delta to the watermark seen now; later inserts go to the next run
+        # (timestamps have microsecond precision, so this bound is inclusive)
+        readings = delta_readings(end=watermark + timedelta(microseconds=1))
+        query = _training_readings_query(readings, with_epoch=True)
+        
+        logger.info(
+            f"Appending readings after {snapshot.watermark or 'the beginning'} "
+            f"to the training snapshot ({snapshot.rows} rows)"
+        )
+        
+        # Each chunk becomes its own float32 segment, so memory stays bounded by
+        # chunk_size however far behind the snapshot is; the watermark commits them all
+        appended = 0
+        stream = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for chunk in stream.partitions():
+            rows = np.array(chunk, dtype=np.float64)
+            snapshot.write_segment(rows[:, :-1], rows[:, -1])
+            appended += len(rows)
+        await stream.close()
+        
+        snapshot.commit(watermark)
+        logger.info(f"Appended {appended} readings to the training snapshot")
+    
+    values, epochs = snapshot.load(mmap=True)
+    if len(values) == 0:
+        logger.warning("No training data found. Using synthetic data...")
+        return generate_synthetic_data()
     
-    # Generate synthetic yield based on features
-    yield_base = 3000  # Base yield in kg/ha
+    if start is not None or end is not None:
+        mask = np.ones(len(epochs), dtype=bool)
+        if start is not None:
+            mask &= epochs >= _as_epoch(start)
+        if end is not None:
+            mask &= epochs < _as_epoch(end)
+        values, epochs = values[mask], epochs[mask]
     
-    # Soil moisture effect (optimal around 40-60%)
-    moisture_effect = np.where(
-        (df['soil_moisture'] >= 40) & (df['soil_moisture'] <= 60),
-        1.0,
-        1.0 - 0.01 * np.abs(df['soil_moisture'] - 50)
-    )
+    if limit and len(values) > limit:
+        # Prefer the most recent readings when capped
+        recent = np.sort(np.argpartition(epochs, len(epochs) - limit)[len(epochs) - limit:])
+        values = values[recent]
     
-    # Soil pH effect (optimal around 6.5-7.0)
-    ph_effect = np.where(
-        (df['soil_ph'] >= 6.5) & (df['soil_ph'] <= 7.0),
-        1.0,
-        1.0 - 0.05 * np.abs(df['soil_ph'] - 6.75)
-    )
+    X, y = _training_frame(values)
     
-    # NPK effects
-    npk_effect = (
-        1.0 + 0.001 * df['nitrogen'] +
-        0.002 * df['phosphorus'] +
-        0.0005 * df['potassium']
-    )
+    logger.info(f"Loaded {len(X)} training samples from snapshot {snapshot.path}")
     
-    # Temperature effect (optimal around 25-30°C)
-    temp_effect = np.where(
-        (df['air_temperature'] >= 25) & (df['air_temperature'] <= 30),
-        1.0,
-        1.0 - 0.02 * np.abs(df['air_temperature'] - 27.5)
-    )
+    return X, y
+
+
+async def _load_sampled_training_data(
+    db: AsyncSession,
+    readings,
+    strategy: str,
+    chunk_size: int
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Reduce the full reading stream to a bounded, reproducible sample in one pass"""
+    if strategy not in ("reservoir", "stratified"):
+        raise ValueError(f"Unknown training sample strategy: {strategy}")
+    
+    seed = settings.TRAINING_SAMPLE_SEED
+    width = len(TRAINING_COLUMNS)
+    stratified = strategy == "stratified"
+    sampler: Union[StratifiedSampler, BottomKSampler]
+    if stratified:
+        sampler = StratifiedSampler(settings.TRAINING_SAMPLE_PER_STRATUM, width, seed=seed)
+    else:
+        sampler = BottomKSampler(settings.TRAINING_SAMPLE_SIZE, width, seed=seed)
+    
+    logger.info(f"Sampling training data from database ({strategy}, seed {seed})...")
+    
+    query = _training_readings_query(readings, seed=seed, stratify=stratified)
+    seen = 0
+    stream = await db.stream(query.execution_options(yield_per=chunk_size))
+    async for chunk in stream.partitions():
+        seen += len(chunk)
+        if isinstance(sampler, StratifiedSampler):
+            numeric = np.array([row[:width + 1] for row in chunk], dtype=np.float64)
+            seasons = _season_codes(numeric[:, width - 1]).astype(int).tolist()
+            strata = [f"{row[-1]}|{season}" for row, season in zip(chunk, seasons)]
+            sampler.add(numeric[:, :width], strata, numeric[:, width])
+        else:
+            numeric = np.array(chunk, dtype=np.float64)
+            sampler.add(numeric[:, :width], numeric[:, width])
+    await stream.close()
+    
+    if seen == 0:
+        logger.warning("No training data found. Using synthetic data...")
+        return generate_synthetic_data()
     
-    # Calculate final yield
-    df['yield_kg_per_ha'] = (
-        yield_base * moisture_effect * ph_effect * npk_effect * temp_effect +
-        np.random.normal(0, 200, n_samples)  # Add noise
+    buffer, _ = sampler.result()
+    logger.info(f"Sampled {len(buffer)} of {seen} readings")
+    
+    return _training_frame(buffer)
+
+
+async def load_feature_store_training_data(db: AsyncSession) -> tuple[pd.DataFrame, pd.Series]:
+    """Load one training sample per device from the farm feature store"""
+    logger.info("Loading training data from feature store...")
+    
+    result = await db.execute(
+        select(
+            FarmFeature.features_json,
+            FarmFeature.last_reading_at,
+            Farm.planting_date
+        )
+        .join(Farm, FarmFeature.farm_id == Farm.id)
+        .where(
+            FarmFeature.scope != FARM_SCOPE,
+            FarmFeature.feature_version == FEATURE_DEFINITION_VERSION
+        )
     )
     
-    # Ensure positive yields
-    df['yield_kg_per_ha'] = np.maximum(df['yield_kg_per_ha'], 1000)
+    rows = result.all()
     
-    feature_columns = [
-        'soil_moisture', 'soil_ph', 'nitrogen', 'phosphorus', 'potassium',
-        'air_temperature', 'air_humidity', 'soil_temperature', 'timestamp', 'planting_date'
-    ]
+    if not rows:
+        logger.warning("Feature store is empty. Using synthetic data...")
+        return generate_synthetic_data()
+    
+    records = []
+    for row in rows:
+        record = {name: row.features_json.get(name) for name in SENSOR_FEATURES}
+        record['timestamp'] = row.last_reading_at
+        record['planting_date'] = row.planting_date
+        records.append(record)
+    
+    df = pd.DataFrame(records)
+    df['yield_kg_per_ha'] = generate_synthetic_yield(df)
     
-    X = df[feature_columns]
+    X = df[SENSOR_FEATURES + ['timestamp', 'planting_date']]
     y = df['yield_kg_per_ha']
     
+    logger.info(f"Loaded {len(X)} training samples from feature store")
+    
     return X, y
 
 
@@ -235,28 +481,141 @@ async def save_model_version(db: AsyncSession, metrics: dict, model_path: str) -
     return new_version
 
 
-async def train_model():
+async def _latest_reading_timestamp(db: AsyncSession, end: Optional[datetime]) -> Optional[datetime]:
+    """Newest reading a training run started now can see"""
+    query = select(func.max(SensorReading.timestamp))
+    if end is not None:
+        query = query.where(SensorReading.timestamp < end)
+    return (await db.execute(query)).scalar()
+
+
+async def _count_readings_after(db: AsyncSession, after: datetime, end: Optional[datetime]) -> int:
+    query = select(func.count()).select_from(SensorReading).where(SensorReading.timestamp > after)
+    if end is not None:
+        query = query.where(SensorReading.timestamp < end)
+    return (await db.execute(query)).scalar() or 0
+
+
+def _load_base_model(n_jobs: int) -> Optional[CropYieldPredictor]:
+    """Latest forest to extend, if it records the data it was trained on"""
+    model_path = resolve_model_path(model_registry, settings.ML_MODEL_PATH)
+    if model_path is None:
+        return None
+    
+    model = CropYieldPredictor(n_jobs=n_jobs)
+    model.load_model(str(model_path))
+    if not model.is_trained or model.data_watermark is None or model.backend != RANDOM_FOREST:
+        return None
+    
+    model.model.set_params(n_jobs=n_jobs)
+    return model
+
+
+async def train_model(
+    source: str = "readings",
+    limit: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    sample: Optional[str] = None,
+    rebuild_snapshot: bool = False,
+    n_jobs: int = -1,
+    progress: Optional[Callable[[str, float], Awaitable[None]]] = None,
+    incremental: bool = False,
+    params: Optional[Dict[str, Any]] = None,
+    tuning: Optional[Dict[str, Any]] = None,
+    evaluation: Optional[str] = None,
+    backend: Optional[str] = None
+):
     """Main training function"""
     logger.info("Starting model training...")
     
+    async def report(stage: str, fraction: float) -> None:
+        if progress is not None:
+            await progress(stage, fraction)
+    
     async with AsyncSessionLocal() as db:
         try:
-            # Load training data
-            X, y = await load_training_data(db)
+            # Pin the readings this run covers; the next incremental update starts after them
+            watermark = None
+            if source == "readings":
+                watermark = await _latest_reading_timestamp(db, end)
+                if watermark is not None:
+                    end = watermark + timedelta(microseconds=1)
+            
+            base_model = None
+            backend = backend or settings.ML_ESTIMATOR_BACKEND
+            if incremental:
+                if backend == RANDOM_FOREST:
+                    base_model = _load_base_model(n_jobs)
+                if base_model is None or source != "readings":
+                    logger.warning("No forest with a data watermark to extend; training from scratch")
+                    base_model = None
             
-            # Initialize model
-            model = CropYieldPredictor()
+            if base_model is not None and base_model.data_watermark is not None:
+                base_watermark = base_model.data_watermark
+                new_rows = await _count_readings_after(db, base_watermark, end)
+                if new_rows < settings.TRAINING_INCREMENTAL_MIN_ROWS:
+                    logger.info(
+                        f"Only {new_rows} readings since {base_watermark}; "
+                        f"skipping incremental update"
+                    )
+                    return {
+                        "status": "skipped",
+                        "new_readings": new_rows,
+                        "data_watermark": base_watermark.isoformat()
+                    }
+                
+                incremental_start = base_watermark + timedelta(microseconds=1)
+                start = max(_as_utc(start), incremental_start) if start else incremental_start
+            
+            # Load training data
+            await report("loading_data", 0.05)
+            X, y = await load_training_data(
+                db,
+                source=source,
+                limit=limit,
+                start=start,
+                end=end,
+                sample=sample,
+                rebuild_snapshot=rebuild_snapshot
+            )
             
             # Train model
-            metrics = model.train(X, y)
+            await report("training", 0.4)
+            if base_model is not None:
+                model = base_model
+                metrics = model.train_incremental(
+                    X, y,
+                    n_new_trees=settings.TRAINING_INCREMENTAL_TREES,
+                    max_trees=settings.TRAINING_MAX_TREES
+                )
+            else:
+                model = CropYieldPredictor(n_jobs=n_jobs, params=params, backend=backend)
+                metrics = model.train(
+                    X, y,
+                    evaluation=evaluation or settings.TRAINING_EVALUATION,
+                    cv_folds=settings.TRAINING_CV_FOLDS
+                )
+            model.data_watermark = watermark
+            if tuning:
+                # Recorded with the version so the search can be traced later
+                metrics['tuning'] = tuning
             
             # Save model
-            model_path = Path(settings.ML_MODEL_PATH) / f"model_{datetime.now().strftime('%Y%m%d_%H%M%S')}.joblib"
-            model_path.parent.mkdir(parents=True, exist_ok=True)
-            model.save_model(str(model_path))
+            await report("saving", 0.9)
+            model_path = model_registry.publish(model)
             
-            # Save model version to database
+            # Save model version to database, then switch serving over to it
             version = await save_model_version(db, metrics, str(model_path))
+            model_registry.activate(model_path)
+            
+            if settings.ML_REGISTRY_KEEP_VERSIONS:
+                try:
+                    await ModelRegistryService(db, model_registry).collect_garbage(
+                        keep=settings.ML_REGISTRY_KEEP_VERSIONS
+                    )
+                except Exception as e:
+                    logger.error(f"Model artifact cleanup failed: {str(e)}")
             
             logger.info(f"Model training completed successfully. Version: {version}")
             logger.info(f"Metrics: {metrics}")
@@ -265,7 +624,8 @@ async def train_model():
                 "status": "success",
                 "version": version,
                 "metrics": metrics,
-                "model_path": str(model_path)
+                "model_path": str(model_path),
+                "data_watermark": watermark.isoformat() if watermark else None
             }
             
         except Exception as e:
@@ -274,4 +634,24 @@ async def train_model():
 
 
 if __name__ == "__main__":
-    asyncio.run(train_model())
+    parser = argparse.ArgumentParser(description="Train the crop yield model")
+    parser.add_argument("--source", choices=["readings", "feature_store"], default="readings")
+    parser.add_argument("--limit", type=int, help="Maximum readings to load (most recent first)")
+    parser.add_argument("--days", type=int, help="Only use readings from the last N days")
+    parser.add_argument("--sample", choices=["reservoir", "stratified"], help="Train on a bounded sample")
+    parser.add_argument("--rebuild-snapshot", action="store_true", help="Reload the training snapshot from scratch")
+    parser.add_argument("--incremental", action="store_true", help="Add trees for readings since the latest model")
+    parser.add_argument("--evaluation", choices=["oob", "cv"], help="Out-of-bag estimate (fast) or k-fold CV refits")
+    parser.add_argument("--backend", choices=list(ESTIMATOR_BACKENDS), help="Estimator backend")
+    args = parser.parse_args()
+    
+    asyncio.run(train_model(
+        source=args.source,
+        limit=args.limit,
+        start=datetime.utcnow() - timedelta(days=args.days) if args.days else None,
+        sample=args.sample,
+        rebuild_snapshot=args.rebuild_snapshot,
+        incremental=args.incremental,
+        evaluation=args.evaluation,
+        backend=args.backend
+    ))
@@ -0,0 +1,262 @@
+"""
+Hyperparameter search for the crop yield model
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import optuna
+import logging
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import KFold
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.ml.model import (
+    CropYieldPredictor,
+    build_estimator,
+    ESTIMATOR_BACKENDS,
+    RANDOM_FOREST,
+    HIST_GRADIENT_BOOSTING
+)
+from app.ml.train import load_training_data, train_model
+
+logger = logging.getLogger(__name__)
+
+
+def suggest_forest_params(trial: optuna.Trial) -> Dict[str, Any]:
+    """Random forest search space"""
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 50, 400, step=50),
+        'max_depth': trial.suggest_int('max_depth', 4, 24),
+        'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 20, log=True),
+        'max_features': trial.suggest_categorical('max_features', [1.0, 0.5, 'sqrt']),
+        'max_samples': trial.suggest_float('max_samples', 0.3, 1.0)
+    }
+
+
+def suggest_hgb_params(trial: optuna.Trial) -> Dict[str, Any]:
+    """Histogram gradient boosting search space (iterations set by early stopping)"""
+    return {
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'max_leaf_nodes': trial.suggest_int('max_leaf_nodes', 15, 255, log=True),
+        'min_samples_leaf': trial.suggest_int('min_samples_leaf', 5, 200, log=True),
+        'l2_regularization': trial.suggest_float('l2_regularization', 1e-6, 10.0, log=True),
+        'max_bins': trial.suggest_int('max_bins', 63, 255)
+    }
+
+
+SEARCH_SPACES = {
+    RANDOM_FOREST: suggest_forest_params,
+    HIST_GRADIENT_BOOSTING: suggest_hgb_params
+}
+
+
+def _storage(path: str) -> optuna.storages.RDBStorage:
+    # Several worker processes write trials to the same SQLite file
+    return optuna.storages.RDBStorage(
+        f"sqlite:///{path}",
+        engine_kwargs={"connect_args": {"timeout": 60}}
+    )
+
+
+def _search_policy(seed: int) -> Tuple[optuna.samplers.BaseSampler, optuna.pruners.BasePruner]:
+    # Optuna does not store the sampler or pruner with the study, so every
+    # process that loads it has to build the same policy
+    return (
+        optuna.samplers.TPESampler(seed=seed),
+        optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    )
+
+
+def _objective(
+    trial: optuna.Trial,
+    X: np.ndarray,
+    y: np.ndarray,
+    backend: str,
+    folds: int,
+    n_jobs: int,
+    seed: int
+) -> float:
+    """Mean cross-validated MAE, reported fold by fold so poor trials stop early"""
+    params = SEARCH_SPACES[backend](trial)
+    scores = []
+    splitter = KFold(n_splits=folds, shuffle=True, random_state=seed)
+    
+    for step, (train_index, test_index) in enumerate(splitter.split(X)):
+        estimator = build_estimator(backend, params, n_jobs=n_jobs, random_state=seed)
+        estimator.fit(X[train_index], y[train_index])
+        scores.append(mean_absolute_error(y[test_index], estimator.predict(X[test_index])))
+        
+        trial.report(float(np.mean(scores)), step)
+        if trial.should_prune():
+            raise optuna.TrialPruned()
+    
+    return float(np.mean(scores))
+
+
+def _run_worker(
+    study_name: str,
+    storage_path: str,
+    data_dir: str,
+    n_trials: int,
+    timeout: Optional[float],
+    backend: str,
+    folds: int,
+    n_jobs: int,
+    seed: int,
+    worker_index: int
+) -> int:
+    """Run trials from one worker process against the shared study"""
+    X = np.load(Path(data_dir) / "X.npy", mmap_mode='r')
+    y = np.load(Path(data_dir) / "y.npy")
+    
+    # Offset the sampler seed so workers do not propose identical trials
+    sampler, pruner = _search_policy(seed + worker_index)
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_storage(storage_path),
+        sampler=sampler,
+        pruner=pruner
+    )
+    study.optimize(
+        lambda trial: _objective(trial, X, y, backend, folds, n_jobs, seed),
+        n_trials=n_trials,
+        timeout=timeout
+    )
+    return n_trials
+
+
+async def _load_tuning_data(data_dir: Path, max_rows: int) -> int:
+    """Encode the tuning set once and share it with workers through .npy files"""
+    async with AsyncSessionLocal() as db:
+        X, y = await load_training_data(db, limit=max_rows)
+    
+    encoded = CropYieldPredictor().prepare_features(X).to_numpy(dtype=np.float32)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    np.save(data_dir / "X.npy", encoded)
+    np.save(data_dir / "y.npy", np.asarray(y, dtype=np.float64))
+    
+    return len(encoded)
+
+
+def run_study(
+    study_name: str,
+    n_trials: int,
+    workers: int,
+    cpu_budget: int,
+    backend: str = RANDOM_FOREST,
+    timeout: Optional[float] = None,
+    folds: int = 5,
+    max_rows: int = 200000,
+    seed: int = 42
+) -> optuna.Study:
+    """Run (or resume) a study with parallel workers within a CPU budget"""
+    tuning_dir = Path(settings.TUNING_PATH or Path(settings.ML_MODEL_PATH) / "tuning")
+    tuning_dir.mkdir(parents=True, exist_ok=True)
+    storage_path = str(tuning_dir / "studies.db")
+    data_dir = tuning_dir / study_name
+    
+    # Worker processes x forest threads stays within the CPU budget
+    workers = max(1, min(workers, cpu_budget))
+    n_jobs = max(1, cpu_budget // workers)
+    if backend == HIST_GRADIENT_BOOSTING:
+        # Boosting threads come from OpenMP, not n_jobs
+        os.environ['OMP_NUM_THREADS'] = str(n_jobs)
+    
+    sampler, pruner = _search_policy(seed)
+    study = optuna.create_study(
+        study_name=study_name,
+        storage=_storage(storage_path),
+        direction="minimize",
+        sampler=sampler,
+        pruner=pruner,
+        load_if_exists=True
+    )
+    
+    remaining = n_trials - len(study.trials)
+    if remaining <= 0:
+        logger.info(f"Study {study_name} already has {len(study.trials)} trials")
+        return study
+    
+    n_rows = asyncio.run(_load_tuning_data(data_dir, max_rows))
+    logger.info(
+        f"Tuning {study_name} ({backend}): {remaining} trials on {n_rows} rows, "
+        f"{workers} workers x {n_jobs} threads, {folds}-fold CV"
+    )
+    
+    started = time.monotonic()
+    per_worker = [remaining // workers + (1 if index < remaining % workers else 0) for index in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [
+            executor.submit(
+                _run_worker, study_name, storage_path, str(data_dir),
+                trials, timeout, backend, folds, n_jobs, seed, worker_index
+            )
+            for worker_index, trials in enumerate(per_worker) if trials
+        ]
+        for future in futures:
+            future.result()
+    
+    study = optuna.load_study(study_name=study_name, storage=_storage(storage_path))
+    logger.info(f"Tuning finished in {time.monotonic() - started:.1f}s")
+    
+    return study
+
+
+def study_summary(study: optuna.Study, backend: str) -> Dict[str, Any]:
+    """Best trial and trial counts, as recorded with the model version"""
+    states = [trial.state for trial in study.trials]
+    return {
+        'study_name': study.study_name,
+        'backend': backend,
+        'best_trial': study.best_trial.number,
+        'best_cv_mae': study.best_value,
+        'best_params': study.best_params,
+        'n_trials': len(states),
+        'n_complete': states.count(optuna.trial.TrialState.COMPLETE),
+        'n_pruned': states.count(optuna.trial.TrialState.PRUNED)
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
+    parser = argparse.ArgumentParser(description="Tune crop yield model hyperparameters")
+    parser.add_argument("--backend", choices=list(ESTIMATOR_BACKENDS), default=settings.ML_ESTIMATOR_BACKEND)
+    parser.add_argument("--study", help="Study name, resumed if it exists (default: crop-yield-<backend>)")
+    parser.add_argument("--trials", type=int, default=settings.TUNING_TRIALS, help="Total trials for the study")
+    parser.add_argument("--workers", type=int, default=settings.TUNING_WORKERS, help="Parallel worker processes")
+    parser.add_argument("--cpu-budget", type=int, default=settings.TUNING_CPU_BUDGET or os.cpu_count(), help="Total cores to use")
+    parser.add_argument("--timeout", type=float, help="Stop each worker after this many seconds")
+    parser.add_argument("--folds", type=int, default=settings.TUNING_CV_FOLDS)
+    parser.add_argument("--max-rows", type=int, default=settings.TUNING_MAX_ROWS)
+    parser.add_argument("--no-train", action="store_true", help="Only search; do not train a model with the best parameters")
+    args = parser.parse_args()
+    
+    study = run_study(
+        args.study or f"crop-yield-{args.backend}",
+        n_trials=args.trials,
+        workers=args.workers,
+        cpu_budget=args.cpu_budget,
+        backend=args.backend,
+        timeout=args.timeout,
+        folds=args.folds,
+        max_rows=args.max_rows
+    )
+    summary = study_summary(study, args.backend)
+    logger.info(f"Best trial: {summary}")
+    
+    if not args.no_train:
+        asyncio.run(train_model(
+            n_jobs=args.cpu_budget,
+            params=study.best_params,
+            tuning=summary,
+            backend=args.backend
+        ))
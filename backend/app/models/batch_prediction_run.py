@@ -0,0 +1,22 @@
+"""
+Batch prediction run model
+"""
+
+from sqlalchemy import Column, String, Integer, Boolean, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class BatchPredictionRun(Base):
+    """Checkpoint of a fleet-wide batch prediction run, committed with each page of predictions"""
+    
+    __tablename__ = "batch_prediction_runs"
+    
+    run_id = Column(String(64), primary_key=True)
+    last_farm_id = Column(UUID(as_uuid=False))
+    processed = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
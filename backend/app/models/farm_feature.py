@@ -0,0 +1,30 @@
+"""
+Farm feature store model
+"""
+
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+# Scope value for the farm-wide row; device rows use the device id
+FARM_SCOPE = "farm"
+
+
+class FarmFeature(Base):
+    """Incrementally maintained features for a farm or one of its devices"""
+    
+    __tablename__ = "farm_features"
+    
+    farm_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("farms.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    scope = Column(String(100), primary_key=True, default=FARM_SCOPE)
+    feature_version = Column(Integer, nullable=False)
+    reading_count = Column(BigInteger, nullable=False, default=0)
+    last_reading_at = Column(DateTime(timezone=True))
+    features_json = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,33 @@
+"""
+Historical yield model
+"""
+
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+
+
+class HistoricalYield(Base):
+    """Recorded harvest yield for a farm, crop and season"""
+    
+    __tablename__ = "historical_yields"
+    __table_args__ = (
+        UniqueConstraint("farm_id", "crop_type", "season", "year", name="uq_historical_yields_farm_crop_season_year"),
+    )
+    
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    farm_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("farms.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    crop_type = Column(String(100), nullable=False)
+    season = Column(String(20), nullable=False)
+    year = Column(Integer, nullable=False)
+    yield_kg_per_ha = Column(Numeric(10, 2), nullable=False)
+    region = Column(String(100))
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,57 @@
+"""
+Training job model
+"""
+
+import enum
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+
+
+class TrainingJobStatus(str, enum.Enum):
+    """Training job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    CANCELLING = "cancelling"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# States of a job that holds a training process
+ACTIVE_STATUSES = (
+    TrainingJobStatus.RUNNING.value,
+    TrainingJobStatus.CANCELLING.value
+)
+
+# States a job never leaves
+FINISHED_STATUSES = (
+    TrainingJobStatus.SUCCEEDED.value,
+    TrainingJobStatus.FAILED.value,
+    TrainingJobStatus.CANCELLED.value
+)
+
+
+class TrainingJob(Base):
+    """Model training run executed outside the API process"""
+    
+    __tablename__ = "training_jobs"
+    __table_args__ = (
+        Index("idx_training_jobs_status", "status", "created_at"),
+    )
+    
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = Column(String(20), nullable=False, default=TrainingJobStatus.QUEUED.value)
+    stage = Column(String(50))
+    progress = Column(Float, nullable=False, default=0.0)
+    params_json = Column(JSONB, nullable=False, default=dict)
+    result_json = Column(JSONB)
+    error = Column(Text)
+    pid = Column(Integer)
+    requested_by = Column(UUID(as_uuid=False))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
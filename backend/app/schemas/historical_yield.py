@@ -0,0 +1,40 @@
+"""
+Historical yield schemas for API serialization
+"""
+
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel, validator
+from app.ml.features import SEASON_NAMES
+
+
+class HistoricalYieldCreate(BaseModel):
+    """Historical yield creation schema"""
+    crop_type: str
+    season: str  # winter, spring, summer, fall
+    year: int
+    yield_kg_per_ha: Decimal
+    region: Optional[str] = None
+
+    @validator('season')
+    def validate_season(cls, v):
+        if v not in SEASON_NAMES:
+            raise ValueError(f"season must be one of {', '.join(SEASON_NAMES)}")
+        return v
+
+    @validator('yield_kg_per_ha')
+    def validate_yield(cls, v):
+        if v < 0:
+            raise ValueError('yield_kg_per_ha must not be negative')
+        return v
+
+
+class HistoricalYield(HistoricalYieldCreate):
+    """Historical yield response schema"""
+    id: str
+    farm_id: str
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,60 @@
+"""
+Training job schemas for API serialization
+"""
+
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel, validator
+
+
+class TrainingJobCreate(BaseModel):
+    """Training job parameters (all optional)"""
+    source: str = "readings"  # readings, feature_store
+    limit: Optional[int] = None
+    days: Optional[int] = None
+    sample: Optional[str] = None  # reservoir, stratified
+    rebuild_snapshot: bool = False
+    incremental: bool = False
+    evaluation: Optional[str] = None  # oob, cv
+    backend: Optional[str] = None  # random_forest, hist_gradient_boosting
+
+    @validator('source')
+    def validate_source(cls, v):
+        if v not in ('readings', 'feature_store'):
+            raise ValueError('source must be readings or feature_store')
+        return v
+
+    @validator('sample')
+    def validate_sample(cls, v):
+        if v is not None and v not in ('reservoir', 'stratified'):
+            raise ValueError('sample must be reservoir or stratified')
+        return v
+
+    @validator('evaluation')
+    def validate_evaluation(cls, v):
+        if v is not None and v not in ('oob', 'cv'):
+            raise ValueError('evaluation must be oob or cv')
+        return v
+
+    @validator('backend')
+    def validate_backend(cls, v):
+        if v is not None and v not in ('random_forest', 'hist_gradient_boosting'):
+            raise ValueError('backend must be random_forest or hist_gradient_boosting')
+        return v
+
+
+class TrainingJob(BaseModel):
+    """Training job response schema"""
+    id: str
+    status: str
+    stage: Optional[str] = None
+    progress: float
+    params_json: Dict[str, Any]
+    result_json: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
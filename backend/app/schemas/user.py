@@ -48,6 +48,13 @@ class User(UserInDB):
     pass
 
 
+class CurrentUser(BaseModel):
+    """Authorization fields of the authenticated user"""
+    id: str
+    role: UserRole
+    is_active: bool
+
+
 class UserLogin(BaseModel):
     """User login schema"""
     email: EmailStr
@@ -2,7 +2,7 @@
 Admin service for system management
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -11,7 +11,8 @@ from app.models.farm import Farm
 from app.models.device import Device
 from app.models.prediction import Prediction
 from app.models.model_version import ModelVersion
-from app.ml.train import train_model
+from app.models.training_job import TrainingJob
+from app.services.training_job_service import TrainingJobService
 
 
 class AdminService:
@@ -123,17 +124,10 @@ class AdminService:
         )
         return result.scalars().all()
     
-    async def retrain_model(self) -> Dict[str, Any]:
-        """Trigger model retraining"""
-        try:
-            result = await train_model()
-            return {
-                "status": "success",
-                "message": "Model retraining completed successfully",
-                "result": result
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Model retraining failed: {str(e)}"
-            }
+    async def retrain_model(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        requested_by: Optional[str] = None
+    ) -> TrainingJob:
+        """Queue model retraining as a background job"""
+        return await TrainingJobService(self.db).create_job(params or {}, requested_by=requested_by)
@@ -25,6 +25,14 @@ class DeviceService:
         )
         return result.scalar_one_or_none()
     
+    async def get_device_farm_id(self, device_id: str) -> Optional[str]:
+        """Get the ID of the farm a device belongs to"""
+        result = await self.db.execute(
+            select(Device.farm_id).where(Device.id == device_id)
+        )
+        farm_id = result.scalar_one_or_none()
+        return str(farm_id) if farm_id is not None else None
+    
     async def get_device_by_device_id(self, device_id: str) -> Optional[Device]:
         """Get device by device_id field"""
         result = await self.db.execute(
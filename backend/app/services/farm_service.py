@@ -11,6 +11,14 @@ from app.models.farm import Farm
 from app.models.device import Device
 from app.models.sensor_reading import SensorReading
 from app.schemas.farm import FarmCreate, FarmUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Owner of each recently checked farm; no endpoint reassigns a farm
+farm_owner_cache = TTLCache(
+    maxsize=settings.FARM_OWNER_CACHE_MAX_ENTRIES,
+    ttl=settings.FARM_OWNER_CACHE_TTL_SECONDS
+)
 
 
 class FarmService:
@@ -28,6 +36,22 @@ class FarmService:
         )
         return result.scalar_one_or_none()
     
+    async def get_farm_owner(self, farm_id: str) -> Optional[str]:
+        """Get the owner's user ID without loading the farm or its devices"""
+        owner_id = farm_owner_cache.get(farm_id)
+        if owner_id is not None:
+            return owner_id
+        
+        result = await self.db.execute(
+            select(Farm.user_id).where(Farm.id == farm_id)
+        )
+        owner_id = result.scalar_one_or_none()
+        if owner_id is not None:
+            owner_id = str(owner_id)
+            farm_owner_cache.set(farm_id, owner_id)
+        
+        return owner_id
+    
     async def get_user_farms(self, user_id: str) -> List[Farm]:
         """Get farms for a user"""
         result = await self.db.execute(
@@ -92,6 +116,7 @@ class FarmService:
         
         await self.db.delete(farm)
         await self.db.commit()
+        farm_owner_cache.invalidate(str(farm_id))
         
         return True
     
@@ -0,0 +1,112 @@
+"""
+Feature extraction service computing farm features inside the database
+"""
+
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.models.sensor_reading import SensorReading
+from app.ml.features import SENSOR_FEATURES, FEATURE_WINDOWS_DAYS, window_feature_name
+
+SECONDS_PER_DAY = 86400.0
+
+
+class FeatureService:
+    """Feature extraction service class"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    def _feature_columns(self, as_of: datetime, windows: tuple) -> list:
+        """Build the aggregate expressions for one farm feature vector"""
+        epoch = func.extract('epoch', SensorReading.timestamp)
+        columns = [
+            func.count(SensorReading.id).label('reading_count'),
+            func.max(SensorReading.timestamp).label('latest_timestamp')
+        ]
+        
+        for name in SENSOR_FEATURES:
+            column = getattr(SensorReading, name)
+            
+            # Latest value (TimescaleDB last() aggregate)
+            columns.append(func.last(column, SensorReading.timestamp).label(name))
+            
+            for days in windows:
+                in_window = SensorReading.timestamp >= as_of - timedelta(days=days)
+                columns.extend([
+                    func.avg(column).filter(in_window).label(window_feature_name(name, 'mean', days)),
+                    func.min(column).filter(in_window).label(window_feature_name(name, 'min', days)),
+                    func.max(column).filter(in_window).label(window_feature_name(name, 'max', days)),
+                    # Least-squares slope, expressed per day
+                    (func.regr_slope(column, epoch).filter(in_window) * SECONDS_PER_DAY)
+                    .label(window_feature_name(name, 'trend', days))
+                ])
+        
+        return columns
+    
+    async def get_farm_features(
+        self,
+        farm_id: str,
+        as_of: Optional[datetime] = None,
+        windows: tuple = FEATURE_WINDOWS_DAYS
+    ) -> Optional[Dict[str, Any]]:
+        """Compute latest values and windowed aggregates for a farm in one query"""
+        as_of = as_of or datetime.utcnow()
+        start_date = as_of - timedelta(days=max(windows))
+        
+        result = await self.db.execute(
+            select(*self._feature_columns(as_of, windows))
+            .where(
+                SensorReading.farm_id == farm_id,
+                SensorReading.timestamp >= start_date,
+                SensorReading.timestamp <= as_of
+            )
+        )
+        row = result.mappings().one()
+        
+        if not row['reading_count']:
+            return None
+        
+        return self._row_to_features(row)
+    
+    async def get_features_for_farms(
+        self,
+        farm_ids: List[str],
+        as_of: Optional[datetime] = None,
+        windows: tuple = FEATURE_WINDOWS_DAYS
+    ) -> Dict[str, Dict[str, Any]]:
+        """Compute feature vectors for many farms in one grouped query"""
+        if not farm_ids:
+            return {}
+        
+        as_of = as_of or datetime.utcnow()
+        start_date = as_of - timedelta(days=max(windows))
+        
+        result = await self.db.execute(
+            select(SensorReading.farm_id, *self._feature_columns(as_of, windows))
+            .where(
+                SensorReading.farm_id.in_(farm_ids),
+                SensorReading.timestamp >= start_date,
+                SensorReading.timestamp <= as_of
+            )
+            .group_by(SensorReading.farm_id)
+        )
+        
+        return {
+            str(row['farm_id']): self._row_to_features(row, exclude=('farm_id',))
+            for row in result.mappings().all()
+        }
+    
+    def _row_to_features(self, row: Any, exclude: tuple = ()) -> Dict[str, Any]:
+        """Convert an aggregate row into a feature dict of floats"""
+        features: Dict[str, Any] = {}
+        for key, value in row.items():
+            if key == 'latest_timestamp' or key in exclude:
+                continue
+            features[key] = float(value) if value is not None else None
+        
+        features['latest_timestamp'] = row['latest_timestamp']
+        
+        return features
@@ -0,0 +1,223 @@
+"""
+Feature store service maintaining per-farm features incrementally
+"""
+
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.farm_feature import FarmFeature, FARM_SCOPE
+from app.models.sensor_reading import SensorReading
+from app.ml.features import SENSOR_FEATURES, FEATURE_DEFINITION_VERSION, apply_reading
+
+# First key of the per-farm advisory locks, keeping them apart from other lock users
+FEATURE_LOCK_NAMESPACE = 0x46454154
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC so they compare with stored values"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        'feature_version': FEATURE_DEFINITION_VERSION,
+        'reading_count': 0,
+        'last_reading_at': None,
+        'features_json': {}
+    }
+
+
+def _fold(state: Dict[str, Any], reading: Dict[str, Any], timestamp: datetime) -> None:
+    """Fold one reading into a feature state in place"""
+    timestamp = _as_utc(timestamp)
+    last_reading_at = state['last_reading_at']
+    
+    elapsed = None
+    is_newest = True
+    if last_reading_at is not None:
+        elapsed = (timestamp - last_reading_at).total_seconds()
+        is_newest = elapsed >= 0
+    
+    state['features_json'] = apply_reading(
+        state['features_json'],
+        reading,
+        elapsed_seconds=elapsed if elapsed and elapsed > 0 else None,
+        is_newest=is_newest
+    )
+    state['reading_count'] += 1
+    if is_newest:
+        state['last_reading_at'] = timestamp
+
+
+class FeatureStoreService:
+    """Feature store service class"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_farm_features(
+        self,
+        farm_id: str,
+        scope: str = FARM_SCOPE,
+        max_age_days: int = 30
+    ) -> Optional[Dict[str, Any]]:
+        """Read stored features for a farm (primary key lookup)"""
+        result = await self.db.execute(
+            select(FarmFeature).where(
+                FarmFeature.farm_id == farm_id,
+                FarmFeature.scope == scope
+            )
+        )
+        return self._row_to_features(result.scalar_one_or_none(), max_age_days)
+    
+    async def get_features_for_farms(
+        self,
+        farm_ids: List[str],
+        scope: str = FARM_SCOPE,
+        max_age_days: int = 30
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read stored features for many farms in one query"""
+        if not farm_ids:
+            return {}
+        
+        result = await self.db.execute(
+            select(FarmFeature).where(
+                FarmFeature.farm_id.in_(farm_ids),
+                FarmFeature.scope == scope
+            )
+        )
+        
+        features = {}
+        for row in result.scalars().all():
+            row_features = self._row_to_features(row, max_age_days)
+            if row_features is not None:
+                features[str(row.farm_id)] = row_features
+        
+        return features
+    
+    def _row_to_features(self, row: Optional[FarmFeature], max_age_days: int) -> Optional[Dict[str, Any]]:
+        """Convert a stored row into a feature dict, rejecting stale rows"""
+        if row is None or row.feature_version != FEATURE_DEFINITION_VERSION:
+            return None
+        
+        last_reading_at = row.last_reading_at
+        if not isinstance(last_reading_at, datetime):
+            return None
+        
+        if _as_utc(last_reading_at) < datetime.now(timezone.utc) - timedelta(days=max_age_days):
+            return None
+        
+        features = dict(row.features_json or {})
+        features['reading_count'] = row.reading_count
+        features['latest_timestamp'] = row.last_reading_at
+        
+        return features
+    
+    async def apply_readings(self, readings: Iterable[Any]) -> None:
+        """Fold newly ingested readings into the store (committed by the caller)"""
+        readings = sorted(readings, key=lambda r: _as_utc(r.timestamp))
+        if not readings:
+            return
+        
+        keys = set()
+        for reading in readings:
+            keys.add((str(reading.farm_id), FARM_SCOPE))
+            keys.add((str(reading.farm_id), str(reading.device_id)))
+        
+        # Per-farm locks also cover rows that do not exist yet, which FOR UPDATE cannot
+        await self._lock_farms(farm_id for farm_id, _ in keys)
+        result = await self.db.execute(
+            select(FarmFeature)
+            .where(tuple_(FarmFeature.farm_id, FarmFeature.scope).in_(list(keys)))
+        )
+        states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in result.scalars().all():
+            if row.feature_version != FEATURE_DEFINITION_VERSION:
+                # Stale definitions restart here; the backfill rebuilds history
+                continue
+            last_reading_at: Optional[datetime] = None
+            if isinstance(row.last_reading_at, datetime):
+                last_reading_at = _as_utc(row.last_reading_at)
+            states[(str(row.farm_id), str(row.scope))] = {
+                'feature_version': row.feature_version,
+                'reading_count': row.reading_count,
+                'last_reading_at': last_reading_at,
+                'features_json': dict(row.features_json or {})
+            }
+        
+        for reading in readings:
+            values = {name: getattr(reading, name, None) for name in SENSOR_FEATURES}
+            for scope in (FARM_SCOPE, str(reading.device_id)):
+                key = (str(reading.farm_id), scope)
+                state = states.setdefault(key, _empty_state())
+                _fold(state, values, reading.timestamp)
+        
+        await self._upsert(states)
+    
+    async def rebuild_farm(self, farm_id: str, chunk_size: int = 5000) -> int:
+        """Rebuild a farm's stored features from its full reading history"""
+        states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        count = 0
+        
+        # Held until commit, so ingests for this farm wait instead of being deleted below
+        await self._lock_farms([str(farm_id)])
+        stream = await self.db.stream(
+            select(
+                SensorReading.device_id,
+                SensorReading.timestamp,
+                *[getattr(SensorReading, name) for name in SENSOR_FEATURES]
+            )
+            .where(SensorReading.farm_id == farm_id)
+            .order_by(SensorReading.timestamp)
+            .execution_options(yield_per=chunk_size)
+        )
+        
+        async for row in stream.mappings():
+            values = {name: row[name] for name in SENSOR_FEATURES}
+            for scope in (FARM_SCOPE, str(row['device_id'])):
+                state = states.setdefault((str(farm_id), scope), _empty_state())
+                _fold(state, values, row['timestamp'])
+            count += 1
+        
+        await self.db.execute(
+            delete(FarmFeature).where(FarmFeature.farm_id == farm_id)
+        )
+        await self._upsert(states)
+        await self.db.commit()
+        
+        return count
+    
+    async def _lock_farms(self, farm_ids: Iterable[str]) -> None:
+        """Take each farm's feature lock for the rest of the transaction"""
+        # Always in sorted order, so batches sharing farms cannot deadlock
+        for farm_id in sorted(set(farm_ids)):
+            await self.db.execute(
+                select(func.pg_advisory_xact_lock(FEATURE_LOCK_NAMESPACE, func.hashtext(farm_id)))
+            )
+    
+    async def _upsert(self, states: Dict[Tuple[str, str], Dict[str, Any]]) -> None:
+        """Write feature states with a single INSERT ... ON CONFLICT"""
+        if not states:
+            return
+        
+        rows = [
+            {'farm_id': farm_id, 'scope': scope, **state}
+            for (farm_id, scope), state in states.items()
+        ]
+        stmt = insert(FarmFeature).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FarmFeature.farm_id, FarmFeature.scope],
+            set_={
+                'feature_version': stmt.excluded.feature_version,
+                'reading_count': stmt.excluded.reading_count,
+                'last_reading_at': stmt.excluded.last_reading_at,
+                'features_json': stmt.excluded.features_json,
+                'updated_at': datetime.now(timezone.utc)
+            }
+        )
+        await self.db.execute(stmt)
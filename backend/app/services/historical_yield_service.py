@@ -0,0 +1,138 @@
+"""
+Historical yield service maintaining cached comparison baselines
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.historical_yield import HistoricalYield
+from app.models.farm import Farm
+from app.models.user import User
+from app.ml.baselines import baseline_cache
+from app.schemas.historical_yield import HistoricalYieldCreate
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HistoricalYieldService:
+    """Historical yield service class"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_farm_yields(self, farm_id: str) -> List[HistoricalYield]:
+        """Get recorded yields for a farm, newest first"""
+        result = await self.db.execute(
+            select(HistoricalYield)
+            .where(HistoricalYield.farm_id == farm_id)
+            .order_by(desc(HistoricalYield.year), HistoricalYield.season)
+        )
+        return list(result.scalars().all())
+    
+    async def record_yield(self, farm_id: str, yield_in: HistoricalYieldCreate) -> HistoricalYield:
+        """Record (or correct) a farm's yield for a crop, season and year"""
+        result = await self.db.execute(
+            select(User.region).join(Farm, Farm.user_id == User.id).where(Farm.id == farm_id)
+        )
+        farm_region = result.scalar_one_or_none()
+        # Default to the farm owner's region
+        region = yield_in.region or farm_region
+        
+        values = {
+            'farm_id': farm_id,
+            'crop_type': yield_in.crop_type,
+            'season': yield_in.season,
+            'year': yield_in.year,
+            'yield_kg_per_ha': yield_in.yield_kg_per_ha,
+            'region': region
+        }
+        insert_stmt = insert(HistoricalYield).values(**values)
+        stmt = insert_stmt.on_conflict_do_update(
+            constraint="uq_historical_yields_farm_crop_season_year",
+            set_={
+                'yield_kg_per_ha': insert_stmt.excluded.yield_kg_per_ha,
+                'region': insert_stmt.excluded.region
+            }
+        ).returning(HistoricalYield)
+        
+        result = await self.db.execute(stmt)
+        historical_yield = result.scalar_one()
+        await self.db.commit()
+        
+        await self._update_baselines(farm_id, yield_in.crop_type, yield_in.season, region, farm_region)
+        
+        return historical_yield
+    
+    async def _update_baselines(
+        self,
+        farm_id: str,
+        crop_type: str,
+        season: str,
+        region: Optional[str],
+        farm_region: Optional[str]
+    ) -> None:
+        """Patch the baselines this farm's write changed; other keys wait for the periodic rebuild"""
+        columns = (HistoricalYield.crop_type, HistoricalYield.season, HistoricalYield.yield_kg_per_ha)
+        crop_matches = func.lower(func.trim(HistoricalYield.crop_type)) == crop_type.strip().lower()
+        
+        farm_records = [
+            dict(row) for row in (
+                await self.db.execute(select(*columns).where(HistoricalYield.farm_id == farm_id, crop_matches))
+            ).mappings()
+        ]
+        
+        region_records: List[Dict[str, Any]] = []
+        if region:
+            # Rows without a region count towards their farm owner's, as in a full load
+            region_records = [
+                dict(row) for row in (
+                    await self.db.execute(
+                        select(*columns)
+                        .join(Farm, Farm.id == HistoricalYield.farm_id)
+                        .join(User, Farm.user_id == User.id)
+                        .where(func.coalesce(HistoricalYield.region, User.region) == region, crop_matches)
+                    )
+                ).mappings()
+            ]
+        
+        baseline_cache.update(farm_id, crop_type, season, farm_records, region, region_records, farm_region)
+    
+    async def refresh_baselines(self) -> None:
+        """Recompute the process baseline cache from every recorded yield"""
+        farm_regions = {
+            str(farm_id): region
+            for farm_id, region in (
+                await self.db.execute(select(Farm.id, User.region).join(User, Farm.user_id == User.id))
+            ).all()
+        }
+        
+        result = await self.db.execute(
+            select(
+                HistoricalYield.farm_id,
+                HistoricalYield.crop_type,
+                HistoricalYield.season,
+                HistoricalYield.yield_kg_per_ha,
+                HistoricalYield.region
+            )
+        )
+        baseline_cache.load((dict(row) for row in result.mappings()), farm_regions)
+        
+        logger.info(f"Yield baselines refreshed: {baseline_cache.stats()}")
+
+
+async def refresh_baselines_periodically() -> None:
+    """Keep baselines current for writes made by other worker processes"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await HistoricalYieldService(db).refresh_baselines()
+        except Exception as e:
+            logger.error(f"Yield baseline refresh failed: {str(e)}")
+        
+        await asyncio.sleep(settings.HISTORICAL_BASELINE_REFRESH_SECONDS)
@@ -0,0 +1,97 @@
+"""
+Model registry service applying the artifact retention policy
+"""
+
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, desc
+
+from app.core.config import settings
+from app.models.model_version import ModelVersion
+from app.ml.forest import flat_artifact_versions
+from app.ml.model import flat_artifact_path
+from app.ml.registry import ModelRegistry
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistryService:
+    """Model registry service class"""
+    
+    def __init__(self, db: AsyncSession, registry: ModelRegistry):
+        self.db = db
+        self.registry = registry
+    
+    async def collect_garbage(
+        self,
+        keep: int,
+        include_legacy: bool = False,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Keep the active and `keep` newest versions' artifacts; delete the rest"""
+        result = await self.db.execute(
+            select(ModelVersion.id, ModelVersion.artifact_path, ModelVersion.is_active)
+            .order_by(desc(ModelVersion.created_at))
+        )
+        versions = result.all()
+        
+        retained = {
+            version.artifact_path
+            for index, version in enumerate(versions)
+            if version.artifact_path and (version.is_active or index < keep)
+        }
+        expired = [
+            version for version in versions
+            if version.artifact_path and version.artifact_path not in retained
+        ]
+        
+        removed = self.registry.prune(
+            retained,
+            min_age_seconds=settings.ML_REGISTRY_GC_MIN_AGE_SECONDS,
+            dry_run=dry_run
+        )
+        
+        if include_legacy:
+            removed.extend(self._prune_legacy(retained, dry_run))
+        
+        # Expired versions keep their metrics but no longer point at a file
+        cleared = [version.id for version in expired if not Path(version.artifact_path).exists()]
+        if cleared and not dry_run:
+            await self.db.execute(
+                update(ModelVersion)
+                .where(ModelVersion.id.in_(cleared))
+                .values(artifact_path=None)
+            )
+            await self.db.commit()
+        
+        logger.info(f"Removed {len(removed)} model artifacts; {len(retained)} retained")
+        
+        return {
+            'retained': sorted(retained),
+            'removed': [str(path) for path in removed],
+            'versions_cleared': len(cleared),
+            'dry_run': dry_run
+        }
+    
+    def _prune_legacy(self, retained: set, dry_run: bool) -> List[Path]:
+        """Delete timestamped model files written before the registry existed"""
+        removed = []
+        for model_file in Path(settings.ML_MODEL_PATH).glob("model_*.joblib"):
+            if str(model_file) in retained:
+                continue
+            
+            pointer = flat_artifact_path(str(model_file))
+            for path in (model_file, Path(pointer), *flat_artifact_versions(pointer)):
+                if not path.exists():
+                    continue
+                if not dry_run:
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                removed.append(path)
+        
+        return removed
@@ -4,95 +4,147 @@ Prediction service for ML model inference
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+from decimal import Decimal
+import hashlib
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 import pandas as pd
 import numpy as np
 
 from app.models.prediction import Prediction, PredictionStatus
-from app.models.sensor_reading import SensorReading
 from app.models.farm import Farm
 from app.models.model_version import ModelVersion
 from app.schemas.prediction import PredictionRequest, PredictionResponse, Recommendation
-from app.ml.model import CropYieldPredictor
+from app.ml.model import CropYieldPredictor, DEFAULT_YIELD_KG_PER_HA, DEFAULT_CONFIDENCE
+from app.ml.manager import model_manager
+from app.ml.features import latest_feature_values
+from app.ml.baselines import baseline_cache, season_for_date
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import PREDICTION_CACHE_REQUESTS, PREDICTION_READINGS, prediction_stage
+from app.services.feature_service import FeatureService
+from app.services.feature_store_service import FeatureStoreService
+from app.services.prediction_writer import prediction_writer
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of prediction results keyed by feature fingerprint
+prediction_cache = TTLCache(
+    maxsize=settings.PREDICTION_CACHE_MAX_ENTRIES,
+    ttl=settings.PREDICTION_CACHE_TTL_SECONDS
+)
+
+
+def _feature_fingerprint(
+    farm_id: str,
+    feature_vector: np.ndarray,
+    model_version: str,
+    historical_yield: Optional[float] = None
+) -> str:
+    """Hash the encoded feature vector together with the model version and baseline"""
+    digest = hashlib.sha256()
+    digest.update(str(farm_id).encode('utf-8'))
+    digest.update(model_version.encode('utf-8'))
+    digest.update(repr(historical_yield).encode('utf-8'))
+    digest.update(np.ascontiguousarray(feature_vector, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
 
 class PredictionService:
     """Prediction service class"""
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.model = None
-        self._load_model()
-    
-    def _load_model(self):
-        """Load the trained model"""
-        try:
-            from pathlib import Path
-            import joblib
-            
-            # Get active model version
-            model_path = Path(settings.ML_MODEL_PATH)
-            model_files = list(model_path.glob("*.joblib"))
-            
-            if not model_files:
-                logger.warning("No trained model found. Using default model.")
-                self.model = CropYieldPredictor()
-                return
-            
-            # Load the most recent model
-            latest_model = max(model_files, key=lambda x: x.stat().st_mtime)
-            
-            self.model = CropYieldPredictor()
-            self.model.load_model(str(latest_model))
-            
-            logger.info(f"Model loaded from {latest_model}")
-            
-        except Exception as e:
-            logger.error(f"Failed to load model: {str(e)}")
-            self.model = CropYieldPredictor()
+        # Use the model shared by this process
+        self.model: CropYieldPredictor = model_manager.get_model()
     
     async def predict_yield(self, prediction_request: PredictionRequest) -> PredictionResponse:
         """Generate yield prediction and recommendations"""
+        model_version = self.model.model_version
         try:
             # Get farm information
-            farm_result = await self.db.execute(
-                select(Farm).where(Farm.id == prediction_request.farm_id)
-            )
-            farm = farm_result.scalar_one_or_none()
+            with prediction_stage("farm_lookup", model_version):
+                farm_result = await self.db.execute(
+                    select(Farm).where(Farm.id == prediction_request.farm_id)
+                )
+                farm = farm_result.scalar_one_or_none()
             
             if not farm:
                 raise ValueError("Farm not found")
             
-            # Get recent sensor readings
-            recent_readings = await self._get_recent_sensor_readings(
-                prediction_request.farm_id, days=30
-            )
+            # Read the incrementally maintained features, falling back to
+            # computing them inside the database
+            with prediction_stage("feature_fetch", model_version):
+                feature_source = "feature_store"
+                farm_features = await FeatureStoreService(self.db).get_farm_features(
+                    prediction_request.farm_id
+                )
+                if not farm_features:
+                    feature_source = "aggregate"
+                    farm_features = await FeatureService(self.db).get_farm_features(
+                        prediction_request.farm_id
+                    )
             
-            if not recent_readings:
+            if not farm_features:
                 raise ValueError("No recent sensor readings found")
             
+            # One stored row, or every reading in the aggregate's window
+            rows_read = 1 if feature_source == "feature_store" else farm_features.get('reading_count') or 0
+            PREDICTION_READINGS.labels(source=feature_source).observe(rows_read)
+            
             # Prepare features for prediction
-            features_df = self._prepare_features_for_prediction(
-                recent_readings, farm, prediction_request
-            )
+            with prediction_stage("feature_prep", model_version):
+                feature_record = self._prepare_features_for_prediction(
+                    farm_features, farm, prediction_request
+                )
+                feature_vector = self.model.encode_features(feature_record)
+                features = dict(zip(self.model.feature_columns, feature_vector[0].tolist()))
+                historical_yield = self._get_historical_yield(farm, prediction_request)
+            
+            # Identical features, model version and baseline produce identical output
+            cache_key = None
+            if settings.PREDICTION_CACHE_ENABLED:
+                with prediction_stage("cache_lookup", model_version):
+                    cache_key = _feature_fingerprint(
+                        prediction_request.farm_id,
+                        feature_vector,
+                        model_version,
+                        historical_yield
+                    )
+                    cached = prediction_cache.get(cache_key)
+                if cached is not None:
+                    PREDICTION_CACHE_REQUESTS.labels(result="hit").inc()
+                    if not settings.PREDICTION_CACHE_SKIP_DUPLICATE_SAVE:
+                        with prediction_stage("persist", model_version):
+                            await self._persist_prediction(
+                                prediction_request.farm_id,
+                                features,
+                                cached['predicted_yield'],
+                                cached['confidence'],
+                                cached['recommendations']
+                            )
+                    # Same prediction, but generated now as far as the client is concerned
+                    return cached['response'].model_copy(update={'timestamp': datetime.utcnow()})
+                PREDICTION_CACHE_REQUESTS.labels(result="miss").inc()
             
             # Make prediction
-            if not self.model.is_trained:
-                # Use default prediction if model is not trained
-                predicted_yield = 3500.0  # Default yield in kg/ha
-                confidence = 0.5
-            else:
-                prediction_result = self.model.predict(features_df)
-                predicted_yield = prediction_result['predictions'][0]
-                confidence = prediction_result['confidence'][0]
+            with prediction_stage("inference", model_version):
+                if not self.model.is_trained:
+                    # Use default prediction if model is not trained
+                    predicted_yield = DEFAULT_YIELD_KG_PER_HA
+                    confidence = DEFAULT_CONFIDENCE
+                else:
+                    prediction_result = self.model.predict(feature_vector)
+                    predicted_yield = prediction_result['predictions'][0]
+                    confidence = prediction_result['confidence'][0]
+                    
+                    # Scored on a background thread; never delays or fails this request
+                    model_manager.submit_shadow(
+                        prediction_request.farm_id, feature_vector, predicted_yield, confidence
+                    )
             
             # Calculate expected change vs historical
-            historical_yield = await self._get_historical_yield(prediction_request.farm_id)
             if historical_yield:
                 change_percent = ((predicted_yield - historical_yield) / historical_yield) * 100
                 expected_change = f"{change_percent:+.1f}%"
@@ -100,112 +152,89 @@ class PredictionService:
                 expected_change = "N/A"
             
             # Generate recommendations
-            latest_features = self._get_latest_features(recent_readings)
-            recommendations = self.model.generate_recommendations(
-                latest_features, predicted_yield
-            )
+            with prediction_stage("recommendations", model_version):
+                latest_features = latest_feature_values(farm_features)
+                recommendations = self.model.generate_recommendations(
+                    latest_features, predicted_yield
+                )
             
-            # Save prediction to database
-            prediction = await self._save_prediction(
-                prediction_request.farm_id,
-                features_df.to_dict('records')[0],
-                predicted_yield,
-                confidence,
-                recommendations
-            )
+            # Persist off the response path when the writer is running
+            with prediction_stage("persist", model_version):
+                await self._persist_prediction(
+                    prediction_request.farm_id,
+                    features,
+                    predicted_yield,
+                    confidence,
+                    recommendations
+                )
             
-            return PredictionResponse(
-                predicted_yield_kg_per_ha=predicted_yield,
-                confidence=confidence,
+            response = PredictionResponse(
+                predicted_yield_kg_per_ha=Decimal(str(predicted_yield)),
+                confidence=Decimal(str(confidence)),
                 expected_change_vs_hist=expected_change,
-                recommendations=recommendations,
-                model_version=self.model.model_version,
+                recommendations=[Recommendation(**recommendation) for recommendation in recommendations],
+                model_version=model_version,
                 timestamp=datetime.utcnow()
             )
             
+            if cache_key is not None:
+                prediction_cache.set(cache_key, {
+                    'response': response,
+                    'predicted_yield': predicted_yield,
+                    'confidence': confidence,
+                    'recommendations': recommendations
+                })
+            
+            return response
+            
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             raise
     
-    async def _get_recent_sensor_readings(self, farm_id: str, days: int = 30) -> List[SensorReading]:
-        """Get recent sensor readings for a farm"""
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        result = await self.db.execute(
-            select(SensorReading)
-            .where(
-                SensorReading.farm_id == farm_id,
-                SensorReading.timestamp >= start_date,
-                SensorReading.timestamp <= end_date
-            )
-            .order_by(desc(SensorReading.timestamp))
-        )
-        
-        return result.scalars().all()
-    
     def _prepare_features_for_prediction(
         self, 
-        readings: List[SensorReading], 
+        farm_features: Dict[str, Any], 
         farm: Farm, 
         request: PredictionRequest
-    ) -> pd.DataFrame:
-        """Prepare features for prediction"""
-        if not readings:
-            # Return default features if no readings
-            return pd.DataFrame([{
-                'soil_moisture': 45.0,
-                'soil_ph': 6.5,
-                'nitrogen': 50.0,
-                'phosphorus': 25.0,
-                'potassium': 150.0,
-                'air_temperature': 28.0,
-                'air_humidity': 70.0,
-                'soil_temperature': 25.0,
-                'timestamp': request.start_date,
-                'planting_date': farm.planting_date or (request.start_date - timedelta(days=90))
-            }])
-        
-        # Use the most recent reading
-        latest_reading = readings[0]
-        
-        features = {
-            'soil_moisture': float(latest_reading.soil_moisture or 45.0),
-            'soil_ph': float(latest_reading.soil_ph or 6.5),
-            'nitrogen': float(latest_reading.nitrogen or 50.0),
-            'phosphorus': float(latest_reading.phosphorus or 25.0),
-            'potassium': float(latest_reading.potassium or 150.0),
-            'air_temperature': float(latest_reading.air_temperature or 28.0),
-            'air_humidity': float(latest_reading.air_humidity or 70.0),
-            'soil_temperature': float(latest_reading.soil_temperature or 25.0),
-            'timestamp': request.start_date,
-            'planting_date': farm.planting_date or (request.start_date - timedelta(days=90))
-        }
+    ) -> Dict[str, Any]:
+        """Prepare the raw feature record for prediction"""
+        features: Dict[str, Any] = dict(latest_feature_values(farm_features))
+        features['timestamp'] = request.start_date
+        features['planting_date'] = farm.planting_date or (request.start_date - timedelta(days=90))
         
-        return pd.DataFrame([features])
+        return features
     
-    def _get_latest_features(self, readings: List[SensorReading]) -> Dict[str, float]:
-        """Get latest feature values for recommendations"""
-        if not readings:
-            return {}
-        
-        latest = readings[0]
-        return {
-            'soil_moisture': float(latest.soil_moisture or 45.0),
-            'soil_ph': float(latest.soil_ph or 6.5),
-            'nitrogen': float(latest.nitrogen or 50.0),
-            'phosphorus': float(latest.phosphorus or 25.0),
-            'potassium': float(latest.potassium or 150.0),
-            'air_temperature': float(latest.air_temperature or 28.0),
-            'air_humidity': float(latest.air_humidity or 70.0),
-            'soil_temperature': float(latest.soil_temperature or 25.0)
-        }
+    def _get_historical_yield(self, farm: Farm, request: PredictionRequest) -> Optional[float]:
+        """Get the cached historical baseline for comparison (no query)"""
+        return baseline_cache.baseline(
+            farm.id,
+            request.crop or farm.crop_type,
+            season_for_date(request.start_date)
+        )
     
-    async def _get_historical_yield(self, farm_id: str) -> Optional[float]:
-        """Get historical yield for comparison"""
-        # In a real scenario, this would come from historical yield records
-        # For now, return a default value
-        return 3200.0  # Default historical yield in kg/ha
+    async def _persist_prediction(
+        self,
+        farm_id: str,
+        features: Dict[str, Any],
+        predicted_yield: float,
+        confidence: float,
+        recommendations: List[Dict[str, Any]]
+    ) -> None:
+        """Queue the prediction for the background writer, saving inline if it is unavailable"""
+        queued = prediction_writer.enqueue({
+            'farm_id': farm_id,
+            'model_version': self.model.model_version,
+            'features_json': features,
+            'predicted_yield_kg_per_ha': predicted_yield,
+            'confidence': confidence,
+            'recommendations_json': recommendations,
+            'status': PredictionStatus.COMPLETED,
+            'created_at': datetime.utcnow()
+        })
+        if not queued:
+            await self._save_prediction(
+                farm_id, features, predicted_yield, confidence, recommendations
+            )
     
     async def _save_prediction(
         self,
@@ -258,4 +287,4 @@ class PredictionService:
             .limit(limit)
         )
         
-        return result.scalars().all()
+        return list(result.scalars().all())
@@ -0,0 +1,118 @@
+"""
+Write-behind persistence for prediction rows
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import PREDICTION_WRITES
+from app.models.prediction import Prediction
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Queue marker asking the writer to flush and exit
+_STOP = object()
+
+
+class PredictionWriter:
+    """Background writer that batches prediction inserts"""
+    
+    def __init__(
+        self,
+        flush_interval_ms: int = 250,
+        max_batch_size: int = 500,
+        max_queue_size: int = 10000
+    ):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Set once stop() begins; rows after the stop marker would never be written
+        self._stopping = False
+    
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the background flush loop on the running event loop"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(self._queue))
+        logger.info("Prediction writer started")
+    
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a row for insertion; False means the caller must write it itself"""
+        if not self.is_running or self._stopping or self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            PREDICTION_WRITES.labels(result="queue_full").inc()
+            return False
+        return True
+    
+    async def stop(self) -> None:
+        """Flush every queued row, then stop"""
+        task, queue = self._task, self._queue
+        if task is None or task.done() or queue is None:
+            return
+        self._stopping = True
+        await queue.put(_STOP)
+        await task
+        self._task = None
+        logger.info("Prediction writer drained and stopped")
+    
+    async def _run(self, queue: asyncio.Queue) -> None:
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+            
+            # Let concurrent requests fill the batch
+            await asyncio.sleep(self.flush_interval)
+            
+            batch = [item]
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._write(batch)
+    
+    async def _write(self, batch: List[Dict[str, Any]], attempts: int = 3) -> None:
+        """Insert a batch with one executemany, retrying transient failures"""
+        for attempt in range(1, attempts + 1):
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(Prediction), batch)
+                    await db.commit()
+                PREDICTION_WRITES.labels(result="written").inc(len(batch))
+                return
+            except Exception as e:
+                logger.error(f"Prediction batch write failed (attempt {attempt}/{attempts}): {str(e)}")
+                if attempt < attempts:
+                    await asyncio.sleep(self.flush_interval * attempt)
+        
+        PREDICTION_WRITES.labels(result="dropped").inc(len(batch))
+
+
+# Process-wide writer started and drained by the application lifespan
+prediction_writer = PredictionWriter(
+    flush_interval_ms=settings.PREDICTION_WRITE_INTERVAL_MS,
+    max_batch_size=settings.PREDICTION_WRITE_BATCH_SIZE,
+    max_queue_size=settings.PREDICTION_WRITE_QUEUE_SIZE
+)
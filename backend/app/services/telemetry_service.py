@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from app.models.sensor_reading import SensorReading
 from app.models.device import Device
 from app.schemas.sensor_reading import SensorReadingCreate, SensorReadingStats
+from app.services.feature_store_service import FeatureStoreService
 
 
 class TelemetryService:
@@ -39,6 +40,10 @@ class TelemetryService:
         )
         
         self.db.add(reading)
+        
+        # Keep the farm feature store current in the same transaction
+        await FeatureStoreService(self.db).apply_readings([reading_in])
+        
         await self.db.commit()
         await self.db.refresh(reading)
         
@@ -72,6 +77,9 @@ class TelemetryService:
             readings.append(reading)
             self.db.add(reading)
         
+        # Keep the farm feature store current in the same transaction
+        await FeatureStoreService(self.db).apply_readings(readings_in)
+        
         await self.db.commit()
         
         # Update device last seen for unique devices
@@ -0,0 +1,279 @@
+"""
+Training job service queueing model training outside the API process
+"""
+
+import asyncio
+import multiprocessing
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from multiprocessing.process import BaseProcess
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, desc, func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import TRAINING_JOBS
+from app.models.training_job import TrainingJob, TrainingJobStatus, ACTIVE_STATUSES, FINISHED_STATUSES
+from app.ml.jobs import run_job_process
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock serialising job claims across every API worker
+TRAINING_JOB_CLAIM_LOCK = 0x4A4F4253
+
+
+class TrainingJobService:
+    """Training job service class"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_job(self, params: Dict[str, Any], requested_by: Optional[str] = None) -> TrainingJob:
+        """Queue a training run; a dispatcher picks it up"""
+        job = TrainingJob(
+            status=TrainingJobStatus.QUEUED.value,
+            params_json=params,
+            requested_by=requested_by
+        )
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        
+        return job
+    
+    async def get_job(self, job_id: str) -> Optional[TrainingJob]:
+        """Get training job by ID"""
+        result = await self.db.execute(
+            select(TrainingJob).where(TrainingJob.id == job_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def list_jobs(self, skip: int = 0, limit: int = 20) -> List[TrainingJob]:
+        """Get training jobs, newest first"""
+        result = await self.db.execute(
+            select(TrainingJob)
+            .order_by(desc(TrainingJob.created_at))
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def cancel_job(self, job_id: str) -> Optional[TrainingJob]:
+        """Cancel a queued job now, or ask the dispatcher to stop a running one"""
+        await self.db.execute(
+            update(TrainingJob)
+            .where(TrainingJob.id == job_id, TrainingJob.status == TrainingJobStatus.QUEUED.value)
+            .values(status=TrainingJobStatus.CANCELLED.value, finished_at=datetime.now(timezone.utc))
+        )
+        await self.db.execute(
+            update(TrainingJob)
+            .where(TrainingJob.id == job_id, TrainingJob.status == TrainingJobStatus.RUNNING.value)
+            .values(status=TrainingJobStatus.CANCELLING.value)
+        )
+        await self.db.commit()
+        
+        job = await self.get_job(job_id)
+        if job is not None:
+            await self.db.refresh(job)
+        return job
+
+
+class TrainingJobRunner:
+    """Claims queued jobs and runs each in its own spawned process"""
+    
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        poll_interval: float = 2.0,
+        timeout_seconds: int = 3600
+    ):
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self.timeout_seconds = timeout_seconds
+        self._processes: Dict[str, Tuple[BaseProcess, float]] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start polling for queued jobs on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Training job runner started")
+    
+    async def stop(self) -> None:
+        """Stop polling and terminate jobs started by this process"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        
+        for job_id in list(self._processes):
+            await self._terminate(job_id, TrainingJobStatus.FAILED, "Interrupted by shutdown")
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Training job dispatch failed: {str(e)}")
+            
+            await asyncio.sleep(self.poll_interval)
+    
+    async def poll(self) -> None:
+        """Reap finished processes, honour cancellations and start queued jobs"""
+        now = time.monotonic()
+        for job_id, (process, started) in list(self._processes.items()):
+            if not process.is_alive():
+                process.join()
+                del self._processes[job_id]
+                if process.exitcode != 0:
+                    await self._finish(
+                        job_id, TrainingJobStatus.FAILED,
+                        f"Training process exited with code {process.exitcode}"
+                    )
+                TRAINING_JOBS.labels(result="succeeded" if process.exitcode == 0 else "failed").inc()
+            elif now - started > self.timeout_seconds:
+                await self._terminate(
+                    job_id, TrainingJobStatus.FAILED,
+                    f"Timed out after {self.timeout_seconds} seconds"
+                )
+                TRAINING_JOBS.labels(result="timed_out").inc()
+        
+        if self._processes:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(TrainingJob.id).where(
+                        TrainingJob.id.in_(list(self._processes)),
+                        TrainingJob.status == TrainingJobStatus.CANCELLING.value
+                    )
+                )
+                cancelled = [str(job_id) for job_id in result.scalars().all()]
+            for job_id in cancelled:
+                await self._terminate(job_id, TrainingJobStatus.CANCELLED, None)
+                TRAINING_JOBS.labels(result="cancelled").inc()
+        
+        await self._reclaim_stale()
+        
+        while len(self._processes) < self.max_concurrent:
+            job = await self._claim()
+            if job is None:
+                break
+            await self._spawn(*job)
+    
+    async def _reclaim_stale(self) -> None:
+        """Fail jobs left running past the timeout by a worker that died"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.timeout_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(TrainingJob)
+                .where(
+                    TrainingJob.status.in_(ACTIVE_STATUSES),
+                    TrainingJob.started_at < cutoff,
+                    # Our own processes are timed out and terminated above
+                    TrainingJob.id.notin_(list(self._processes))
+                )
+                .values(
+                    status=TrainingJobStatus.FAILED.value,
+                    error=f"Abandoned after {self.timeout_seconds} seconds",
+                    finished_at=datetime.now(timezone.utc)
+                )
+                .returning(TrainingJob.id)
+            )
+            reclaimed = [str(job_id) for job_id in result.scalars().all()]
+            await db.commit()
+        
+        for job_id in reclaimed:
+            logger.warning(f"Training job {job_id} reclaimed from a worker that stopped reporting")
+            TRAINING_JOBS.labels(result="timed_out").inc()
+    
+    async def _claim(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Atomically move the oldest queued job to running, within the global cap"""
+        oldest = (
+            select(TrainingJob.id)
+            .where(TrainingJob.status == TrainingJobStatus.QUEUED.value)
+            .order_by(TrainingJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with AsyncSessionLocal() as db:
+            # Every API worker runs a dispatcher; claiming one at a time makes
+            # max_concurrent a cap on running jobs everywhere, not per process
+            await db.execute(select(func.pg_advisory_xact_lock(TRAINING_JOB_CLAIM_LOCK)))
+            active = await db.scalar(
+                select(func.count()).select_from(TrainingJob).where(TrainingJob.status.in_(ACTIVE_STATUSES))
+            )
+            if (active or 0) >= self.max_concurrent:
+                await db.rollback()
+                return None
+            
+            result = await db.execute(
+                update(TrainingJob)
+                .where(TrainingJob.id == oldest)
+                .values(
+                    status=TrainingJobStatus.RUNNING.value,
+                    stage="starting",
+                    started_at=datetime.now(timezone.utc)
+                )
+                .returning(TrainingJob.id, TrainingJob.params_json)
+            )
+            row = result.first()
+            await db.commit()
+        
+        if row is None:
+            return None
+        return str(row.id), dict(row.params_json or {})
+    
+    async def _spawn(self, job_id: str, params: Dict[str, Any]) -> None:
+        process = self._context.Process(
+            target=run_job_process,
+            args=(job_id, params, settings.TRAINING_JOB_N_JOBS),
+            kwargs={
+                'nice': settings.TRAINING_JOB_NICE,
+                'memory_limit_mb': settings.TRAINING_JOB_MEMORY_LIMIT_MB
+            },
+            name=f"training-job-{job_id}"
+        )
+        process.start()
+        assert process.pid is not None
+        self._processes[job_id] = (process, time.monotonic())
+        
+        await self._record_pid(job_id, process.pid)
+        logger.info(f"Started training job {job_id} in process {process.pid}")
+    
+    async def _record_pid(self, job_id: str, pid: int) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(TrainingJob).where(TrainingJob.id == job_id).values(pid=pid)
+            )
+            await db.commit()
+    
+    async def _terminate(self, job_id: str, status: TrainingJobStatus, error: Optional[str]) -> None:
+        process, _ = self._processes.pop(job_id)
+        process.terminate()
+        await asyncio.get_running_loop().run_in_executor(None, process.join, 10)
+        if process.is_alive():
+            process.kill()
+        
+        await self._finish(job_id, status, error)
+        logger.info(f"Training job {job_id} stopped: {status.value}")
+    
+    async def _finish(self, job_id: str, status: TrainingJobStatus, error: Optional[str]) -> None:
+        """Record a final state unless the job already recorded its own"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(TrainingJob)
+                .where(TrainingJob.id == job_id, TrainingJob.status.notin_(FINISHED_STATUSES))
+                .values(status=status.value, error=error, finished_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+
+
+# Dispatcher for this API worker process
+training_job_runner = TrainingJobRunner(
+    max_concurrent=settings.TRAINING_JOB_MAX_CONCURRENT,
+    poll_interval=settings.TRAINING_JOB_POLL_SECONDS,
+    timeout_seconds=settings.TRAINING_JOB_TIMEOUT_SECONDS
+)
@@ -8,8 +8,16 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.schemas.user import CurrentUser, UserCreate, UserUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import password_hasher
+
+# Authorization fields of recently authenticated users, keyed by user ID
+auth_user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
 
 
 class UserService:
@@ -25,6 +33,20 @@ class UserService:
         )
         return result.scalar_one_or_none()
     
+    async def get_current_user(self, user_id: str) -> Optional[CurrentUser]:
+        """Load a user's authorization fields and cache them"""
+        result = await self.db.execute(
+            select(User.id, User.role, User.is_active).where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        
+        current_user = CurrentUser(id=str(row.id), role=row.role, is_active=row.is_active)
+        auth_user_cache.set(str(user_id), current_user)
+        
+        return current_user
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         result = await self.db.execute(
@@ -48,7 +70,7 @@ class UserService:
             name=user_in.name,
             email=user_in.email,
             phone=user_in.phone,
-            password_hash=get_password_hash(user_in.password),
+            password_hash=await password_hasher.hash(user_in.password),
             role=user_in.role,
             region=user_in.region,
             language=user_in.language
@@ -60,6 +82,23 @@ class UserService:
         
         return user
     
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """Check credentials, upgrading the stored hash if its work factor is outdated"""
+        user = await self.get_by_email(email)
+        if not user:
+            return None
+        
+        valid, new_hash = await password_hasher.verify(password, user.password_hash)
+        if not valid:
+            return None
+        
+        if new_hash:
+            user.password_hash = new_hash
+            await self.db.commit()
+            await self.db.refresh(user)
+        
+        return user
+    
     async def update_user(self, user_id: str, user_update: UserUpdate) -> Optional[User]:
         """Update user"""
         user = await self.get_user(user_id)
@@ -72,6 +111,7 @@ class UserService:
         
         await self.db.commit()
         await self.db.refresh(user)
+        auth_user_cache.invalidate(str(user_id))
         
         return user
     
@@ -83,5 +123,6 @@ class UserService:
         
         await self.db.delete(user)
         await self.db.commit()
+        auth_user_cache.invalidate(str(user_id))
         
         return True
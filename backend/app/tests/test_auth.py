@@ -9,6 +9,8 @@ from app.main import app
 from app.core.database import get_db
 from app.models.user import User
 from app.core.security import get_password_hash
+from app.schemas.user import UserUpdate
+from app.services.user_service import UserService, auth_user_cache
 
 client = TestClient(app)
 
@@ -116,3 +118,22 @@ class TestAuth:
         data = response.json()
         assert data["email"] == "test@example.com"
         assert data["name"] == "Test User"
+    
+    async def test_deactivation_invalidates_cached_user(self, db: AsyncSession, test_user: User):
+        """Test that a cached user is rejected right after being deactivated"""
+        login_response = client.post(
+            "/api/v1/auth/login-email",
+            json={
+                "email": "test@example.com",
+                "password": "testpassword"
+            }
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+        
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+        assert auth_user_cache.get(str(test_user.id)) is not None
+        
+        await UserService(db).update_user(str(test_user.id), UserUpdate(is_active=False))
+        
+        assert auth_user_cache.get(str(test_user.id)) is None
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 400
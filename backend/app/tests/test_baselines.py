@@ -0,0 +1,77 @@
+"""
+Tests for historical yield baselines
+"""
+
+from datetime import date
+
+from app.ml.baselines import BaselineCache, season_for_date
+
+
+def make_record(farm_id, season, year, value, crop_type="Maize", region=None):
+    return {
+        'farm_id': farm_id,
+        'crop_type': crop_type,
+        'season': season,
+        'year': year,
+        'yield_kg_per_ha': value,
+        'region': region
+    }
+
+
+class TestBaselineCache:
+    """Test baseline lookup precedence"""
+    
+    def test_farm_seasonal_median(self):
+        """Test that a farm's own seasonal history is preferred"""
+        cache = BaselineCache()
+        cache.load([
+            make_record("farm-1", "summer", 2021, 3000),
+            make_record("farm-1", "summer", 2022, 3400),
+            make_record("farm-1", "summer", 2023, 9000),
+            make_record("farm-1", "winter", 2023, 1000)
+        ], {"farm-1": "north"})
+        
+        assert cache.baseline("farm-1", "maize", "summer") == 3400
+        assert cache.baseline("farm-1", "maize", "spring") == (3000 + 3400 + 9000 + 1000) / 4
+    
+    def test_region_fallback(self):
+        """Test that farms without history use their region's baseline"""
+        cache = BaselineCache()
+        cache.load([
+            make_record("farm-1", "summer", 2023, 3000),
+            make_record("farm-2", "summer", 2023, 4000, region="north")
+        ], {"farm-1": "north", "farm-3": "north", "farm-4": "south"})
+        
+        assert cache.baseline("farm-3", "Maize", "summer") == 3500
+        assert cache.baseline("farm-3", "Maize", "fall") == 3500
+        assert cache.baseline("farm-3", "Rice", "summer") is None
+        assert cache.baseline("farm-4", "Maize", "summer") is None
+        assert cache.baseline("farm-5", "Maize", "summer") is None
+    
+    def test_season_for_date(self):
+        """Test calendar month to season mapping"""
+        assert season_for_date(date(2024, 1, 15)) == "winter"
+        assert season_for_date(date(2024, 7, 1)) == "summer"
+        assert season_for_date(date(2024, 12, 31)) == "winter"
+    
+    def test_update_patches_only_written_keys(self):
+        """Test that a keyed update replaces the written farm's and region's baselines only"""
+        cache = BaselineCache()
+        cache.load([
+            make_record("farm-1", "summer", 2022, 3000),
+            make_record("farm-2", "summer", 2022, 5000, region="north"),
+            make_record("farm-3", "summer", 2022, 7000, region="south")
+        ], {"farm-1": "north", "farm-2": "north", "farm-3": "south", "farm-4": "south"})
+        
+        farm_records = [
+            make_record("farm-1", "summer", 2022, 3000),
+            make_record("farm-1", "summer", 2023, 4000, crop_type=" maize "),
+            make_record("farm-1", "summer", 2023, 9999, crop_type="Rice")
+        ]
+        region_records = farm_records + [make_record("farm-2", "summer", 2022, 5000, region="north")]
+        cache.update("farm-1", "Maize", "summer", farm_records, "north", region_records, "north")
+        
+        assert cache.baseline("farm-1", "Maize", "summer") == 3500
+        assert cache.baseline("farm-1", "Maize", "winter") == 3500
+        assert cache._region_seasonal[("north", "maize", "summer")] == 4000
+        assert cache.baseline("farm-4", "Maize", "summer") == 7000
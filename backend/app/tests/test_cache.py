@@ -0,0 +1,52 @@
+"""
+Tests for in-process caching utilities
+"""
+
+import time
+from app.core.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test TTL/LRU cache behaviour"""
+    
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses"""
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_invalidate(self):
+        """Test explicit invalidation"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        
+        assert cache.get("a") is None
@@ -0,0 +1,42 @@
+"""
+Tests for shared feature definitions
+"""
+
+from app.ml.features import apply_reading, latest_feature_values, window_feature_name, SENSOR_DEFAULTS
+
+
+class TestFeatures:
+    """Test feature helpers"""
+    
+    def test_latest_values_use_defaults(self):
+        """Test that missing sensors fall back to defaults"""
+        values = latest_feature_values({'soil_moisture': 30.0, 'soil_ph': None})
+        
+        assert values['soil_moisture'] == 30.0
+        assert values['soil_ph'] == SENSOR_DEFAULTS['soil_ph']
+        assert values['nitrogen'] == SENSOR_DEFAULTS['nitrogen']
+    
+    def test_apply_reading_initialises_running_means(self):
+        """Test that the first reading seeds latest values and window means"""
+        values = apply_reading({}, {'soil_moisture': 40.0})
+        
+        assert values['soil_moisture'] == 40.0
+        assert values[window_feature_name('soil_moisture', 'ewm', 7)] == 40.0
+        assert 'soil_ph' not in values
+    
+    def test_apply_reading_decays_by_window(self):
+        """Test that short windows react faster than long ones"""
+        values = apply_reading({}, {'soil_moisture': 40.0})
+        values = apply_reading(values, {'soil_moisture': 60.0}, elapsed_seconds=3600)
+        
+        short = values[window_feature_name('soil_moisture', 'ewm', 1)]
+        long = values[window_feature_name('soil_moisture', 'ewm', 30)]
+        assert values['soil_moisture'] == 60.0
+        assert 40.0 < long < short < 60.0
+    
+    def test_out_of_order_reading_keeps_latest(self):
+        """Test that late readings do not overwrite the latest value"""
+        values = apply_reading({}, {'soil_moisture': 40.0})
+        values = apply_reading(values, {'soil_moisture': 10.0}, is_newest=False)
+        
+        assert values['soil_moisture'] == 40.0
@@ -0,0 +1,254 @@
+"""
+Tests for the crop yield prediction model
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date, datetime, timezone
+
+from app.ml.forest import flat_artifact_versions
+from app.ml.model import CropYieldPredictor, HIST_GRADIENT_BOOSTING
+
+
+def make_training_frame(n_samples: int = 300, seed: int = 0):
+    """Build a small synthetic training set"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_samples), unit='D')
+    X = pd.DataFrame({
+        'soil_moisture': rng.normal(45, 15, n_samples),
+        'soil_ph': rng.normal(6.5, 0.8, n_samples),
+        'nitrogen': rng.normal(50, 20, n_samples),
+        'phosphorus': rng.normal(25, 10, n_samples),
+        'potassium': rng.normal(150, 50, n_samples),
+        'air_temperature': rng.normal(28, 5, n_samples),
+        'air_humidity': rng.normal(70, 15, n_samples),
+        'soil_temperature': rng.normal(25, 3, n_samples),
+        'timestamp': timestamps,
+        'planting_date': timestamps - pd.Timedelta(days=90)
+    })
+    y = pd.Series(3000 + 10 * X['nitrogen'] - 20 * np.abs(X['soil_ph'] - 6.75) + rng.normal(0, 50, n_samples))
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def trained_model():
+    """Train a small model on synthetic data"""
+    X, y = make_training_frame()
+    model = CropYieldPredictor()
+    model.model.set_params(n_estimators=10)
+    model.train(X, y)
+    return model
+
+
+class TestCropYieldPredictor:
+    """Test model feature encoding and inference"""
+    
+    def test_encode_matches_prepare_features(self):
+        """Test that the single-row encoder matches the pandas path"""
+        model = CropYieldPredictor()
+        record = {
+            'soil_moisture': 42.0, 'soil_ph': 6.7, 'nitrogen': 55.0, 'phosphorus': 20.0,
+            'potassium': 140.0, 'air_temperature': 29.5, 'air_humidity': 65.0,
+            'soil_temperature': 24.0,
+            'timestamp': datetime(2024, 7, 15, 12, 0),
+            'planting_date': date(2024, 4, 1)
+        }
+        
+        encoded = model.encode_features(record)
+        expected = model.prepare_features(pd.DataFrame([record])).to_numpy(dtype=np.float32)
+        
+        assert encoded.dtype == np.float32
+        np.testing.assert_array_equal(encoded, expected)
+    
+    def test_encode_uses_defaults_for_missing_values(self):
+        """Test that missing inputs take the stored defaults"""
+        model = CropYieldPredictor()
+        model.feature_defaults['soil_ph'] = 6.1
+        
+        encoded = model.encode_features({'soil_ph': None})
+        row = dict(zip(model.feature_columns, encoded[0]))
+        
+        assert row['soil_ph'] == pytest.approx(6.1)
+        assert row['days_since_planting'] == 90
+        assert row['season_encoded'] == 1
+    
+    def test_record_prediction_matches_frame_prediction(self, trained_model):
+        """Test that the fast path agrees with the DataFrame path"""
+        X, _ = make_training_frame(n_samples=5, seed=1)
+        frame = X
+        
+        from_frame = trained_model.predict(frame)
+        from_records = [
+            trained_model.predict(record)
+            for record in frame.to_dict('records')
+        ]
+        
+        np.testing.assert_allclose(
+            from_frame['predictions'],
+            [result['predictions'][0] for result in from_records],
+            rtol=1e-3
+        )
+    
+    def test_flat_forest_matches_sklearn(self, trained_model):
+        """Test that the compiled forest reproduces sklearn exactly"""
+        X, _ = make_training_frame(n_samples=200, seed=2)
+        X_processed = trained_model.prepare_features(X)
+        X_scaled = trained_model.scaler.transform(X_processed)
+        
+        predictions, prediction_std = trained_model.forest.predict(X_scaled)
+        individual = np.array([
+            estimator.predict(X_scaled) for estimator in trained_model.model.estimators_
+        ])
+        
+        np.testing.assert_array_equal(predictions, trained_model.model.predict(X_scaled))
+        np.testing.assert_array_equal(prediction_std, np.std(individual, axis=0))
+    
+    def test_inference_only_load(self, trained_model, tmp_path):
+        """Test that the flat artifact loads without the pickled estimator"""
+        model_path = tmp_path / "model.joblib"
+        trained_model.save_model(str(model_path))
+        
+        loaded = CropYieldPredictor()
+        loaded.load_model(str(model_path), inference_only=True)
+        
+        X, _ = make_training_frame(n_samples=20, seed=3)
+        assert loaded.forest is not None
+        assert not hasattr(loaded.model, 'estimators_')
+        np.testing.assert_array_equal(
+            loaded.predict(X)['predictions'],
+            trained_model.predict(X)['predictions']
+        )
+    
+    def test_inference_artifact_is_memory_mapped(self, trained_model, tmp_path):
+        """Test that inference-only loads map the tree arrays instead of copying them"""
+        model_path = tmp_path / "model.joblib"
+        trained_model.save_model(str(model_path))
+        
+        loaded = CropYieldPredictor()
+        loaded.load_model(str(model_path), inference_only=True)
+        
+        for array in loaded.forest.arrays().values():
+            assert isinstance(array, np.memmap)
+            assert not array.flags.writeable
+    
+    def test_resave_swaps_artifact_pointer(self, trained_model, tmp_path):
+        """Test that saving over a model repoints readers and keeps at most two versions"""
+        model_path = tmp_path / "model.joblib"
+        pointer = tmp_path / "model.flat"
+        targets = []
+        for _ in range(3):
+            trained_model.save_model(str(model_path))
+            targets.append(pointer.read_text())
+        
+        loaded = CropYieldPredictor()
+        loaded.load_model(str(model_path), inference_only=True)
+        
+        assert len(set(targets)) == 3
+        assert [path.name for path in flat_artifact_versions(str(pointer))] == sorted(targets[1:])
+        assert not list(tmp_path.glob("*.tmp"))
+        X, _ = make_training_frame(n_samples=20, seed=4)
+        np.testing.assert_array_equal(
+            loaded.predict(X)['predictions'],
+            trained_model.predict(X)['predictions']
+        )
+    
+    def test_prepare_features_keeps_precomputed_columns(self, trained_model):
+        """Test that loader-computed calendar features match timestamp-derived ones"""
+        X, _ = make_training_frame(n_samples=50, seed=5)
+        expected = trained_model.prepare_features(X)
+        
+        precomputed = X.drop(columns=['timestamp', 'planting_date']).astype(np.float32)
+        precomputed['days_since_planting'] = expected['days_since_planting'].astype(np.float32)
+        precomputed['season_encoded'] = expected['season_encoded'].astype(np.float32)
+        
+        np.testing.assert_allclose(
+            trained_model.prepare_features(precomputed).to_numpy(dtype=np.float64),
+            expected.to_numpy(dtype=np.float64),
+            rtol=1e-6
+        )
+    
+    def test_incremental_update_adds_and_prunes_trees(self):
+        """Test that warm-started updates keep old trees and cap the forest size"""
+        X, y = make_training_frame()
+        model = CropYieldPredictor()
+        model.model.set_params(n_estimators=10)
+        model.train(X, y)
+        original_trees = list(model.model.estimators_)
+        
+        new_X, new_y = make_training_frame(n_samples=100, seed=6)
+        metrics = model.train_incremental(new_X, new_y, n_new_trees=4, max_trees=20)
+        assert metrics['n_trees'] == 14
+        assert model.model.estimators_[:10] == original_trees
+        
+        metrics = model.train_incremental(new_X, new_y, n_new_trees=8, max_trees=20)
+        assert metrics['trees_pruned'] == 2
+        assert model.forest.n_trees == 20
+        assert model.model.estimators_[0] is original_trees[2]
+        np.testing.assert_allclose(
+            model.predict(new_X)['predictions'],
+            model.model.predict(model.scaler.transform(model.prepare_features(new_X))),
+            rtol=1e-9
+        )
+    
+    def test_data_watermark_roundtrip(self, trained_model, tmp_path):
+        """Test that the training watermark is stored in both artifacts"""
+        model_path = tmp_path / "model.joblib"
+        trained_model.data_watermark = datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+        trained_model.save_model(str(model_path))
+        trained_model.data_watermark = None
+        
+        for inference_only in (False, True):
+            loaded = CropYieldPredictor()
+            loaded.load_model(str(model_path), inference_only=inference_only)
+            assert loaded.data_watermark == datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+    
+    def test_oob_evaluation_skips_refits(self):
+        """Test that the default evaluation reports OOB error from the single fit"""
+        X, y = make_training_frame()
+        model = CropYieldPredictor()
+        model.model.set_params(n_estimators=20)
+        
+        metrics = model.train(X, y)
+        
+        assert metrics['evaluation'] == 'oob'
+        assert metrics['oob_mae'] > 0
+        assert 'cv_mae' not in metrics
+        assert not hasattr(model.model, 'oob_prediction_')
+    
+    def test_cv_evaluation_on_request(self):
+        """Test that k-fold evaluation still runs when asked for"""
+        X, y = make_training_frame()
+        model = CropYieldPredictor(n_jobs=2)
+        model.model.set_params(n_estimators=10)
+        
+        metrics = model.train(X, y, evaluation='cv', cv_folds=3)
+        
+        assert metrics['evaluation'] == 'cv'
+        assert metrics['cv_mae'] > 0
+        assert model.model.n_jobs == 2
+    
+    def test_hist_gradient_boosting_backend(self, tmp_path):
+        """Test the boosting backend end to end, including its saved backend choice"""
+        X, y = make_training_frame(n_samples=600)
+        model = CropYieldPredictor(backend=HIST_GRADIENT_BOOSTING, params={'max_iter': 50})
+        
+        metrics = model.train(X, y)
+        
+        assert metrics['backend'] == HIST_GRADIENT_BOOSTING
+        assert 'validation_mae' in metrics
+        assert model.forest is None
+        assert len(model.quantile_models) == 2
+        
+        result = model.predict(X.head(20))
+        assert all(0 < confidence <= 1 for confidence in result['confidence'])
+        
+        model_path = tmp_path / "model.joblib"
+        model.save_model(str(model_path))
+        loaded = CropYieldPredictor()
+        loaded.load_model(str(model_path), inference_only=True)
+        
+        assert loaded.backend == HIST_GRADIENT_BOOSTING
+        assert loaded.predict(X.head(20)) == result
+        with pytest.raises(ValueError):
+            loaded.train_incremental(X, y)
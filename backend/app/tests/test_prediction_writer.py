@@ -0,0 +1,40 @@
+"""
+Tests for the write-behind prediction writer
+"""
+
+import asyncio
+import pytest
+
+from app.services.prediction_writer import PredictionWriter
+
+
+class RecordingWriter(PredictionWriter):
+    """Writer that records batches instead of inserting them"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.written = []
+    
+    async def _write(self, batch, attempts: int = 3) -> None:
+        self.written.extend(batch)
+
+
+class TestPredictionWriter:
+    """Test batching and shutdown draining"""
+    
+    @pytest.mark.asyncio
+    async def test_rows_accepted_before_stop_are_written(self):
+        """Test that every accepted row is flushed and later rows are refused"""
+        writer = RecordingWriter(flush_interval_ms=1, max_batch_size=3)
+        writer.start()
+        accepted = [writer.enqueue({'n': n}) for n in range(5)]
+        
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0)
+        late = writer.enqueue({'n': 5})
+        await stopping
+        
+        assert accepted == [True] * 5
+        assert late is False
+        assert [row['n'] for row in writer.written] == list(range(5))
+        assert writer.enqueue({'n': 6}) is False
@@ -0,0 +1,73 @@
+"""
+Tests for the content-addressed model registry
+"""
+
+import os
+import time
+
+from app.ml.model import CropYieldPredictor
+from app.ml.registry import ModelRegistry, resolve_model_path
+from app.tests.test_model import make_training_frame
+
+
+def make_model(seed: int = 0) -> CropYieldPredictor:
+    X, y = make_training_frame(n_samples=100, seed=seed)
+    model = CropYieldPredictor()
+    model.model.set_params(n_estimators=5)
+    model.train(X, y)
+    return model
+
+
+def age(path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestModelRegistry:
+    """Test artifact publishing, activation and pruning"""
+    
+    def test_publish_is_content_addressed(self, tmp_path):
+        """Test that the same model publishes once under its digest"""
+        registry = ModelRegistry(str(tmp_path))
+        model = make_model()
+        
+        first = registry.publish(model)
+        second = registry.publish(model)
+        
+        assert first == second
+        assert first.parent.name.startswith(first.parent.parent.name)
+        assert len(registry.artifact_dirs()) == 1
+        assert not any(registry.tmp_dir.iterdir())
+        loaded = CropYieldPredictor()
+        loaded.load_model(str(first))
+        assert loaded.is_trained
+    
+    def test_activate_switches_active_path(self, tmp_path):
+        """Test that the pointer names the activated artifact and wins over legacy files"""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        legacy = tmp_path / "model_20240101_000000.joblib"
+        make_model().save_model(str(legacy))
+        assert registry.active_path() is None
+        assert resolve_model_path(registry, str(tmp_path)) == legacy
+        
+        published = registry.publish(make_model(seed=1))
+        registry.activate(published)
+        
+        assert registry.active_path() == published
+        assert resolve_model_path(registry, str(tmp_path)) == published
+    
+    def test_prune_spares_retained_active_and_recent(self, tmp_path):
+        """Test that only old, unreferenced artifacts are deleted"""
+        registry = ModelRegistry(str(tmp_path))
+        retained, active, expired, recent = (registry.publish(make_model(seed=seed)) for seed in range(4))
+        registry.activate(active)
+        for path in (retained, active, expired):
+            age(path.parent, 7200)
+        
+        assert registry.prune([str(retained)], min_age_seconds=3600, dry_run=True) == [expired.parent]
+        assert expired.exists()
+        
+        registry.prune([str(retained)], min_age_seconds=3600)
+        
+        assert not expired.parent.exists()
+        assert retained.exists() and active.exists() and recent.exists()
@@ -0,0 +1,113 @@
+"""
+Tests for the recommendation rules engine
+"""
+
+import json
+import os
+import numpy as np
+
+from app.ml.rules import RuleSet, RulesEngine, DEFAULT_RULES_PATH
+
+
+def make_records(n_records: int = 200, seed: int = 0):
+    """Feature records spread across every rule threshold"""
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'soil_moisture': rng.uniform(0, 100),
+            'soil_ph': rng.uniform(5, 9),
+            'nitrogen': rng.uniform(0, 80),
+            'phosphorus': rng.uniform(0, 40),
+            'potassium': rng.uniform(50, 250),
+            'air_temperature': rng.uniform(15, 45)
+        }
+        for _ in range(n_records)
+    ]
+
+
+def write_rules(path, version, threshold):
+    path.write_text(json.dumps({
+        'version': version,
+        'rules': [{
+            'id': 'nitrogen_low',
+            'feature': 'nitrogen',
+            'op': '<',
+            'threshold': threshold,
+            'type': 'fertilizer',
+            'text': 'Nitrogen levels are low.',
+            'priority': 1
+        }]
+    }))
+
+
+class TestRuleSet:
+    """Test rule compilation and evaluation"""
+    
+    def test_bundled_rules(self):
+        """Test the bundled rules on a farm needing irrigation and nitrogen"""
+        ruleset = RuleSet.from_file(DEFAULT_RULES_PATH)
+        
+        recommendations = ruleset.evaluate([{
+            'soil_moisture': 10,
+            'soil_ph': 6.5,
+            'nitrogen': 20,
+            'phosphorus': 25,
+            'potassium': 150,
+            'air_temperature': 30
+        }])[0]
+        
+        assert [r['text'] for r in recommendations] == [
+            'Soil moisture is low. Irrigate with 20-30mm of water.',
+            'Nitrogen levels are low. Apply 15-20kg N per hectare.'
+        ]
+        assert all(r['priority'] == 1 for r in recommendations)
+    
+    def test_batch_matches_single_record(self):
+        """Test that evaluating many records equals evaluating each alone"""
+        ruleset = RuleSet.from_file(DEFAULT_RULES_PATH)
+        records = make_records()
+        
+        batch = ruleset.evaluate(records)
+        
+        assert batch == [ruleset.evaluate([record])[0] for record in records]
+        assert any(batch) and not all(batch)
+    
+    def test_recommendations_sorted_by_priority(self):
+        """Test that each row's recommendations come out in priority order"""
+        ruleset = RuleSet.from_file(DEFAULT_RULES_PATH)
+        
+        for recommendations in ruleset.evaluate(make_records(seed=1)):
+            priorities = [r['priority'] for r in recommendations]
+            assert priorities == sorted(priorities)
+
+
+class TestRulesEngine:
+    """Test rule file reloading"""
+    
+    def test_recommendations_are_independent_copies(self):
+        """Test that mutating returned recommendations leaves the rule set untouched"""
+        ruleset = RuleSet.from_file(DEFAULT_RULES_PATH)
+        record = {'soil_moisture': 10.0, 'soil_ph': 5.0, 'nitrogen': 10.0}
+        
+        first, second = ruleset.evaluate([record, record])
+        first[0]['text'] = "changed"
+        
+        assert second[0]['text'] != "changed"
+        assert ruleset.evaluate([record])[0][0]['text'] != "changed"
+    
+    def test_hot_reload(self, tmp_path):
+        """Test that edited rules are picked up and broken edits are ignored"""
+        rules_path = tmp_path / "rules.json"
+        write_rules(rules_path, version=1, threshold=30)
+        engine = RulesEngine(rules_path, reload_interval=0)
+        
+        assert engine.evaluate([{'nitrogen': 40}]) == [[]]
+        
+        write_rules(rules_path, version=2, threshold=50)
+        os.utime(rules_path, (0, 1))
+        assert engine.get_ruleset().version == 2
+        assert len(engine.evaluate([{'nitrogen': 40}])[0]) == 1
+        
+        rules_path.write_text("{not json")
+        os.utime(rules_path, (0, 2))
+        assert engine.get_ruleset().version == 2
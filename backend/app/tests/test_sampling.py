@@ -0,0 +1,84 @@
+"""
+Tests for training set sampling
+"""
+
+import numpy as np
+
+from app.ml.sampling import BottomKSampler, StratifiedSampler
+
+
+def make_rows(n_rows: int = 10000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    values = np.column_stack([np.arange(n_rows), rng.normal(size=n_rows)]).astype(np.float32)
+    priorities = rng.random(n_rows)
+    return values, priorities
+
+
+class TestBottomKSampler:
+    """Test fixed-size uniform sampling"""
+    
+    def test_keeps_smallest_priorities(self):
+        """Test that the sample is exactly the k smallest priorities"""
+        values, priorities = make_rows()
+        sampler = BottomKSampler(k=500, n_columns=2)
+        for start in range(0, len(values), 777):
+            sampler.add(values[start:start + 777], priorities[start:start + 777])
+        
+        sampled, sampled_priorities = sampler.result()
+        expected = np.sort(priorities)[:500]
+        
+        assert len(sampler) == 500
+        assert sampler.seen == len(values)
+        np.testing.assert_array_equal(sampled_priorities, expected)
+        np.testing.assert_array_equal(sampled[:, 0], values[np.argsort(priorities)[:500], 0])
+    
+    def test_order_independent(self):
+        """Test that hashed priorities give the same sample in any arrival order"""
+        values, priorities = make_rows()
+        order = np.random.default_rng(1).permutation(len(values))
+        
+        forward = BottomKSampler(k=300, n_columns=2)
+        forward.add(values, priorities)
+        shuffled = BottomKSampler(k=300, n_columns=2)
+        for chunk in np.array_split(order, 13):
+            shuffled.add(values[chunk], priorities[chunk])
+        
+        np.testing.assert_array_equal(forward.result()[0], shuffled.result()[0])
+    
+    def test_reservoir_is_seeded(self):
+        """Test that random priorities are reproducible for a seed"""
+        values, _ = make_rows()
+        samples = []
+        for _ in range(2):
+            sampler = BottomKSampler(k=100, n_columns=2, seed=7)
+            for chunk in np.array_split(values, 10):
+                sampler.add(chunk)
+            samples.append(sampler.result()[0])
+        
+        np.testing.assert_array_equal(samples[0], samples[1])
+    
+    def test_small_stream(self):
+        """Test that fewer rows than k are all kept"""
+        values, priorities = make_rows(n_rows=50)
+        sampler = BottomKSampler(k=100, n_columns=2)
+        sampler.add(values, priorities)
+        
+        assert len(sampler.result()[0]) == 50
+
+
+class TestStratifiedSampler:
+    """Test per-stratum sampling"""
+    
+    def test_caps_each_stratum(self):
+        """Test that rare strata are kept whole and common ones are capped"""
+        values, priorities = make_rows()
+        strata = np.where(np.arange(len(values)) % 100 == 0, "rice|east|2", "maize|north|1")
+        
+        sampler = StratifiedSampler(per_stratum=200, n_columns=2)
+        for chunk in np.array_split(np.arange(len(values)), 7):
+            sampler.add(values[chunk], strata[chunk].tolist(), priorities[chunk])
+        
+        sampled, labels = sampler.result()
+        
+        assert sampler.counts() == {"maize|north|1": 200, "rice|east|2": 100}
+        assert len(sampled) == len(labels) == 300
@@ -0,0 +1,40 @@
+"""
+Tests for password hashing off the event loop
+"""
+
+import asyncio
+import pytest
+from passlib.context import CryptContext
+
+from app.core.security import PasswordHasher, PasswordHashingBusy, pwd_context
+
+
+class TestPasswordHasher:
+    """Test the bounded password hashing pool"""
+    
+    @pytest.mark.asyncio
+    async def test_outdated_hash_is_replaced(self):
+        """Test that a hash with another work factor verifies and comes back upgraded"""
+        hasher = PasswordHasher(max_workers=1)
+        outdated = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        
+        valid, new_hash = await hasher.verify("secret", outdated)
+        
+        assert valid
+        assert new_hash is not None and not pwd_context.needs_update(new_hash)
+        assert await hasher.verify("secret", new_hash) == (True, None)
+        assert await hasher.verify("wrong", new_hash) == (False, None)
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        """Test that work beyond max_pending is refused instead of queued"""
+        hasher = PasswordHasher(max_workers=1, max_pending=2)
+        stored = await hasher.hash("secret")
+        
+        results = await asyncio.gather(
+            *(hasher.verify("secret", stored) for _ in range(4)),
+            return_exceptions=True
+        )
+        
+        assert sum(isinstance(result, PasswordHashingBusy) for result in results) == 2
+        assert [result for result in results if isinstance(result, tuple)] == [(True, None)] * 2
@@ -0,0 +1,98 @@
+"""
+Tests for the shadow model evaluator
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.ml.manager import ShadowEvaluator
+
+
+class IdleEvaluator(ShadowEvaluator):
+    """Evaluator whose scorer never runs, so its queue only fills"""
+    
+    def start(self) -> None:
+        pass
+
+
+class FixedModel:
+    """Stands in for a loaded shadow model with known predictions"""
+    
+    model_version = "shadow-v1"
+    feature_columns = ['a', 'b']
+    
+    def __init__(self, predictions):
+        self.predictions = predictions
+    
+    def predict(self, X):
+        return {
+            'predictions': np.array(self.predictions[:len(X)], dtype=np.float64),
+            'confidence': np.full(len(X), 0.9)
+        }
+
+
+def submit(evaluator: ShadowEvaluator, primary_yield: float, width: int = 2) -> None:
+    evaluator.submit("farm-1", np.ones(width), primary_yield, 0.8, "primary-v1")
+
+
+class TestShadowEvaluator:
+    """Test that shadow scoring stays off the request path"""
+    
+    def test_submit_drops_when_queue_full(self, tmp_path):
+        """Test that a full queue counts drops instead of blocking or raising"""
+        evaluator = IdleEvaluator(str(tmp_path / "missing.joblib"), str(tmp_path / "shadow.jsonl"), max_queue_size=2)
+        
+        started = time.perf_counter()
+        for _ in range(5):
+            submit(evaluator, 1000.0)
+        
+        assert time.perf_counter() - started < 1
+        assert evaluator.dropped == 3
+        assert evaluator.stats()['queued'] == 2
+    
+    def test_submit_survives_failed_model_load(self, tmp_path):
+        """Test that a shadow model that cannot load only counts errors"""
+        evaluator = ShadowEvaluator(str(tmp_path / "missing.joblib"), str(tmp_path / "shadow.jsonl"))
+        
+        submit(evaluator, 1000.0)
+        deadline = time.monotonic() + 5
+        while evaluator.errors == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        submit(evaluator, 1000.0)
+        
+        assert evaluator.errors >= 1
+        assert evaluator.scored == 0
+        assert evaluator.model is None
+    
+    def test_stats_match_known_diffs(self, tmp_path):
+        """Test that rolling stats summarise shadow minus primary differences"""
+        evaluator = IdleEvaluator("unused", str(tmp_path / "shadow.jsonl"))
+        evaluator.model = FixedModel([1100.0, 900.0, 2000.0])
+        
+        items = [
+            ("farm-1", np.ones(2, dtype=np.float32), primary, 0.8, "primary-v1")
+            for primary in (1000.0, 1000.0, 2000.0)
+        ]
+        # Rows scored under another feature layout are skipped
+        items.append(("farm-2", np.ones(3, dtype=np.float32), 500.0, 0.8, "primary-v1"))
+        evaluator._score(items)
+        stats = evaluator.stats()
+        
+        assert stats['scored'] == 3
+        assert stats['window'] == 3
+        assert stats['shadow_version'] == "shadow-v1"
+        assert stats['mean_diff'] == pytest.approx(0.0)
+        assert stats['mean_abs_diff'] == pytest.approx(200 / 3)
+        assert stats['rmse_diff'] == pytest.approx(np.sqrt(20000 / 3))
+        assert stats['mean_abs_pct_diff'] == pytest.approx(20 / 3)
+        assert len((tmp_path / "shadow.jsonl").read_text().splitlines()) == 3
+    
+    def test_pause_caps_cpu_share(self):
+        """Test that the scorer idles long enough to stay within its CPU share"""
+        evaluator = IdleEvaluator("unused", "unused", max_cpu_share=0.25)
+        
+        assert evaluator._pause_after(1.0) == pytest.approx(3.0)
+        evaluator.max_cpu_share = 1.0
+        assert evaluator._pause_after(1.0) == 0.0
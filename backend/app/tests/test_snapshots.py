@@ -0,0 +1,95 @@
+"""
+Tests for training dataset snapshots
+"""
+
+import numpy as np
+from datetime import datetime, timedelta, timezone
+
+from app.ml import snapshots
+from app.ml.snapshots import TrainingSnapshot, snapshot_key
+
+COLUMNS = ['soil_moisture', 'nitrogen', 'month']
+
+
+def make_segment(n_rows: int, start: datetime, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(n_rows, len(COLUMNS))).astype(np.float32)
+    epochs = start.timestamp() + np.arange(n_rows, dtype=np.float64) * 300
+    return values, epochs
+
+
+class TestTrainingSnapshot:
+    """Test snapshot persistence and incremental appends"""
+    
+    def test_append_and_reload(self, tmp_path):
+        """Test that appended segments reload memory-mapped with the watermark"""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        key = snapshot_key(1, {'thin_minutes': 0})
+        first_values, first_epochs = make_segment(100, start)
+        second_values, second_epochs = make_segment(20, start + timedelta(days=1), seed=1)
+        
+        snapshot = TrainingSnapshot(str(tmp_path), key, COLUMNS)
+        assert snapshot.watermark is None
+        snapshot.append(first_values, first_epochs, start + timedelta(hours=9))
+        
+        reopened = TrainingSnapshot(str(tmp_path), key, COLUMNS)
+        values, _ = reopened.load()
+        assert isinstance(values, np.memmap)
+        assert reopened.watermark == start + timedelta(hours=9)
+        
+        reopened.append(second_values, second_epochs, start + timedelta(days=2))
+        values, epochs = TrainingSnapshot(str(tmp_path), key, COLUMNS).load()
+        
+        np.testing.assert_array_equal(values, np.concatenate([first_values, second_values]))
+        np.testing.assert_array_equal(epochs, np.concatenate([first_epochs, second_epochs]))
+        assert reopened.rows == 120
+    
+    def test_compaction(self, tmp_path, monkeypatch):
+        """Test that many small appends are merged into one segment"""
+        monkeypatch.setattr(snapshots, 'MAX_SEGMENTS', 2)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        snapshot = TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS)
+        
+        segments = [make_segment(10, start + timedelta(days=day), seed=day) for day in range(4)]
+        for day, (values, epochs) in enumerate(segments):
+            snapshot.append(values, epochs, start + timedelta(days=day + 1))
+        
+        values, _ = snapshot.load()
+        assert len(snapshot.meta['segments']) <= 2
+        np.testing.assert_array_equal(values, np.concatenate([segment[0] for segment in segments]))
+        assert len(list(tmp_path.glob('v1-test/*.npy'))) == 2 * len(snapshot.meta['segments'])
+    
+    def test_segments_publish_on_commit(self, tmp_path, monkeypatch):
+        """Test that streamed segments stay invisible until commit, then compact in order"""
+        monkeypatch.setattr(snapshots, 'MAX_SEGMENTS', 2)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        snapshot = TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS)
+        
+        segments = [make_segment(10, start + timedelta(days=day), seed=day) for day in range(3)]
+        for values, epochs in segments:
+            snapshot.write_segment(values, epochs)
+        assert TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS).rows == 0
+        
+        snapshot.commit(start + timedelta(days=3))
+        values, epochs = TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS).load()
+        
+        assert snapshot.meta['segments'] == ['segment_00003']
+        assert snapshot.rows == 30
+        np.testing.assert_array_equal(values, np.concatenate([segment[0] for segment in segments]))
+        np.testing.assert_array_equal(epochs, np.concatenate([segment[1] for segment in segments]))
+    
+    def test_changed_columns_start_fresh(self, tmp_path):
+        """Test that a snapshot written with other columns is not reused"""
+        values, epochs = make_segment(10, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS).append(values, epochs, datetime(2024, 1, 2))
+        
+        snapshot = TrainingSnapshot(str(tmp_path), 'v1-test', COLUMNS + ['potassium'])
+        
+        assert snapshot.watermark is None
+        assert snapshot.rows == 0
+    
+    def test_key_depends_on_version_and_config(self):
+        """Test that feature version and loader settings select different snapshots"""
+        assert snapshot_key(1, {'thin_minutes': 0}) == snapshot_key(1, {'thin_minutes': 0})
+        assert snapshot_key(1, {'thin_minutes': 0}) != snapshot_key(2, {'thin_minutes': 0})
+        assert snapshot_key(1, {'thin_minutes': 0}) != snapshot_key(1, {'thin_minutes': 60})
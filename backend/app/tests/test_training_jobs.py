@@ -0,0 +1,98 @@
+"""
+Tests for background training jobs
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ml.jobs import apply_resource_limits
+from app.models.training_job import TrainingJob, TrainingJobStatus
+from app.services.training_job_service import TrainingJobRunner, TrainingJobService
+
+
+async def make_job(db: AsyncSession, status: TrainingJobStatus, started_ago: float = 0) -> TrainingJob:
+    job = TrainingJob(status=status.value, params_json={})
+    if status != TrainingJobStatus.QUEUED:
+        job.started_at = datetime.now(timezone.utc) - timedelta(seconds=started_ago)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+class TestTrainingJobService:
+    """Test job cancellation and final state recording"""
+    
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self, db: AsyncSession):
+        """Test that a queued job is cancelled immediately"""
+        job = await make_job(db, TrainingJobStatus.QUEUED)
+        
+        cancelled = await TrainingJobService(db).cancel_job(job.id)
+        
+        assert cancelled.status == TrainingJobStatus.CANCELLED.value
+        assert cancelled.finished_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self, db: AsyncSession):
+        """Test that a running job is handed to its dispatcher to stop"""
+        job = await make_job(db, TrainingJobStatus.RUNNING)
+        
+        cancelling = await TrainingJobService(db).cancel_job(job.id)
+        
+        assert cancelling.status == TrainingJobStatus.CANCELLING.value
+        assert cancelling.finished_at is None
+    
+    @pytest.mark.asyncio
+    async def test_finish_keeps_recorded_final_state(self, db: AsyncSession):
+        """Test that the dispatcher never overwrites a state the job recorded itself"""
+        job = await make_job(db, TrainingJobStatus.SUCCEEDED)
+        
+        await TrainingJobRunner()._finish(job.id, TrainingJobStatus.FAILED, "Training process exited with code 1")
+        await db.refresh(job)
+        
+        assert job.status == TrainingJobStatus.SUCCEEDED.value
+        assert job.error is None
+    
+    @pytest.mark.asyncio
+    async def test_stale_running_job_is_reclaimed(self, db: AsyncSession):
+        """Test that jobs abandoned past the timeout are failed and fresh ones are left alone"""
+        stale = await make_job(db, TrainingJobStatus.RUNNING, started_ago=7200)
+        fresh = await make_job(db, TrainingJobStatus.RUNNING, started_ago=60)
+        
+        await TrainingJobRunner(timeout_seconds=3600)._reclaim_stale()
+        await db.refresh(stale)
+        await db.refresh(fresh)
+        
+        assert stale.status == TrainingJobStatus.FAILED.value
+        assert stale.finished_at is not None
+        assert fresh.status == TrainingJobStatus.RUNNING.value
+    
+    @pytest.mark.asyncio
+    async def test_claim_respects_global_cap(self, db: AsyncSession):
+        """Test that jobs running under another worker count towards the cap"""
+        await make_job(db, TrainingJobStatus.RUNNING)
+        queued = await make_job(db, TrainingJobStatus.QUEUED)
+        
+        assert await TrainingJobRunner(max_concurrent=1)._claim() is None
+        await db.refresh(queued)
+        assert queued.status == TrainingJobStatus.QUEUED.value
+
+
+class TestResourceLimits:
+    """Test limits applied to training processes"""
+    
+    def test_thread_pools_sized_to_n_jobs(self, monkeypatch):
+        """Test that native thread pool sizes follow n_jobs"""
+        for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+            monkeypatch.delenv(name, raising=False)
+        
+        apply_resource_limits(3)
+        assert os.environ['OMP_NUM_THREADS'] == '3'
+        assert os.environ['MKL_NUM_THREADS'] == '3'
+        
+        apply_resource_limits(-1)
+        assert os.environ['OPENBLAS_NUM_THREADS'] == str(os.cpu_count() or 1)
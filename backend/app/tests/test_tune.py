@@ -0,0 +1,86 @@
+"""
+Tests for hyperparameter search
+"""
+
+import numpy as np
+import optuna
+import pytest
+
+from app.core.config import settings
+from app.ml import tune
+from app.ml.model import RANDOM_FOREST
+
+
+def make_tuning_data(tmp_path, n_samples: int = 80, seed: int = 0):
+    """Write a tiny encoded tuning set where workers expect it"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, 4)).astype(np.float32)
+    y = 3000 + 500 * X[:, 0] + rng.normal(0, 50, n_samples)
+    
+    data_dir = tmp_path / "study"
+    data_dir.mkdir()
+    np.save(data_dir / "X.npy", X)
+    np.save(data_dir / "y.npy", y)
+    return X, y, data_dir
+
+
+class TestTuning:
+    """Test the objective, study resumption and summaries"""
+    
+    def test_objective_returns_cross_validated_mae(self, tmp_path):
+        """Test that a fixed trial scores as a finite, positive MAE"""
+        X, y, _ = make_tuning_data(tmp_path)
+        trial = optuna.trial.FixedTrial({
+            'n_estimators': 50,
+            'max_depth': 4,
+            'min_samples_leaf': 2,
+            'max_features': 1.0,
+            'max_samples': 0.5
+        })
+        
+        mae = tune._objective(trial, X, y, RANDOM_FOREST, folds=2, n_jobs=1, seed=0)
+        
+        assert 0 < mae < np.abs(y - y.mean()).mean()
+    
+    def test_resumed_study_does_not_rerun_trials(self, tmp_path, monkeypatch):
+        """Test that a study with enough trials returns without loading data or searching"""
+        _, _, data_dir = make_tuning_data(tmp_path)
+        storage_path = str(tmp_path / "studies.db")
+        monkeypatch.setattr(settings, 'TUNING_PATH', str(tmp_path))
+        
+        optuna.create_study(study_name="study", storage=tune._storage(storage_path), direction="minimize")
+        tune._run_worker("study", storage_path, str(data_dir), 2, None, RANDOM_FOREST, 2, 1, 0, 0)
+        
+        async def fail_load(*args, **kwargs):
+            raise AssertionError("A finished study should not reload tuning data")
+        monkeypatch.setattr(tune, '_load_tuning_data', fail_load)
+        
+        study = tune.run_study("study", n_trials=2, workers=1, cpu_budget=1, backend=RANDOM_FOREST)
+        
+        assert len(study.trials) == 2
+        assert all(trial.state == optuna.trial.TrialState.COMPLETE for trial in study.trials)
+    
+    def test_summary_counts_pruned_trials(self, tmp_path):
+        """Test that the summary records complete and pruned trial counts"""
+        study = optuna.create_study(
+            study_name="summary", storage=tune._storage(str(tmp_path / "studies.db")), direction="minimize"
+        )
+        distributions = {'max_depth': optuna.distributions.IntDistribution(4, 24)}
+        study.add_trial(optuna.trial.create_trial(
+            params={'max_depth': 8}, distributions=distributions, value=120.0
+        ))
+        study.add_trial(optuna.trial.create_trial(
+            params={'max_depth': 4}, distributions=distributions, value=90.0
+        ))
+        study.add_trial(optuna.trial.create_trial(
+            params={'max_depth': 20}, distributions=distributions,
+            state=optuna.trial.TrialState.PRUNED, intermediate_values={0: 300.0}
+        ))
+        
+        summary = tune.study_summary(study, RANDOM_FOREST)
+        
+        assert summary['n_trials'] == 3
+        assert summary['n_complete'] == 2
+        assert summary['n_pruned'] == 1
+        assert summary['best_cv_mae'] == pytest.approx(90.0)
+        assert summary['best_params'] == {'max_depth': 4}
@@ -0,0 +1,52 @@
+"""
+Backfill script to rebuild the farm feature store from sensor reading history
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.farm import Farm
+from app.services.feature_store_service import FeatureStoreService
+from app.ml.features import FEATURE_DEFINITION_VERSION
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_farm_features(farm_id: Optional[str] = None, chunk_size: int = 5000) -> None:
+    """Rebuild stored features for one farm or for every farm"""
+    logger.info(f"Rebuilding farm features (definition version {FEATURE_DEFINITION_VERSION})...")
+    
+    async with AsyncSessionLocal() as db:
+        if farm_id:
+            farm_ids = [farm_id]
+        else:
+            result = await db.execute(select(Farm.id).order_by(Farm.id))
+            farm_ids = [str(row) for row in result.scalars().all()]
+        
+        feature_store = FeatureStoreService(db)
+        total_readings = 0
+        
+        for index, current_farm_id in enumerate(farm_ids, start=1):
+            try:
+                count = await feature_store.rebuild_farm(current_farm_id, chunk_size=chunk_size)
+                total_readings += count
+                logger.info(f"[{index}/{len(farm_ids)}] Farm {current_farm_id}: {count} readings")
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Failed to rebuild features for farm {current_farm_id}: {str(e)}")
+        
+        logger.info(f"Backfill completed: {len(farm_ids)} farms, {total_readings} readings")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the farm feature store")
+    parser.add_argument("--farm-id", help="Only rebuild this farm")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Readings fetched per round trip")
+    args = parser.parse_args()
+    
+    asyncio.run(backfill_farm_features(farm_id=args.farm_id, chunk_size=args.chunk_size))
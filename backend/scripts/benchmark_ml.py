@@ -0,0 +1,231 @@
+"""
+Benchmark model training and inference over synthetic data scales
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+import sklearn
+
+from app.ml.model import CropYieldPredictor, ESTIMATOR_BACKENDS, EVALUATION_MODES
+from app.ml.synthetic import generate_synthetic_data
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000, 10_000_000)
+
+# Lower is better for every compared metric
+COMPARED_METRICS = (
+    'fit_seconds', 'peak_rss_mb', 'artifact_bytes', 'load_seconds', 'inference_load_seconds',
+    'single_row_p50_ms', 'single_row_p95_ms', 'batch_ms'
+)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> float:
+    started = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def _latencies_ms(fn: Callable[[], Any], repeats: int) -> np.ndarray:
+    fn()  # Warm caches before timing
+    return np.array([_timed(fn) for _ in range(repeats)]) * 1000
+
+
+def run_case(
+    backend: str,
+    n_samples: int,
+    seed: int,
+    n_jobs: int,
+    evaluation: str,
+    batch_size: int,
+    repeats: int
+) -> Dict[str, Any]:
+    """Train, save, load and query one model, measuring each step"""
+    X, y = generate_synthetic_data(n_samples, seed)
+    data_rss_mb = _peak_rss_mb()
+    
+    model = CropYieldPredictor(n_jobs=n_jobs, backend=backend)
+    fit_seconds = _timed(model.train, X, y, evaluation=evaluation)
+    peak_rss_mb = _peak_rss_mb()
+    
+    record = {column: value for column, value in X.iloc[0].items()}
+    batch = model.prepare_features(X.iloc[:batch_size]).to_numpy(dtype=np.float64)
+    mae = model.metrics['mae']
+    del X, y
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = str(Path(tmp) / "model.joblib")
+        save_seconds = _timed(model.save_model, model_path)
+        artifact_bytes = sum(path.stat().st_size for path in Path(tmp).rglob("*") if path.is_file())
+        del model
+        
+        load_seconds = _timed(CropYieldPredictor().load_model, model_path)
+        serving = CropYieldPredictor()
+        inference_load_seconds = _timed(serving.load_model, model_path, inference_only=True)
+    
+    # Serving path: encode one raw record and predict it
+    single = _latencies_ms(lambda: serving.predict(record), repeats)
+    batch_seconds = np.median([_timed(serving.predict, batch) for _ in range(max(3, repeats // 20))])
+    
+    return {
+        'backend': backend,
+        'n_samples': n_samples,
+        'status': 'ok',
+        'mae': float(mae),
+        'fit_seconds': fit_seconds,
+        'data_rss_mb': data_rss_mb,
+        'peak_rss_mb': peak_rss_mb,
+        'save_seconds': save_seconds,
+        'artifact_bytes': artifact_bytes,
+        'load_seconds': load_seconds,
+        'inference_load_seconds': inference_load_seconds,
+        'single_row_p50_ms': float(np.percentile(single, 50)),
+        'single_row_p95_ms': float(np.percentile(single, 95)),
+        'batch_size': len(batch),
+        'batch_ms': float(batch_seconds * 1000),
+        'batch_rows_per_second': float(len(batch) / batch_seconds)
+    }
+
+
+def _case_process(connection, *args: Any) -> None:
+    logging.basicConfig(level=logging.WARNING, force=True)
+    try:
+        connection.send(run_case(*args))
+    except BaseException as e:
+        connection.send({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+    finally:
+        connection.close()
+
+
+def run_isolated(backend: str, n_samples: int, timeout: float, *args: Any) -> Dict[str, Any]:
+    """Run one case in a fresh process so peak memory and warm-up are per case"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case_process, args=(sender, backend, n_samples, *args))
+    process.start()
+    sender.close()
+    
+    result = None
+    timed_out = not receiver.poll(timeout)
+    if not timed_out:
+        try:
+            result = receiver.recv()
+        except EOFError:
+            pass  # Died without reporting, e.g. killed for running out of memory
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    
+    if result is None:
+        result = {'status': 'timeout' if timed_out else 'crashed', 'exitcode': process.exitcode}
+    return {'backend': backend, 'n_samples': n_samples, **result}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Where the numbers came from; only compare runs from the same machine"""
+    return {
+        'commit': _git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than threshold"""
+    previous = {(case['backend'], case['n_samples']): case for case in baseline if case['status'] == 'ok'}
+    regressions = []
+    
+    for case in results:
+        before = previous.get((case['backend'], case['n_samples']))
+        if case['status'] != 'ok' or before is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if not before.get(metric):
+                continue
+            change = case[metric] / before[metric] - 1
+            logger.info(f"{case['backend']} n={case['n_samples']} {metric}: {change:+.1%}")
+            if change > threshold:
+                regressions.append(f"{case['backend']} n={case['n_samples']} {metric} {change:+.1%}")
+    
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark crop yield model training and inference")
+    parser.add_argument("--backends", nargs="+", choices=list(ESTIMATOR_BACKENDS), default=list(ESTIMATOR_BACKENDS))
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES), help="Row counts to train on")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Training threads")
+    parser.add_argument("--evaluation", choices=list(EVALUATION_MODES), default="oob")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch inference call")
+    parser.add_argument("--repeats", type=int, default=200, help="Single-row inference calls timed")
+    parser.add_argument("--timeout", type=float, default=3600, help="Give up on a case after this many seconds")
+    parser.add_argument("--output", default="ml_benchmark.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+    
+    if args.n_jobs > 0:
+        # Boosting and BLAS threads come from OpenMP, inherited by each case process
+        os.environ['OMP_NUM_THREADS'] = str(args.n_jobs)
+    
+    results = []
+    for n_samples in sorted(args.scales):
+        for backend in args.backends:
+            logger.info(f"Benchmarking {backend} on {n_samples} rows...")
+            case = run_isolated(
+                backend, n_samples, args.timeout,
+                args.seed, args.n_jobs, args.evaluation, args.batch_size, args.repeats
+            )
+            logger.info(f"{backend} n={n_samples}: {case}")
+            results.append(case)
+    
+    report = {
+        'environment': environment(),
+        'config': vars(args),
+        'results': results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    logger.info(f"Wrote {len(results)} results to {args.output}")
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline['results'], args.threshold)
+        for regression in regressions:
+            logger.warning(f"Regression: {regression}")
+        if regressions:
+            raise SystemExit(1)
@@ -99,6 +99,58 @@ CREATE TABLE model_versions (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Create farm_features table (incrementally maintained feature store)
+-- scope is 'farm' for the farm-wide row or a device id for per-field rows
+CREATE TABLE farm_features (
+    farm_id UUID NOT NULL REFERENCES farms(id) ON DELETE CASCADE,
+    scope VARCHAR(100) NOT NULL DEFAULT 'farm',
+    feature_version INTEGER NOT NULL,
+    reading_count BIGINT NOT NULL DEFAULT 0,
+    last_reading_at TIMESTAMP WITH TIME ZONE,
+    features_json JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (farm_id, scope)
+);
+
+-- Create historical_yields table (recorded harvests used as prediction baselines)
+CREATE TABLE historical_yields (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    farm_id UUID NOT NULL REFERENCES farms(id) ON DELETE CASCADE,
+    crop_type VARCHAR(100) NOT NULL,
+    season VARCHAR(20) NOT NULL,
+    year INTEGER NOT NULL,
+    yield_kg_per_ha DECIMAL(10, 2) NOT NULL,
+    region VARCHAR(100),
+    recorded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_historical_yields_farm_crop_season_year UNIQUE (farm_id, crop_type, season, year)
+);
+
+-- Create training_jobs table (model training runs executed outside the API)
+CREATE TABLE training_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    stage VARCHAR(50),
+    progress DOUBLE PRECISION NOT NULL DEFAULT 0,
+    params_json JSONB NOT NULL DEFAULT '{}',
+    result_json JSONB,
+    error TEXT,
+    pid INTEGER,
+    requested_by UUID,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Create batch_prediction_runs table (checkpoints of the fleet-wide batch prediction job)
+CREATE TABLE batch_prediction_runs (
+    run_id VARCHAR(64) PRIMARY KEY,
+    last_farm_id UUID,
+    processed INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- Create notifications table
 CREATE TABLE notifications (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -118,6 +170,8 @@ CREATE INDEX idx_predictions_farm_created ON predictions(farm_id, created_at DES
 CREATE INDEX idx_notifications_user_created ON notifications(user_id, created_at DESC);
 CREATE INDEX idx_devices_farm_id ON devices(farm_id);
 CREATE INDEX idx_farms_user_id ON farms(user_id);
+CREATE INDEX idx_historical_yields_farm_id ON historical_yields(farm_id);
+CREATE INDEX idx_training_jobs_status ON training_jobs(status, created_at);
 
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -132,6 +186,7 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_farms_updated_at BEFORE UPDATE ON farms FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_devices_updated_at BEFORE UPDATE ON devices FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_batch_prediction_runs_updated_at BEFORE UPDATE ON batch_prediction_runs FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Insert default admin user
 INSERT INTO users (name, email, password_hash, role, region) VALUES 